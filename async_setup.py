@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 비동기 설정/검증 실행 모드
+연결 확인, 테이블 확인, 카테고리별 카운트처럼 서로 독립적인 요청을
+동시 실행 한도 안에서 한꺼번에 보내 전체 시간이 가장 느린 요청 하나에 맞춰지도록 합니다.
+
+사용 예:
+    python async_setup.py --concurrency 8
+    python create_tables.py --async
+"""
+
+import argparse
+import asyncio
+import time
+
+from supabase import AsyncClient
+
+from create_tables import SAMPLE_EVENTS
+from event_constants import CATEGORY_ENUM
+from event_upsert import upsert_query
+from request_metrics import instrument, metrics, print_request_metrics
+from supabase_client import get_async_client, print_connection_stats
+from verify_report import (
+    add_month_count,
+    category_count,
+    edge_date_query,
+    empty_report,
+    head_count_query,
+    month_filters,
+    month_ranges,
+    parse_edge_date,
+    print_report,
+    report_from_rows,
+)
+
+DEFAULT_CONCURRENCY = 8
+
+async def gather_limited(coroutines, concurrency: int = DEFAULT_CONCURRENCY, return_exceptions: bool = False):
+    """최대 concurrency 개만 동시에 실행하며 결과를 입력 순서대로 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines),
+                                return_exceptions=return_exceptions)
+
+async def _head_count(client: AsyncClient, *filters):
+    """HEAD 카운트 실행"""
+    return (await head_count_query(client, *filters).execute()).count or 0
+
+async def check_connection_and_table(client: AsyncClient, concurrency: int = DEFAULT_CONCURRENCY):
+    """ping 과 events 테이블 확인을 동시에 실행
+
+    반환값: (연결 성공 여부, 테이블 존재 여부)
+    """
+    print("🔗 Supabase 연결과 events 테이블을 동시에 확인합니다...")
+    ping, table = await gather_limited([
+        client.rpc('ping').execute(),
+        client.table('events').select('id').limit(1).execute(),
+    ], concurrency, return_exceptions=True)
+
+    table_exists = not isinstance(table, Exception)
+    connected = table_exists or not isinstance(ping, Exception)
+    if connected:
+        print("✅ Supabase 연결 성공!")
+    else:
+        print(f"❌ Supabase 연결 실패: {str(ping)}")
+    if table_exists:
+        print("✅ events 테이블이 존재합니다!")
+    elif connected:
+        print(f"❌ events 테이블이 존재하지 않거나 접근할 수 없습니다: {str(table)}")
+    return connected, table_exists
+
+async def fetch_report_head_async(client: AsyncClient, concurrency: int = DEFAULT_CONCURRENCY):
+    """HEAD 카운트 요청들을 동시에 보내 검증 리포트 집계"""
+    report = empty_report("head")
+
+    # 전체/카테고리별 카운트와 최초/최종 날짜 조회는 서로 독립적입니다.
+    results = await gather_limited(
+        [_head_count(client)]
+        + [_head_count(client, ('eq', 'category', category)) for category in CATEGORY_ENUM]
+        + [edge_date_query(client, desc=False).execute(), edge_date_query(client, desc=True).execute()],
+        concurrency,
+        return_exceptions=True,
+    )
+    for result in results[:1] + results[-2:]:
+        if isinstance(result, Exception):
+            raise result
+    report["total"] = results[0]
+    for category, count in zip(CATEGORY_ENUM, results[1:1 + len(CATEGORY_ENUM)]):
+        report["by_category"][category] = category_count(count, category)
+
+    first, last = parse_edge_date(results[-2]), parse_edge_date(results[-1])
+    if first is None:
+        return report
+
+    months = list(month_ranges(first, last))
+    counts = await gather_limited([_head_count(client, *month_filters(month)) for month in months], concurrency)
+    for month, count in zip(months, counts):
+        add_month_count(report, month[0], count)
+    return report
+
+async def fetch_report_async(client: AsyncClient, concurrency: int = DEFAULT_CONCURRENCY):
+    """검증 리포트 조회 (RPC 우선, 실패 시 동시 HEAD 카운트로 대체)"""
+    try:
+        return report_from_rows((await client.rpc('events_count_report').execute()).data)
+    except Exception as e:
+        print(f"ℹ️ events_count_report RPC를 사용할 수 없어 HEAD 카운트로 집계합니다: {str(e)}")
+        return await fetch_report_head_async(client, concurrency)
+
+async def verify_setup_async(client: AsyncClient, concurrency: int = DEFAULT_CONCURRENCY):
+    """설정 검증 (리포트 집계와 첫 번째 이벤트 조회를 동시에 실행)"""
+    print("\n📊 데이터베이스 설정을 검증합니다...")
+
+    try:
+        report, first = await gather_limited([
+            fetch_report_async(client, concurrency),
+            client.table('events').select('title,date').order('date').limit(1).execute(),
+        ], concurrency)
+
+        if first.data:
+            print(f"📅 첫 번째 이벤트: {first.data[0].get('title', 'N/A')} ({first.data[0].get('date', 'N/A')})")
+        print_report(report)
+        return True
+
+    except Exception as e:
+        print(f"❌ 검증 실패: {str(e)}")
+        return False
+
+async def insert_sample_data_async(client: AsyncClient):
+    """샘플 데이터 삽입"""
+    print("\n📝 샘플 데이터를 삽입합니다...")
+
+    try:
+        result = await upsert_query(client, SAMPLE_EVENTS).execute()
+        print(f"✅ 샘플 이벤트 {len(SAMPLE_EVENTS)}개 중 {result.count or 0}개를 새로 삽입했습니다. (이미 있는 일정은 건너뜀)")
+        return True
+    except Exception as e:
+        print(f"❌ 샘플 데이터 삽입 실패: {str(e)}")
+        return False
+
+async def main_async(client: AsyncClient = None, concurrency: int = DEFAULT_CONCURRENCY):
+    """create_tables.main() 과 같은 흐름을 비동기로 실행"""
+    metrics.reset()
+    print("🏛️ 나주교회 캘린더 데이터베이스 설정 (비동기 모드)")
+    print("=" * 60)
+    started = time.perf_counter()
+
+    client = client or instrument(await get_async_client())
+    connected, table_exists = await check_connection_and_table(client, concurrency)
+    if not connected:
+        print("❌ Supabase 연결에 실패했습니다. 환경 변수를 확인해주세요.")
+        return False
+
+    if not table_exists:
+        print("\n⚠️ events 테이블이 존재하지 않습니다.")
+        print("python setup_database.py 로 스키마를 먼저 적용해주세요.")
+        return False
+
+    ok = await insert_sample_data_async(client) and await verify_setup_async(client, concurrency)
+    print(f"\n⏱️ 전체 소요 시간: {time.perf_counter() - started:.2f}초")
+    if ok:
+        print("🎉 데이터베이스 설정이 완료되었습니다!")
+    print_connection_stats()
+    print_request_metrics('async_setup')
+    return ok
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 비동기 설정/검증")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시에 보낼 최대 요청 수")
+    parser.add_argument('--async', dest='use_async', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    asyncio.run(main_async(concurrency=args.concurrency))
+
+if __name__ == "__main__":
+    main()
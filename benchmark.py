@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 설정/적재/검증 스크립트 벤치마크
+로컬 대체 백엔드(local_backend.py) 위에서 1k/100k/1M 이벤트 데이터셋으로
+각 진입점을 실행하고 실행 시간, 요청 수, 전송 바이트, 최대 RSS 를 측정합니다.
+
+사용 예:
+    python benchmark.py                                  # 전체 실행, bench_results/<커밋>.json 저장
+    python benchmark.py --sizes 1000,100000 --latency 0.005
+    python benchmark.py --compare bench_results/a1b2c3d.json bench_results/e4f5g6h.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, '.bench_cache')
+RESULTS_DIR = os.path.join(BASE_DIR, 'bench_results')
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DATASET_SEED = 20250126
+# 데이터셋 생성 규칙이 바뀌면 올려서 이전 캐시를 재사용하지 않도록 합니다.
+DATASET_VERSION = 3
+
+def _run_setup_database(client):
+    from setup_database import setup_database
+    return setup_database(client)
+
+def _run_insert_sample_data(client):
+    from create_tables import insert_sample_data
+    return insert_sample_data(client)
+
+def _run_verify_setup(client):
+    from create_tables import verify_setup
+    return verify_setup(client)
+
+def _run_verify_data(client):
+    from setup_supabase import verify_data
+    return verify_data(client)
+
+def _run_expand_recurring(client):
+    from event_constants import RECURRING_TYPES
+    from event_reader import iter_events
+    from recurrence import expand_occurrences
+
+    rows = list(iter_events(client, ['date', 'recurring'], filters=[('in_', 'recurring', RECURRING_TYPES)]))
+    series, _ = expand_occurrences([row['date'] for row in rows], [row['recurring'] for row in rows],
+                                   '2026-01-01', '2026-12-31')
+    return len(series) > 0
+
+# 케이스 이름 -> (실행 함수, 데이터셋을 변경하는지 여부)
+CASES = {
+    'setup_database': (_run_setup_database, True),
+    'insert_sample_data': (_run_insert_sample_data, True),
+    'verify_setup': (_run_verify_setup, False),
+    'verify_data': (_run_verify_data, False),
+    'expand_recurring': (_run_expand_recurring, False),
+}
+
+def dataset_path(rows: int):
+    """행 수별 데이터셋 SQLite 파일 경로 (없으면 생성)"""
+    from local_backend import create_local_client
+    from seed_events import generate_chunk
+
+    path = os.path.join(CACHE_DIR, f"events_{rows}_{DATASET_SEED}_v{DATASET_VERSION}.sqlite")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    print(f"🧱 {rows}개 이벤트 데이터셋을 생성합니다...", file=sys.stderr)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    client = create_local_client(tmp_path)
+    chunk_size = 5000
+    for index in range((rows + chunk_size - 1) // chunk_size):
+        client.table('events').insert(generate_chunk(DATASET_SEED, index, chunk_size, rows),
+                                      returning='minimal').execute()
+    client.close()
+    os.replace(tmp_path, path)
+    return path
+
+def run_case(case: str, rows: int, latency: float):
+    """자식 프로세스에서 케이스 하나를 실행하고 측정값 반환"""
+    from local_backend import create_local_client
+
+    run, mutates = CASES[case]
+    source = dataset_path(rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = source
+        if mutates:
+            path = os.path.join(tmp_dir, 'events.sqlite')
+            shutil.copyfile(source, path)
+
+        client = create_local_client(path, latency=latency)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        # 스크립트 출력은 버리고 측정값 JSON 만 표준 출력으로 내보냄
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            ok = run(client)
+        seconds = time.perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stats = client.stats.summary()
+        client.close()
+
+    return {
+        "case": case,
+        "rows": rows,
+        "latency": latency,
+        "ok": bool(ok),
+        "seconds": round(seconds, 4),
+        "requests": stats["requests"],
+        "bytes_sent": stats["bytes_sent"],
+        "bytes_received": stats["bytes_received"],
+        # Linux 의 ru_maxrss 단위는 KB
+        "peak_rss_kb": rss_after,
+        "rss_growth_kb": rss_after - rss_before,
+    }
+
+def _git_revision():
+    """현재 커밋 해시 (git 이 없으면 'worktree')"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'worktree'
+
+def run_suite(sizes, cases, latency: float):
+    """모든 (케이스, 크기) 조합을 각각 별도 프로세스로 실행"""
+    results = []
+    for rows in sizes:
+        dataset_path(rows)
+        for case in cases:
+            output = subprocess.check_output(
+                [sys.executable, os.path.abspath(__file__), '--child', case, '--rows', str(rows),
+                 '--latency', str(latency)],
+                cwd=BASE_DIR, text=True,
+            )
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            print(f"   • {case:<20} {rows:>9,}행  {result['seconds']:>9.3f}초  {result['requests']:>6}회  "
+                  f"수신 {result['bytes_received']:>13,}B  RSS {result['peak_rss_kb'] / 1024:>7.1f}MB")
+    return results
+
+def compare(baseline_path: str, current_path: str):
+    """두 결과 파일의 케이스별 변화율 출력"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r["case"], r["rows"]): r for r in json.load(f)["results"]}
+    with open(current_path, encoding='utf-8') as f:
+        current = {(r["case"], r["rows"]): r for r in json.load(f)["results"]}
+
+    print(f"📊 {baseline_path} -> {current_path}")
+    for key in sorted(set(baseline) & set(current), key=lambda k: (k[1], k[0])):
+        before, after = baseline[key], current[key]
+        parts = []
+        for metric in ("seconds", "requests", "bytes_received", "peak_rss_kb"):
+            if before[metric]:
+                parts.append(f"{metric} {after[metric] / before[metric]:.2f}x")
+        print(f"   • {key[0]:<20} {key[1]:>9,}행  " + ", ".join(parts))
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 스크립트 벤치마크")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="데이터셋 크기 목록 (쉼표 구분)")
+    parser.add_argument('--cases', default=','.join(CASES), help="실행할 케이스 목록 (쉼표 구분)")
+    parser.add_argument('--latency', type=float, default=0.0, help="왕복당 주입할 지연 (초)")
+    parser.add_argument('--output', default=None, help="결과 JSON 경로 (기본: bench_results/<커밋>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help="두 결과 파일 비교")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--rows', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.rows, args.latency)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    cases = [case for case in args.cases.split(',') if case]
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        parser.error(f"알 수 없는 케이스: {unknown}")
+
+    print("🏁 나주교회 캘린더 벤치마크")
+    print("=" * 60)
+    results = run_suite(sizes, cases, args.latency)
+
+    revision = _git_revision()
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "revision": revision,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 장소/시간 중복 예약 검사 스크립트
+같은 날 같은 장소(본당, 교육관, 기도실 …)에서 시간이 겹치는 일정을 찾습니다.
+모든 쌍을 비교하면 1년치 일정에서 O(n²) 이 되므로 (장소, 날짜, 시작, 종료) 로 한 번 정렬한 뒤
+NumPy 누적 최대값으로 겹침 구간(cluster)을 나누고, 두 개 이상이 묶인 구간만 힙 스윕으로 쌍을 만듭니다.
+전체 비용은 O(n log n + 충돌 수) 입니다.
+
+- 시간은 [시작, 종료) 반열린 구간이라 10:00 에 끝나는 일정과 10:00 에 시작하는 일정은 겹치지 않습니다.
+- 종일 일정(또는 시작 시간이 없는 일정)은 그날 장소 전체를 차지하는 것으로 보고 kind='all_day' 로 구분합니다.
+  --timed-only 를 주면 시간이 정해진 일정끼리의 충돌만 보고합니다.
+- 종료 시간이 없으면 시작 후 DEFAULT_DURATION 분(엑셀 파서와 같은 2시간), 자정을 넘기면 그날 끝까지로 봅니다.
+- 장소가 없는 일정은 검사하지 않습니다. 장소 이름은 앞뒤 공백을 무시하고 비교합니다.
+- 기간(--year 또는 --start/--end)을 주면 반복 일정을 recurrence.py 로 회차별로 전개해 검사합니다.
+
+입력은 서버(페이지 단위 조회), event_sync.py 의 로컬 미러, JSON/CSV 파일 중 하나입니다.
+CSV 는 events 컬럼 이름 헤더와 event_export.py(csv-export.ts) 의 한국어 헤더를 모두 읽습니다.
+
+사용 예:
+    python conflict_detector.py --year 2026
+    python conflict_detector.py --mirror .events_mirror.sqlite --year 2026 --output conflicts.json
+    python conflict_detector.py --file events.csv --timed-only
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import time
+from datetime import date
+
+import numpy as np
+
+from event_columns import EventColumns, minutes_to_time
+from event_constants import CATEGORY_LABELS, RECURRING_TYPES
+from event_export import CSV_HEADERS
+from event_reader import iter_events
+from recurrence import expand_events
+
+DAY_MINUTES = 24 * 60
+DEFAULT_DURATION = 120
+
+CONFLICT_COLUMNS = ('id', 'title', 'date', 'start_time', 'end_time', 'category', 'location', 'is_all_day',
+                    'recurring')
+
+# event_export.py CSV 헤더 -> events 컬럼
+CSV_HEADER_COLUMNS = dict(zip(CSV_HEADERS, ('date', 'title', 'category', 'start_time', 'end_time', 'location',
+                                            'description', 'is_all_day', 'reminder', 'recurring')))
+CATEGORY_BY_LABEL = {label: category for category, label in CATEGORY_LABELS.items()}
+
+def fetch_rows(supabase, start=None, end=None):
+    """서버/미러에서 검사할 행 조회
+
+    기간이 있으면 기간 안에서 시작한 일정과, 기간 전에 시작했지만 회차가 기간에 들어올 수 있는 반복 일정을 읽습니다.
+    """
+    if start is None and end is None:
+        return list(iter_events(supabase, CONFLICT_COLUMNS))
+
+    filters = []
+    if start is not None:
+        filters.append(('gte', 'date', str(start)))
+    if end is not None:
+        filters.append(('lte', 'date', str(end)))
+    rows = list(iter_events(supabase, CONFLICT_COLUMNS, filters=filters))
+    if start is not None:
+        rows.extend(iter_events(supabase, CONFLICT_COLUMNS,
+                                filters=[('lt', 'date', str(start)), ('in_', 'recurring', RECURRING_TYPES)]))
+    return rows
+
+def _csv_row(record):
+    """CSV 한 줄 -> events 행 (한국어 헤더/라벨도 변환)"""
+    row = {CSV_HEADER_COLUMNS.get(key, key): value for key, value in record.items() if key is not None}
+    row = {key: (value if value != '' else None) for key, value in row.items()}
+    row['category'] = CATEGORY_BY_LABEL.get(row.get('category'), row.get('category'))
+    all_day = row.get('is_all_day')
+    row['is_all_day'] = str(all_day).strip().lower() in ('예', 'true', 't', '1', 'yes')
+    return row
+
+def read_file(path: str):
+    """JSON(행 목록 또는 {"data": [...]}) 또는 CSV 파일에서 행 읽기"""
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('data', []) if isinstance(data, dict) else data
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return [_csv_row(record) for record in csv.DictReader(f)]
+
+def _interval_arrays(store: EventColumns, timed_only: bool):
+    """검사 대상 행 번호와 (장소 코드, 날짜, 시작 분, 종료 분, 종일 여부) 배열"""
+    location = store.strings['location']
+    # 장소 사전 항목을 공백 제거한 이름 기준으로 합칩니다. (사전은 장소 종류 수만큼이라 작음)
+    canonical = {}
+    mapping = np.array([canonical.setdefault(name.strip(), len(canonical)) if name and name.strip() else -1
+                        for name in (location.decode(code) for code in range(location.cardinality))] + [-1],
+                       dtype=np.int64)
+    locations = mapping[location.codes]
+
+    all_day = store.is_all_day | (store.start_minutes < 0)
+    start = np.where(all_day, 0, store.start_minutes).astype(np.int64)
+    end = store.end_minutes.astype(np.int64)
+    end = np.where(all_day, DAY_MINUTES, np.where(end < 0, start + DEFAULT_DURATION, end))
+    # 자정을 넘기거나 종료가 시작보다 이른 일정은 그날 끝까지, 길이 0 인 일정은 1분으로 봅니다.
+    end = np.where(end <= start, np.where(end < start, DAY_MINUTES, start + 1), np.minimum(end, DAY_MINUTES))
+
+    valid = locations >= 0
+    if timed_only:
+        valid &= ~all_day
+    rows = np.flatnonzero(valid)
+    return rows, locations[rows], store.dates[rows].astype(np.int64), start[rows], end[rows], all_day[rows]
+
+def conflict_clusters(locations, dates, starts, ends):
+    """(장소, 날짜) 안에서 시간이 이어서 겹치는 구간 찾기
+
+    반환값: (정렬 순서, 구간 번호 배열, 두 개 이상 묶인 구간 여부 배열) - 모두 정렬 순서 기준
+    """
+    order = np.lexsort((ends, starts, dates, locations))
+    locations, dates, starts, ends = locations[order], dates[order], starts[order], ends[order]
+
+    changed = np.ones(len(order), dtype=bool)
+    changed[1:] = (locations[1:] != locations[:-1]) | (dates[1:] != dates[:-1])
+    group = np.cumsum(changed)
+
+    # 그룹 번호를 위 자리로 올려 그룹이 바뀌면 누적 최대값이 자연히 초기화되게 합니다.
+    span = DAY_MINUTES + 1
+    keyed_ends = group * span + ends
+    previous_max = np.empty(len(order), dtype=np.int64)
+    previous_max[:1] = -1
+    previous_max[1:] = np.maximum.accumulate(keyed_ends)[:-1]
+    cluster = np.cumsum(group * span + starts >= previous_max)
+
+    sizes = np.bincount(cluster)
+    return order, cluster, sizes[cluster] > 1
+
+def find_conflicts(store: EventColumns, timed_only: bool = False):
+    """겹치는 일정 쌍 목록
+
+    각 항목: (행 번호 a, 행 번호 b, 겹침 시작 분, 겹침 종료 분, 종류 'time'|'all_day')
+    """
+    rows, locations, dates, starts, ends, all_day = _interval_arrays(store, timed_only)
+    if not len(rows):
+        return []
+    order, cluster, crowded = conflict_clusters(locations, dates, starts, ends)
+
+    conflicts = []
+    positions = np.flatnonzero(crowded)
+    if not len(positions):
+        return conflicts
+    # 충돌 구간에 속한 행만 파이썬으로 스윕합니다. (정렬 순서라 같은 구간은 연속)
+    indices = order[positions].tolist()
+    clusters = cluster[positions].tolist()
+    starts, ends, all_day, rows = starts.tolist(), ends.tolist(), all_day.tolist(), rows.tolist()
+
+    active = []
+    current = None
+    for index, cluster_id in zip(indices, clusters):
+        if cluster_id != current:
+            active = []
+            current = cluster_id
+        start, end = starts[index], ends[index]
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_end, other in active:
+            kind = 'all_day' if all_day[index] or all_day[other] else 'time'
+            conflicts.append((rows[other], rows[index], start, min(end, other_end), kind))
+        heapq.heappush(active, (end, index))
+    return conflicts
+
+def _event_summary(store: EventColumns, row: int):
+    event = store.row(row)
+    return {
+        "id": event["id"],
+        "title": event["title"],
+        "category": event["category"],
+        "start_time": event["start_time"],
+        "end_time": event["end_time"],
+        "is_all_day": event["is_all_day"],
+        "recurring": event["recurring"],
+    }
+
+def build_report(store: EventColumns, conflicts, limit: int = None):
+    """충돌 목록을 JSON 리포트 형태로 변환 (날짜, 장소, 겹침 시작 순)
+
+    장소별 집계는 전체 충돌로 계산하고, items 에는 앞에서부터 limit 개만 담습니다. (None 이면 전체)
+    """
+    report = {"events": len(store), "conflicts": len(conflicts), "by_location": {}, "items": [], "truncated": False}
+    if not conflicts:
+        return report
+
+    first, second, starts, ends, kinds = (np.asarray(values) for values in zip(*conflicts))
+    location = store.strings['location']
+    # 충돌에 나온 장소 코드만 이름순 번호로 바꿉니다. (공백만 다른 이름은 같은 번호)
+    codes, code_index = np.unique(location.codes[first], return_inverse=True)
+    code_names = [location.decode(int(code)).strip() for code in codes]
+    rank_names = sorted(set(code_names))
+    ranks = {name: rank for rank, name in enumerate(rank_names)}
+    location_ranks = np.array([ranks[name] for name in code_names], dtype=np.int64)[code_index.reshape(-1)]
+    all_day = kinds == 'all_day'
+
+    by_location = {}
+    groups, counts = np.unique(location_ranks * 2 + all_day, return_counts=True)
+    for group, count in zip(groups.tolist(), counts.tolist()):
+        totals = by_location.setdefault(rank_names[group // 2], {"time": 0, "all_day": 0})
+        totals['all_day' if group % 2 else 'time'] += count
+    report["by_location"] = dict(sorted(by_location.items(), key=lambda entry: -sum(entry[1].values())))
+
+    # 종일 겹침은 겹침 시작이 없으므로 같은 장소/날짜의 시간 겹침 뒤에 둡니다.
+    order = np.lexsort((np.where(all_day, DAY_MINUTES, starts), location_ranks, store.dates[first]))
+    if limit is not None:
+        order = order[:limit]
+        report["truncated"] = len(conflicts) > limit
+
+    summaries = {}
+    def summary(row):
+        if row not in summaries:
+            summaries[row] = _event_summary(store, row)
+        return summaries[row]
+
+    for index in order.tolist():
+        a, b, start, end, kind = conflicts[index]
+        report["items"].append({
+            "date": date.fromordinal(int(store.dates[a])).isoformat(),
+            "location": rank_names[location_ranks[index]],
+            "kind": kind,
+            "overlap_start": minutes_to_time(start) if kind == 'time' else None,
+            "overlap_end": minutes_to_time(end) if kind == 'time' and end < DAY_MINUTES else None,
+            "overlap_minutes": end - start,
+            "events": [summary(a), summary(b)],
+        })
+    return report
+
+def print_report(report, limit: int = 20):
+    """충돌 리포트 출력"""
+    if not report["conflicts"]:
+        print("✅ 겹치는 장소 예약이 없습니다.")
+        return
+    print(f"⚠️ 장소/시간이 겹치는 일정 {report['conflicts']}쌍")
+    print("\n🏠 장소별 충돌 수:")
+    for location, counts in report["by_location"].items():
+        print(f"   - {location}: 시간 겹침 {counts['time']}건, 종일 일정 겹침 {counts['all_day']}건")
+
+    print(f"\n📋 충돌 목록 (앞에서 {min(limit, len(report['items']))}건):")
+    for item in report["items"][:limit]:
+        first, second = item["events"]
+        if item["kind"] == 'time':
+            window = f"{item['overlap_start'][:5]}~{(item['overlap_end'] or '24:00')[:5]} ({item['overlap_minutes']}분)"
+        else:
+            window = "종일"
+        print(f"   • {item['date']} {item['location']} {window}: {first['title']} ↔ {second['title']}")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 장소/시간 중복 예약 검사")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--file', help="JSON/CSV 파일에서 읽기")
+    source.add_argument('--mirror', help="event_sync.py 로컬 미러 SQLite 에서 읽기")
+    parser.add_argument('--year', type=int, default=None, help="검사할 연도 (--start/--end 대신)")
+    parser.add_argument('--start', type=date.fromisoformat, default=None, help="시작일 YYYY-MM-DD (포함)")
+    parser.add_argument('--end', type=date.fromisoformat, default=None, help="종료일 YYYY-MM-DD (포함)")
+    parser.add_argument('--timed-only', action='store_true', help="종일 일정 충돌 제외")
+    parser.add_argument('--limit', type=int, default=20, help="출력할 충돌 수")
+    parser.add_argument('--output', default=None, help="JSON 리포트 저장 경로")
+    parser.add_argument('--max-items', type=int, default=10000, help="JSON 리포트에 담을 최대 충돌 수")
+    args = parser.parse_args()
+
+    start, end = args.start, args.end
+    if args.year:
+        start, end = date(args.year, 1, 1), date(args.year, 12, 31)
+
+    print("🏛️ 나주교회 캘린더 장소 중복 예약 검사")
+    print("=" * 60)
+    started = time.perf_counter()
+    if args.file:
+        rows = read_file(args.file)
+        if start or end:
+            rows = [row for row in rows if row.get('recurring') or
+                    ((not start or str(row['date'])[:10] >= start.isoformat()) and
+                     (not end or str(row['date'])[:10] <= end.isoformat()))]
+    elif args.mirror:
+        from local_backend import create_local_client
+        if not os.path.exists(args.mirror):
+            print(f"❌ 미러 파일이 없습니다: {args.mirror} (python event_sync.py 로 먼저 만드세요)")
+            return
+        mirror = create_local_client(args.mirror)
+        rows = fetch_rows(mirror, start, end)
+        mirror.close()
+    else:
+        from supabase_client import get_client
+        rows = fetch_rows(get_client(), start, end)
+    loaded = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if start or end:
+        # 반복 일정을 기간 안의 회차로 전개 (기간 한쪽만 주어지면 나머지는 데이터 범위로)
+        dates = [str(row['date'])[:10] for row in rows] or [date.today().isoformat()]
+        rows = expand_events(rows, start or min(dates), end or max(dates))
+    store = EventColumns.from_rows(rows)
+    prepared = time.perf_counter() - started
+
+    started = time.perf_counter()
+    conflicts = find_conflicts(store, args.timed_only)
+    analyzed = time.perf_counter() - started
+    report = build_report(store, conflicts, args.max_items if args.output else args.limit)
+
+    period = f"{start or '처음'} ~ {end or '끝'}" if start or end else "전체 기간(반복 전개 없음)"
+    print(f"📅 {period}: 일정 {len(store):,}개 (조회 {loaded:.2f}초, 전개/적재 {prepared:.2f}초, "
+          f"검사 {analyzed * 1000:.1f}ms)")
+    print_report(report, args.limit)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.output}")
+
+if __name__ == "__main__":
+    main()
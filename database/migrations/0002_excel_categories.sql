@@ -0,0 +1,9 @@
+-- 월간 일정표 엑셀(lib/excel-parser.ts, excel_parser.py)의 색상 카테고리
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'worship';      -- 예배, 인맞음 (파란색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'celebration';  -- 송하행사 (초록색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'theology';     -- 신학부 (보라색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'admin';        -- 관리부 (회색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'education';    -- 교육부 (주황색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'evangelism';   -- 전도부 (빨간색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'service';      -- 봉사/홍보 (노란색 계열)
+ALTER TYPE church_category ADD VALUE IF NOT EXISTS 'regional';     -- 나주지역회의 (청록색 계열)
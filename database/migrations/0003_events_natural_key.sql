@@ -0,0 +1,39 @@
+-- 자연 키 (date, title, start_time) 유일 인덱스: 같은 일정을 다시 적재해도 중복 행이 생기지 않도록 합니다.
+-- lib/store.ts 의 addEvent 와 같이 제목은 앞뒤 공백을 제거해 비교합니다.
+-- 종일 일정(start_time IS NULL)도 중복으로 보도록 NULLS NOT DISTINCT 를 쓰므로 PostgreSQL 15 이상이 필요합니다.
+--
+-- 이미 겹치는 일정이 있으면 아무 행도 지우거나 고치지 않고 겹치는 id 목록과 함께 실패합니다.
+-- (exec_sql 배치 전체가 롤백되고 원장에도 기록되지 않습니다.) 어느 행을 남길지 정리한 뒤 다시 실행하세요.
+DO $$
+DECLARE
+  duplicate_groups INTEGER;
+  duplicates TEXT;
+BEGIN
+  IF current_setting('server_version_num')::integer < 150000 THEN
+    RAISE EXCEPTION '0003_events_natural_key 는 NULLS NOT DISTINCT 때문에 PostgreSQL 15 이상이 필요합니다. (현재 %)',
+      current_setting('server_version');
+  END IF;
+
+  -- 오류 메시지에는 앞의 100묶음만 싣습니다.
+  SELECT count(*), string_agg(line, E'\n' ORDER BY rn) FILTER (WHERE rn <= 100)
+  INTO duplicate_groups, duplicates
+  FROM (
+    SELECT date || ' ' || coalesce(start_time::text, '종일') || ' ' || trim(title) || ': '
+           || string_agg(id::text, ', ' ORDER BY created_at, id) AS line,
+           row_number() OVER (ORDER BY date, trim(title), start_time) AS rn
+    FROM events
+    GROUP BY date, trim(title), start_time
+    HAVING count(*) > 1
+  ) groups;
+
+  IF duplicate_groups > 0 THEN
+    RAISE EXCEPTION '자연 키 (date, title, start_time) 가 겹치는 일정 %묶음이 있습니다. 정리한 뒤 다시 실행하세요.%',
+      duplicate_groups, E'\n' || duplicates;
+  END IF;
+END $$;
+
+-- 겹치는 일정이 없음을 확인했으므로 제목 공백 정리는 유일 인덱스와 충돌하지 않습니다.
+UPDATE events SET title = trim(title) WHERE title <> trim(title);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_natural_key
+  ON events(date, title, start_time) NULLS NOT DISTINCT;
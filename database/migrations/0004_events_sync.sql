@@ -0,0 +1,29 @@
+-- 증분 동기화(event_sync.py)용: updated_at 워터마크 키셋 인덱스와 삭제 기록(tombstone)
+CREATE INDEX IF NOT EXISTS idx_events_updated_at_id ON events(updated_at, id);
+
+CREATE TABLE IF NOT EXISTS events_tombstones (
+  id UUID PRIMARY KEY,
+  deleted_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_tombstones_deleted_at_id ON events_tombstones(deleted_at, id);
+
+-- 삭제한 사용자에게 events_tombstones 쓰기 권한이 없어도 기록되도록 SECURITY DEFINER 로 실행합니다.
+CREATE OR REPLACE FUNCTION record_event_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO events_tombstones (id) VALUES (OLD.id)
+    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END;
+$$ language 'plpgsql' SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS record_events_tombstone ON events;
+CREATE TRIGGER record_events_tombstone
+    AFTER DELETE ON events
+    FOR EACH ROW
+    EXECUTE FUNCTION record_event_tombstone();
+
+ALTER TABLE events_tombstones ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Enable read access for all users" ON events_tombstones;
+CREATE POLICY "Enable read access for all users" ON events_tombstones
+    FOR SELECT USING (true);
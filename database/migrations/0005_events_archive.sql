@@ -0,0 +1,58 @@
+-- 보관(event_archive.py)용: 보관 기간이 지난 일정을 옮겨 두는 events_archive 와 배치 이동 함수
+-- 지난 해 일정을 events 에서 빼 두면 월/카테고리 조회가 쓰는 인덱스(idx_events_category, idx_events_created_at 등)가 작게 유지됩니다.
+CREATE TABLE IF NOT EXISTS events_archive (
+  LIKE events INCLUDING DEFAULTS,
+  archived_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+  PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS idx_events_archive_date_id ON events_archive(date, id);
+
+ALTER TABLE events_archive ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Enable read access for all users" ON events_archive;
+CREATE POLICY "Enable read access for all users" ON events_archive
+    FOR SELECT USING (true);
+
+DROP POLICY IF EXISTS "Enable insert for all users" ON events_archive;
+CREATE POLICY "Enable insert for all users" ON events_archive
+    FOR INSERT WITH CHECK (true);
+
+DROP POLICY IF EXISTS "Enable update for all users" ON events_archive;
+CREATE POLICY "Enable update for all users" ON events_archive
+    FOR UPDATE USING (true);
+
+-- cutoff 이전 일정 중 (date, id) 가 (after_date, after_id) 다음인 batch_size 개를 한 트랜잭션으로 옮깁니다.
+-- 반복 일정(recurring IS NOT NULL)은 date 가 첫 회차라 오래되어도 아직 진행 중인 시리즈이므로 옮기지 않습니다.
+-- idx_events_date_id 범위 탐색이라 지운 행(dead tuple)을 다시 훑지 않고, 잠금은 한 배치 동안만 유지됩니다.
+-- 다른 트랜잭션이 잠근 행은 SKIP LOCKED 로 건너뛰고 다음 실행에서 옮깁니다.
+-- 반환값: 옮긴 행 수와 배치의 마지막 (date, id) (옮길 행이 없으면 NULL)
+CREATE OR REPLACE FUNCTION archive_events(cutoff DATE, batch_size INTEGER DEFAULT 1000,
+                                          after_date DATE DEFAULT NULL, after_id UUID DEFAULT NULL)
+RETURNS TABLE (moved INTEGER, last_date DATE, last_id UUID) AS $$
+    WITH batch AS (
+        SELECT e.id, e.date FROM events e
+        WHERE e.date < cutoff
+          AND e.recurring IS NULL
+          AND (after_date IS NULL OR (e.date, e.id) > (after_date, after_id))
+        ORDER BY e.date, e.id
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    ), removed AS (
+        DELETE FROM events e USING batch b WHERE e.id = b.id
+        RETURNING e.id, e.title, e.date, e.start_time, e.end_time, e.category, e.description, e.location,
+                  e.is_all_day, e.reminder, e.recurring, e.created_at, e.updated_at
+    ), copied AS (
+        INSERT INTO events_archive (id, title, date, start_time, end_time, category, description, location,
+                                    is_all_day, reminder, recurring, created_at, updated_at)
+        SELECT * FROM removed
+        ON CONFLICT (id) DO UPDATE SET
+            title = EXCLUDED.title, date = EXCLUDED.date, start_time = EXCLUDED.start_time,
+            end_time = EXCLUDED.end_time, category = EXCLUDED.category, description = EXCLUDED.description,
+            location = EXCLUDED.location, is_all_day = EXCLUDED.is_all_day, reminder = EXCLUDED.reminder,
+            recurring = EXCLUDED.recurring, updated_at = EXCLUDED.updated_at,
+            archived_at = timezone('utc'::text, now())
+        RETURNING 1
+    ), last_key AS (
+        SELECT b.date, b.id FROM batch b ORDER BY b.date DESC, b.id DESC LIMIT 1
+    )
+    SELECT (SELECT count(*)::integer FROM copied), (SELECT l.date FROM last_key l), (SELECT l.id FROM last_key l);
+$$ language 'sql';
@@ -0,0 +1,25 @@
+-- 변경 큐(mutation_queue.py)용: 서로 다른 행에 서로 다른 값을 쓰는 부분 갱신을 요청 한 번으로 처리
+-- PostgREST 의 bulk upsert 는 INSERT 를 거치므로 title/date 같은 NOT NULL 컬럼이 빠진 부분 갱신에는 쓸 수 없습니다.
+-- changes: [{"id": ..., "컬럼": 값, ...}, ...] - 키가 있는 컬럼만 바꾸고(null 이면 NULL 로), 없는 컬럼은 유지합니다.
+-- 한 문장이라 전체가 한 트랜잭션이고, updated_at 은 update_events_updated_at 트리거가 갱신합니다.
+-- 반환값: 갱신한 행 수 (없는 id 는 건너뜀)
+CREATE OR REPLACE FUNCTION update_events(changes JSONB)
+RETURNS INTEGER AS $$
+    WITH updated AS (
+        UPDATE events e SET
+            title = CASE WHEN c.doc ? 'title' THEN c.doc->>'title' ELSE e.title END,
+            date = CASE WHEN c.doc ? 'date' THEN (c.doc->>'date')::date ELSE e.date END,
+            start_time = CASE WHEN c.doc ? 'start_time' THEN (c.doc->>'start_time')::time ELSE e.start_time END,
+            end_time = CASE WHEN c.doc ? 'end_time' THEN (c.doc->>'end_time')::time ELSE e.end_time END,
+            category = CASE WHEN c.doc ? 'category' THEN (c.doc->>'category')::church_category ELSE e.category END,
+            description = CASE WHEN c.doc ? 'description' THEN c.doc->>'description' ELSE e.description END,
+            location = CASE WHEN c.doc ? 'location' THEN c.doc->>'location' ELSE e.location END,
+            is_all_day = CASE WHEN c.doc ? 'is_all_day' THEN (c.doc->>'is_all_day')::boolean ELSE e.is_all_day END,
+            reminder = CASE WHEN c.doc ? 'reminder' THEN (c.doc->>'reminder')::integer ELSE e.reminder END,
+            recurring = CASE WHEN c.doc ? 'recurring' THEN (c.doc->>'recurring')::recurring_type ELSE e.recurring END
+        FROM jsonb_array_elements(changes) AS c(doc)
+        WHERE e.id = (c.doc->>'id')::uuid
+        RETURNING 1
+    )
+    SELECT count(*)::integer FROM updated;
+$$ language 'sql';
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 오래된 일정 보관(archive) 스크립트
+보관 기간(기본: 올해와 지난 DEFAULT_KEEP_YEARS 년)이 지난 일정을 events 에서 events_archive 테이블
+(database/migrations/0005_events_archive.sql) 또는 연도별 압축 파일(events-YYYY.jsonl.gz)로 옮깁니다.
+getEventsByMonth/getEventsByCategory/getAllEvents 가 쓰는 events 와 그 인덱스가 최근 일정 크기로 유지됩니다.
+반복 일정은 date 가 첫 회차일 뿐 시리즈는 계속되므로(recurrence.py, reminder_scheduler.py, ICS RRULE) 옮기지 않습니다.
+
+- 테이블: archive_events RPC 가 (date, id) 키셋 배치 하나를 복사+삭제 한 트랜잭션으로 옮기므로
+  잠금은 배치 하나 동안만 잡히고, 중간에 멈춰도 옮긴 배치까지는 완료된 상태입니다.
+  RPC 가 없으면 키셋 페이지마다 upsert 후 삭제합니다(다시 실행해도 안전).
+- 파일: 배치를 연도별 gzip 파일 끝에 이어 쓰고 fsync 한 뒤 삭제합니다. 삭제 전에 멈추면 다음 실행에서
+  같은 행이 한 번 더 기록되며, 읽을 때 id 로 중복을 정리합니다.
+- 삭제는 events_tombstones 에 기록되므로 event_sync/month_snapshots 등의 파생 데이터에서도 빠집니다.
+
+iter_events_with_archive() 는 events 와 보관본을 (date, id) 순서로 합쳐 읽는 과거 조회용 read-through 입니다.
+(event_export.py --with-archive)
+
+사용 예:
+    python event_archive.py --dry-run              # 옮길 행 수만 확인
+    python event_archive.py                        # 2년 전 1월 1일 이전 일정을 events_archive 로 이동
+    python event_archive.py --before 2024-01-01 --files archive
+    python event_archive.py --read 2023-01-01 2023-12-31 --files archive
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import os
+import re
+import time
+from datetime import date
+
+from supabase import Client
+
+from event_constants import EVENT_COLUMNS
+from event_reader import DEFAULT_PAGE_SIZE, KEYSET_COLUMNS, iter_event_pages
+from supabase_client import get_client
+
+ARCHIVE_TABLE = 'events_archive'
+DEFAULT_KEEP_YEARS = 2
+DEFAULT_BATCH_SIZE = 1000
+# 배치 사이에 쉬는 시간 (다른 쓰기 요청이 끼어들 수 있도록)
+DEFAULT_PAUSE = 0.05
+# in_ 필터는 URL 에 들어가므로 삭제 요청 하나에 담는 id 수를 제한합니다.
+DELETE_CHUNK = 200
+
+ARCHIVE_FILE_PATTERN = re.compile(r'^events-(\d{4})\.jsonl\.gz$')
+
+# 보관 파일을 읽을 때 적용하는 event_reader 형식 필터 (in_ 은 따로 처리)
+FILE_FILTERS = {
+    'eq': lambda current, value: current == value,
+    'neq': lambda current, value: current != value,
+    'gt': lambda current, value: current > value,
+    'gte': lambda current, value: current >= value,
+    'lt': lambda current, value: current < value,
+    'lte': lambda current, value: current <= value,
+}
+
+def default_cutoff(keep_years: int = DEFAULT_KEEP_YEARS, today: date = None):
+    """보관 기준일: keep_years 년 전 1월 1일 (이 날짜 이전 일정을 옮김)"""
+    today = today or date.today()
+    return date(today.year - keep_years, 1, 1)
+
+def archive_file_path(directory: str, year: int):
+    return os.path.join(directory, f"events-{year:04d}.jsonl.gz")
+
+def archivable_filters(cutoff: date):
+    """옮길 행의 event_reader 필터: cutoff 이전에 있었던 반복하지 않는 일정"""
+    return [('lt', 'date', cutoff.isoformat()), ('is_', 'recurring', 'null')]
+
+def count_archivable(supabase: Client, cutoff: date):
+    """옮길 행 수 (HEAD 카운트)"""
+    query = supabase.table('events').select('id', count='exact', head=True)
+    for operator, column, value in archivable_filters(cutoff):
+        query = getattr(query, operator)(column, value)
+    return query.execute().count or 0
+
+def _delete_ids(supabase: Client, ids):
+    for offset in range(0, len(ids), DELETE_CHUNK):
+        supabase.table('events').delete(returning='minimal').in_('id', ids[offset:offset + DELETE_CHUNK]).execute()
+
+def _archive_batches_rpc(supabase: Client, cutoff: date, batch_size: int):
+    """archive_events RPC 로 배치를 하나씩 옮기며 옮긴 행 수를 반환하는 제너레이터"""
+    after_date, after_id = None, None
+    while True:
+        result = supabase.rpc('archive_events', {
+            "cutoff": cutoff.isoformat(),
+            "batch_size": batch_size,
+            "after_date": after_date,
+            "after_id": after_id,
+        }).execute().data
+        row = result[0] if isinstance(result, list) else result
+        if not row or row.get('last_id') is None:
+            return
+        yield row['moved']
+        after_date, after_id = row['last_date'], row['last_id']
+
+def _archive_batches_copy(supabase: Client, cutoff: date, batch_size: int):
+    """RPC 가 없을 때: 키셋 페이지를 events_archive 에 upsert 한 뒤 events 에서 삭제"""
+    for page in iter_event_pages(supabase, EVENT_COLUMNS, batch_size, archivable_filters(cutoff)):
+        supabase.table(ARCHIVE_TABLE).upsert(page, on_conflict='id', returning='minimal').execute()
+        _delete_ids(supabase, [row['id'] for row in page])
+        yield len(page)
+
+def _archive_batches_files(supabase: Client, cutoff: date, batch_size: int, directory: str):
+    """키셋 페이지를 연도별 gzip 파일 끝에 이어 쓰고 디스크에 기록된 뒤 events 에서 삭제"""
+    os.makedirs(directory, exist_ok=True)
+    for page in iter_event_pages(supabase, EVENT_COLUMNS, batch_size, archivable_filters(cutoff)):
+        by_year = {}
+        for row in page:
+            by_year.setdefault(int(row['date'][:4]), []).append(row)
+        for year, rows in by_year.items():
+            # 이어 쓴 gzip 멤버도 gzip.open 으로 한 번에 읽힙니다.
+            with open(archive_file_path(directory, year), 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='ab') as f:
+                    f.write(''.join(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n'
+                                    for row in rows).encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+        _delete_ids(supabase, [row['id'] for row in page])
+        yield len(page)
+
+def archive_events(supabase: Client, cutoff: date, batch_size: int = DEFAULT_BATCH_SIZE, pause: float = DEFAULT_PAUSE,
+                   directory: str = None):
+    """cutoff 이전 일정을 배치 단위로 보관
+
+    반환값: {"moved": 옮긴 행 수, "batches": 배치 수, "max_batch_seconds": 가장 오래 걸린 배치 시간, "mode": 방식}
+    """
+    if directory:
+        mode, batches = 'files', _archive_batches_files(supabase, cutoff, batch_size, directory)
+    else:
+        mode, batches = 'rpc', _archive_batches_rpc(supabase, cutoff, batch_size)
+
+    stats = {"moved": 0, "batches": 0, "max_batch_seconds": 0.0, "mode": mode}
+    while True:
+        started = time.perf_counter()
+        try:
+            moved = next(batches)
+        except StopIteration:
+            break
+        except Exception as e:
+            if stats["mode"] != 'rpc' or stats["batches"]:
+                raise
+            print(f"ℹ️ archive_events RPC를 사용할 수 없어 복사 후 삭제로 옮깁니다: {str(e)}")
+            stats["mode"], batches = 'copy', _archive_batches_copy(supabase, cutoff, batch_size)
+            continue
+        stats["moved"] += moved
+        stats["batches"] += 1
+        stats["max_batch_seconds"] = max(stats["max_batch_seconds"], time.perf_counter() - started)
+        if stats["batches"] % 50 == 0:
+            print(f"   ⏱️ {stats['batches']}개 배치, {stats['moved']:,}개 이동")
+        if pause:
+            time.sleep(pause)
+    return stats
+
+def read_archive_file(path: str):
+    """보관 파일의 행 목록 ((date, id) 순서, 같은 id 는 마지막 기록만)"""
+    rows = {}
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                rows[row['id']] = row
+    return sorted(rows.values(), key=lambda row: (row['date'], row['id']))
+
+def _matches(row, filters):
+    """event_reader 형식 필터를 보관 파일 행에 적용 (eq/neq/gt/gte/lt/lte/in_)"""
+    for operator, column, value in filters:
+        current = row.get(column)
+        if operator == 'in_':
+            if current not in value:
+                return False
+            continue
+        if operator != 'neq' and current is None:
+            return False
+        if not FILE_FILTERS[operator](current, value.isoformat() if isinstance(value, date) else value):
+            return False
+    return True
+
+def _file_years(directory: str, filters):
+    """보관 파일이 있는 연도 중 날짜 필터 범위에 걸치는 연도"""
+    if not os.path.isdir(directory):
+        return []
+    low, high = '0000', '9999'
+    for operator, column, value in filters:
+        if column == 'date':
+            year = str(value)[:4]
+            if operator in ('gt', 'gte', 'eq'):
+                low = max(low, year)
+            if operator in ('lt', 'lte', 'eq'):
+                high = min(high, year)
+    years = [match.group(1) for match in map(ARCHIVE_FILE_PATTERN.match, os.listdir(directory)) if match]
+    return sorted(int(year) for year in years if low <= year <= high)
+
+def iter_archive(supabase: Client, columns=None, page_size: int = DEFAULT_PAGE_SIZE, filters=(), directory: str = None):
+    """보관본을 (date, id) 순서로 한 행씩 반환 (directory 가 있으면 파일, 없으면 events_archive)"""
+    if not directory:
+        for page in iter_event_pages(supabase, columns, page_size, filters, table=ARCHIVE_TABLE):
+            yield from page
+        return
+
+    selected = list(columns) + [column for column in KEYSET_COLUMNS if column not in columns] if columns else None
+    for year in _file_years(directory, filters):
+        for row in read_archive_file(archive_file_path(directory, year)):
+            if _matches(row, filters):
+                yield {column: row.get(column) for column in selected} if selected else row
+
+def iter_events_with_archive(supabase: Client, columns=None, page_size: int = DEFAULT_PAGE_SIZE, filters=(),
+                             directory: str = None):
+    """events 와 보관본을 (date, id) 순서로 합쳐 한 행씩 반환하는 read-through
+
+    옮기는 도중 멈춰 양쪽에 같은 행이 있으면 (date, id) 가 같아 나란히 나오므로 events 쪽 하나만 남깁니다.
+    """
+    def hot():
+        for page in iter_event_pages(supabase, columns, page_size, filters):
+            yield from page
+
+    merged = heapq.merge(((row['date'], row['id'], 0, row) for row in hot()),
+                         ((row['date'], row['id'], 1, row) for row in iter_archive(supabase, columns, page_size,
+                                                                                   filters, directory)),
+                         key=lambda item: item[:3])
+    previous = None
+    for event_date, event_id, _, row in merged:
+        if (event_date, event_id) == previous:
+            continue
+        previous = (event_date, event_id)
+        yield row
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 오래된 일정 보관")
+    parser.add_argument('--keep-years', type=int, default=DEFAULT_KEEP_YEARS,
+                        help="올해 외에 events 에 남길 지난 연도 수")
+    parser.add_argument('--before', type=date.fromisoformat, default=None,
+                        help="이 날짜 이전 일정을 보관 (기본: --keep-years 로 계산)")
+    parser.add_argument('--files', default=None, help="events_archive 대신 연도별 압축 파일로 보관할 디렉터리")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="배치(트랜잭션)당 행 수")
+    parser.add_argument('--pause', type=float, default=DEFAULT_PAUSE, help="배치 사이 대기 시간(초)")
+    parser.add_argument('--dry-run', action='store_true', help="옮길 행 수만 출력")
+    parser.add_argument('--read', nargs=2, type=date.fromisoformat, metavar=('START', 'END'),
+                        help="보관본을 포함해 기간의 일정 수 조회 (read-through 확인)")
+    args = parser.parse_args()
+
+    supabase = get_client()
+
+    if args.read:
+        start, end = args.read
+        filters = [('gte', 'date', start.isoformat()), ('lte', 'date', end.isoformat())]
+        started = time.perf_counter()
+        hot = sum(len(page) for page in iter_event_pages(supabase, ['id'], filters=filters))
+        total = sum(1 for _ in iter_events_with_archive(supabase, ['id'], filters=filters, directory=args.files))
+        print(f"📚 {start} ~ {end}: events {hot:,}개 + 보관본 {total - hot:,}개 = {total:,}개 "
+              f"({time.perf_counter() - started:.2f}초)")
+        return
+
+    cutoff = args.before or default_cutoff(args.keep_years)
+    target = args.files or ARCHIVE_TABLE
+    count = count_archivable(supabase, cutoff)
+    print(f"🗄️ {cutoff} 이전 일정 {count:,}개 -> {target}")
+    if args.dry_run or not count:
+        return
+
+    started = time.perf_counter()
+    stats = archive_events(supabase, cutoff, args.batch_size, args.pause, args.files)
+    print(f"✅ {stats['moved']:,}개 이동 ({stats['mode']}, {stats['batches']}개 배치, "
+          f"배치 최대 {stats['max_batch_seconds'] * 1000:.1f}ms, 전체 {time.perf_counter() - started:.2f}초)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 열 단위(columnar) 이벤트 저장소
+result.data 의 dict 목록은 한국어 문자열과 반복되는 키 때문에 행마다 1KB 가까이 차지합니다.
+EventColumns 는 같은 데이터를 컬럼별 NumPy 배열로 압축해 백만 행 분석도 수십 MB 안에서 처리합니다.
+
+- date: int32 ordinal (date.toordinal())
+- start_time / end_time: 자정 기준 분(int16, 없으면 -1)
+- category: church_category ENUM 순서의 int8 코드 (event_constants.CATEGORY_ENUM)
+- recurring: RECURRING_TYPES 순서의 int8 코드, reminder: int16 분 (없으면 -1)
+- is_all_day: 비트마스크 (8행당 1바이트)
+- id: UUID 16바이트 (uint8 x 16 - S16 은 끝의 0 바이트를 잘라내므로 쓰지 않음)
+- 문자열: 사전 인코딩(int32 코드 + UTF-8 사전). 제목처럼 거의 모든 값이 다른 컬럼은
+  사전 해시를 버리고 값만 이어 붙여 저장해 적재 중 메모리도 늘지 않습니다.
+
+group_count() 는 여러 키를 정수 하나로 묶어 bincount/unique 한 번으로 집계합니다.
+
+사용 예:
+    python event_columns.py --rows 1000000      # dict 목록 대비 메모리/집계 시간 비교
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from array import array
+from datetime import date
+
+import numpy as np
+from supabase import Client
+
+from event_constants import CATEGORY_ENUM, RECURRING_TYPES
+from event_reader import DEFAULT_PAGE_SIZE, iter_event_pages
+
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORY_ENUM)}
+RECURRING_CODES = {kind: code for code, kind in enumerate(RECURRING_TYPES)}
+
+# 1970-01-01 의 ordinal (datetime64 변환용)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+STRING_COLUMNS = ('title', 'location', 'description')
+COLUMNS = ('id', 'date', 'start_time', 'end_time', 'category', 'is_all_day', 'reminder', 'recurring') + STRING_COLUMNS
+
+# 이 행 수만큼 쌓인 뒤 서로 다른 값의 비율이 기준을 넘으면 사전 해시를 버립니다.
+DICTIONARY_CHECK_ROWS = 10000
+DICTIONARY_MAX_RATIO = 0.5
+
+# 조합 키 범위가 이보다 작으면 bincount, 크면 unique 로 집계
+BINCOUNT_LIMIT = 1 << 24
+
+def time_to_minutes(value):
+    """'HH:MM[:SS]' -> 자정 기준 분 (없으면 -1)"""
+    if not value:
+        return -1
+    hour, minute = str(value).split(':')[:2]
+    return int(hour) * 60 + int(minute)
+
+def minutes_to_time(value):
+    """자정 기준 분 -> 'HH:MM:SS' (-1 이면 None)"""
+    if value < 0:
+        return None
+    return f"{value // 60:02d}:{value % 60:02d}:00"
+
+class StringColumn:
+    """사전 인코딩 문자열 컬럼 (코드 -1 = None)"""
+
+    def __init__(self):
+        self._index = {}
+        self._blob = bytearray()
+        self._offsets = array('q', [0])
+        self._codes = array('i')
+        self.codes = None
+        self.offsets = None
+        self.blob = None
+
+    def append(self, value):
+        if value is None:
+            self._codes.append(-1)
+            return
+        code = self._index.get(value) if self._index is not None else None
+        if code is None:
+            code = len(self._offsets) - 1
+            self._blob += value.encode('utf-8')
+            self._offsets.append(len(self._blob))
+            if self._index is not None:
+                self._index[value] = code
+                if (len(self._codes) >= DICTIONARY_CHECK_ROWS
+                        and len(self._index) > len(self._codes) * DICTIONARY_MAX_RATIO):
+                    # 거의 모든 값이 다르면 해시가 값보다 커지므로 이후 값은 중복 확인 없이 이어 붙입니다.
+                    self._index = None
+        self._codes.append(code)
+
+    def freeze(self):
+        """적재 버퍼를 NumPy 배열로 고정"""
+        self.codes = np.frombuffer(self._codes, dtype=np.int32).copy()
+        offsets = np.frombuffer(self._offsets, dtype=np.int64)
+        self.offsets = offsets.astype(np.int32) if offsets[-1] < 2 ** 31 else offsets.copy()
+        self.blob = bytes(self._blob)
+        self._index = self._blob = self._offsets = self._codes = None
+        return self
+
+    @classmethod
+    def from_parts(cls, codes, offsets, blob):
+        column = cls.__new__(cls)
+        column.codes, column.offsets, column.blob = codes, offsets, blob
+        column._index = column._blob = column._offsets = column._codes = None
+        return column
+
+    @property
+    def cardinality(self):
+        """사전 항목 수"""
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.offsets.nbytes + len(self.blob)
+
+    def decode(self, code: int):
+        if code < 0:
+            return None
+        return self.blob[self.offsets[code]:self.offsets[code + 1]].decode('utf-8')
+
+    def take(self, indices):
+        """행 선택 (사전은 공유)"""
+        return StringColumn.from_parts(self.codes[indices], self.offsets, self.blob)
+
+class EventColumns:
+    """열 단위 이벤트 저장소"""
+
+    def __init__(self, size: int, ids, dates, start_minutes, end_minutes, categories, all_day_bits, reminders,
+                 recurring, strings):
+        self.size = size
+        self.ids = ids
+        self.dates = dates
+        self.start_minutes = start_minutes
+        self.end_minutes = end_minutes
+        self.categories = categories
+        self.all_day_bits = all_day_bits
+        self.reminders = reminders
+        self.recurring = recurring
+        self.strings = strings
+
+    @classmethod
+    def from_rows(cls, rows):
+        """dict 행(이터러블)을 한 번 순회하며 열 저장소 생성 (행 목록을 따로 보관하지 않음)"""
+        ids = bytearray()
+        dates = array('i')
+        start_minutes = array('h')
+        end_minutes = array('h')
+        categories = array('b')
+        all_day = bytearray()
+        reminders = array('h')
+        recurring = array('b')
+        strings = {name: StringColumn() for name in STRING_COLUMNS}
+        has_ids = True
+
+        # 시간 문자열은 종류가 적으므로 변환 결과를 재사용합니다.
+        minutes = {None: -1}
+        size = 0
+        for row in rows:
+            row_id = row.get('id')
+            if row_id is None:
+                has_ids = False
+            elif has_ids:
+                ids += bytes.fromhex(str(row_id).replace('-', ''))
+            dates.append(date.fromisoformat(str(row['date'])[:10]).toordinal())
+            for value, target in ((row.get('start_time'), start_minutes), (row.get('end_time'), end_minutes)):
+                minute = minutes.get(value)
+                if minute is None:
+                    minute = minutes[value] = time_to_minutes(value)
+                target.append(minute)
+            categories.append(CATEGORY_CODES.get(row.get('category'), -1))
+            all_day.append(1 if row.get('is_all_day') else 0)
+            reminder = row.get('reminder')
+            reminders.append(-1 if reminder is None else int(reminder))
+            recurring.append(RECURRING_CODES.get(row.get('recurring'), -1))
+            for name, column in strings.items():
+                column.append(row.get(name))
+            size += 1
+
+        return cls(
+            size,
+            np.frombuffer(bytes(ids), dtype=np.uint8).reshape(-1, 16) if has_ids and size else None,
+            np.frombuffer(dates, dtype=np.int32).copy(),
+            np.frombuffer(start_minutes, dtype=np.int16).copy(),
+            np.frombuffer(end_minutes, dtype=np.int16).copy(),
+            np.frombuffer(categories, dtype=np.int8).copy(),
+            np.packbits(np.frombuffer(bytes(all_day), dtype=np.uint8)),
+            np.frombuffer(reminders, dtype=np.int16).copy(),
+            np.frombuffer(recurring, dtype=np.int8).copy(),
+            {name: column.freeze() for name, column in strings.items()},
+        )
+
+    @classmethod
+    def from_supabase(cls, supabase: Client, columns=None, filters=(), page_size: int = DEFAULT_PAGE_SIZE):
+        """events 를 키셋 페이지로 받아 바로 열 저장소에 적재 (한 번에 한 페이지만 dict 로 유지)"""
+        pages = iter_event_pages(supabase, list(columns or COLUMNS), page_size, filters)
+        return cls.from_rows(row for page in pages for row in page)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """배열/사전이 차지하는 바이트 수"""
+        arrays = [self.dates, self.start_minutes, self.end_minutes, self.categories, self.all_day_bits,
+                  self.reminders, self.recurring] + ([self.ids] if self.ids is not None else [])
+        return sum(values.nbytes for values in arrays) + sum(column.nbytes for column in self.strings.values())
+
+    @property
+    def is_all_day(self):
+        return np.unpackbits(self.all_day_bits, count=self.size).astype(bool)
+
+    def datetimes(self):
+        """날짜 컬럼을 datetime64[D] 배열로"""
+        return (self.dates - EPOCH_ORDINAL).astype('datetime64[D]')
+
+    def take(self, selector):
+        """불리언 마스크나 인덱스 배열로 행 선택"""
+        indices = np.flatnonzero(selector) if np.asarray(selector).dtype == bool else np.asarray(selector)
+        return EventColumns(
+            len(indices),
+            self.ids[indices] if self.ids is not None else None,
+            self.dates[indices],
+            self.start_minutes[indices],
+            self.end_minutes[indices],
+            self.categories[indices],
+            np.packbits(self.is_all_day[indices]),
+            self.reminders[indices],
+            self.recurring[indices],
+            {name: column.take(indices) for name, column in self.strings.items()},
+        )
+
+    def row(self, index: int):
+        """행 하나를 events dict 형태로 복원"""
+        return {
+            "id": str(uuid.UUID(bytes=bytes(self.ids[index]))) if self.ids is not None else None,
+            "title": self.strings['title'].decode(int(self.strings['title'].codes[index])),
+            "date": date.fromordinal(int(self.dates[index])).isoformat(),
+            "start_time": minutes_to_time(int(self.start_minutes[index])),
+            "end_time": minutes_to_time(int(self.end_minutes[index])),
+            "category": CATEGORY_ENUM[self.categories[index]] if self.categories[index] >= 0 else None,
+            "description": self.strings['description'].decode(int(self.strings['description'].codes[index])),
+            "location": self.strings['location'].decode(int(self.strings['location'].codes[index])),
+            "is_all_day": bool(self.all_day_bits[index >> 3] >> (7 - (index & 7)) & 1),
+            "reminder": int(self.reminders[index]) if self.reminders[index] >= 0 else None,
+            "recurring": RECURRING_TYPES[self.recurring[index]] if self.recurring[index] >= 0 else None,
+        }
+
+    def iter_rows(self):
+        for index in range(self.size):
+            yield self.row(index)
+
+    def _group_key(self, key: str):
+        """집계 키 -> (int64 코드 배열, 코드 -> 라벨 함수) - 코드 -1 은 값 없음"""
+        if key == 'category':
+            return self.categories.astype(np.int64), lambda code: CATEGORY_ENUM[code]
+        if key == 'recurring':
+            return self.recurring.astype(np.int64), lambda code: RECURRING_TYPES[code]
+        if key == 'date':
+            return self.dates.astype(np.int64), lambda code: date.fromordinal(code).isoformat()
+        if key == 'month':
+            months = self.datetimes().astype('datetime64[M]').astype(np.int64)
+            return months, lambda code: str(np.datetime64(code, 'M'))
+        if key == 'year':
+            return self.datetimes().astype('datetime64[Y]').astype(np.int64) + 1970, int
+        if key == 'weekday':
+            # ordinal 1(0001-01-01) 이 월요일이므로 0=월요일 ... 6=일요일
+            return (self.dates.astype(np.int64) - 1) % 7, int
+        if key == 'start_hour':
+            hours = self.start_minutes.astype(np.int64)
+            return np.where(hours >= 0, hours // 60, -1), int
+        if key == 'is_all_day':
+            return self.is_all_day.astype(np.int64), lambda code: bool(code)
+        if key in self.strings:
+            column = self.strings[key]
+            return column.codes.astype(np.int64), column.decode
+        raise ValueError(f"지원하지 않는 집계 키입니다: {key}")
+
+    def group_count(self, *keys):
+        """키별 행 수
+
+        키가 하나면 {라벨: 수}, 여러 개면 {(라벨, ...): 수}. 값 없음은 None 라벨이며 결과는 코드 순서입니다.
+        사전 인코딩을 건너뛴 문자열 컬럼은 같은 문자열의 수를 라벨 기준으로 합칩니다.
+        """
+        if not keys:
+            raise ValueError("집계 키가 필요합니다.")
+        parts = [self._group_key(key) for key in keys]
+        if not self.size:
+            return {}
+
+        combined = np.zeros(self.size, dtype=np.int64)
+        lows = []
+        radices = []
+        span = 1
+        for codes, _ in parts:
+            low = int(codes.min())
+            radix = int(codes.max()) - low + 1
+            lows.append(low)
+            radices.append(radix)
+            span *= radix
+            combined = combined * radix + (codes - low)
+
+        if span <= BINCOUNT_LIMIT:
+            counts = np.bincount(combined, minlength=span)
+            values = np.flatnonzero(counts)
+            counts = counts[values]
+        else:
+            values, counts = np.unique(combined, return_counts=True)
+
+        result = {}
+        for value, count in zip(values.tolist(), counts.tolist()):
+            labels = []
+            for (_, decode), low, radix in zip(reversed(parts), reversed(lows), reversed(radices)):
+                value, code = divmod(value, radix)
+                code += low
+                labels.append(None if code < 0 else decode(code))
+            labels.reverse()
+            label = labels[0] if len(keys) == 1 else tuple(labels)
+            result[label] = result.get(label, 0) + count
+        return result
+
+def _python_category_counts(rows):
+    """dict 목록 기준선 (setup_supabase.verify_data 의 기존 루프)"""
+    categories = {}
+    for row in rows:
+        categories[row['category']] = categories.get(row['category'], 0) + 1
+    return categories
+
+def main():
+    """dict 목록과 열 저장소의 메모리/집계 시간 비교"""
+    from seed_events import generate_chunk
+
+    parser = argparse.ArgumentParser(description="열 단위 이벤트 저장소 벤치마크")
+    parser.add_argument('--rows', type=int, default=200000, help="합성 이벤트 수")
+    parser.add_argument('--seed', type=int, default=42, help="합성 데이터 시드")
+    args = parser.parse_args()
+
+    chunk = 10000
+    rows_iter = lambda: (row for index in range(0, args.rows, chunk)
+                         for row in generate_chunk(args.seed, index // chunk, chunk, args.rows))
+    print(f"🧮 합성 이벤트 {args.rows:,}개로 비교합니다...")
+
+    tracemalloc.start()
+    rows = [dict(row, id=str(uuid.UUID(int=index + 1))) for index, row in enumerate(rows_iter())]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    expected = _python_category_counts(rows)
+    dict_seconds = time.perf_counter() - started
+    del rows
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    store = EventColumns.from_rows(dict(row, id=str(uuid.UUID(int=index + 1))) for index, row in enumerate(rows_iter()))
+    build_seconds = time.perf_counter() - started
+    # 적재 중 최대 메모리는 tracemalloc 이 적재를 크게 느리게 하므로 따로 한 번 더 적재해 잽니다.
+    tracemalloc.start()
+    EventColumns.from_rows(dict(row, id=str(uuid.UUID(int=index + 1))) for index, row in enumerate(rows_iter()))
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    actual = store.group_count('category')
+    column_seconds = time.perf_counter() - started
+
+    if actual != expected:
+        print("❌ 열 저장소 집계 결과가 dict 목록 집계와 다릅니다.")
+        raise SystemExit(1)
+
+    print(f"✅ 카테고리 {len(actual)}개 집계 일치")
+    print(f"   📦 dict 목록: {dict_bytes / 1e6:,.1f}MB ({dict_bytes / args.rows:,.0f}B/행)")
+    print(f"   📦 열 저장소: {store.nbytes / 1e6:,.1f}MB ({store.nbytes / args.rows:,.0f}B/행), "
+          f"합성+적재 {build_seconds:.2f}초, 적재 중 최대 {build_peak / 1e6:,.1f}MB")
+    print(f"   ⚡ 카테고리 집계: dict 루프 {dict_seconds * 1000:.1f}ms, group_count {column_seconds * 1000:.1f}ms")
+    started = time.perf_counter()
+    by_month = store.group_count('category', 'month')
+    print(f"   ⚡ 카테고리 x 월 집계 {len(by_month)}개 그룹: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 events 테이블 공용 상수
+database/schema.sql 의 ENUM 정의와 같은 순서를 유지합니다.
+"""
+
+# events 테이블 컬럼 (database/schema.sql 순서)
+EVENT_COLUMNS = ('id', 'title', 'date', 'start_time', 'end_time', 'category', 'description', 'location',
+                 'is_all_day', 'reminder', 'recurring', 'created_at', 'updated_at')
+
+# church_category ENUM 값
+CATEGORIES = ['church', 'adult', 'youth', 'advisory', 'women', 'student', 'children']
+
+# database/migrations/0002_excel_categories.sql 에서 추가한 ENUM 값 (추가 순서)
+EXCEL_CATEGORIES = ['worship', 'celebration', 'theology', 'admin', 'education', 'evangelism', 'service', 'regional']
+
+# church_category ENUM 전체 정렬 순서 (열 저장소의 카테고리 코드)
+CATEGORY_ENUM = CATEGORIES + EXCEL_CATEGORIES
+
+# recurring_type ENUM 값
+RECURRING_TYPES = ['daily', 'weekly', 'monthly', 'yearly']
+
+# lib/calendar-utils.ts 의 CHURCH_CATEGORIES 라벨 (내보내기/리포트 표시용)
+CATEGORY_LABELS = {
+    'worship': '예배/인맞음',
+    'celebration': '송하행사',
+    'theology': '신학부',
+    'admin': '관리부',
+    'education': '교육부',
+    'evangelism': '전도부',
+    'service': '봉사/홍보',
+    'regional': '나주지역회의',
+    'church': '교회',
+    'adult': '장년회',
+    'women': '부녀회',
+    'youth': '청년회',
+    'advisory': '자문회',
+    'children': '유년회',
+    'student': '학생회',
+}
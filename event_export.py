@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 CSV / iCalendar 스트리밍 내보내기 스크립트
+lib/csv-export.ts 의 convertEventsToCSV 는 전체 목록을 메모리에 올려 문자열 하나로 만들기 때문에
+여러 해의 일정을 내보내면 브라우저가 버티지 못합니다.
+이 스크립트는 events 를 (date, id) 키셋 페이지로 받아 한 행씩 파일(또는 표준 출력)에 바로 쓰므로
+행 수와 관계없이 한 페이지 분량의 메모리만 사용합니다.
+
+- CSV: convertEventsToCSV 와 같은 BOM, 헤더, 컬럼 순서, escapeCSV 규칙, '\\n' 줄바꿈
+- ICS: RFC 5545 (CRLF, 75옥텟 줄 접기, TEXT 이스케이프), recurring 은 RRULE, reminder 는 VALARM 으로 변환
+  monthly/yearly RRULE 은 recurrence.py 와 같이 없는 날짜를 말일로 맞춥니다.
+
+날짜 필터는 일정의 시작일(date) 기준이므로 기간 전에 시작한 반복 일정은 포함되지 않습니다.
+--with-archive 는 event_archive.py 로 옮긴 과거 일정도 같은 순서로 합쳐 내보냅니다.
+
+사용 예:
+    python event_export.py events.csv
+    python event_export.py events.ics --category youth --category student
+    python event_export.py - --format ics --start 2026-01-01 --end 2026-12-31 > 2026.ics
+    python event_export.py 2023.csv --start 2023-01-01 --end 2023-12-31 --with-archive
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from supabase import Client
+
+from event_archive import iter_events_with_archive
+from event_constants import CATEGORY_LABELS
+from event_reader import DEFAULT_PAGE_SIZE, iter_events
+from supabase_client import get_client
+
+EXPORT_COLUMNS = ('id', 'title', 'date', 'start_time', 'end_time', 'category', 'description', 'location',
+                  'is_all_day', 'reminder', 'recurring', 'updated_at')
+
+# convertEventsToCSV 헤더
+CSV_HEADERS = ['날짜', '제목', '카테고리', '시작시간', '종료시간', '장소', '설명', '종일', '알림', '반복']
+
+# Excel 에서 한글이 깨지지 않도록 붙이는 BOM
+BOM = '\ufeff'
+
+ICS_TIMEZONE = 'Asia/Seoul'
+ICS_PRODID = '-//Naju Church//Calendar Export//KO'
+ICS_UID_DOMAIN = 'naju-church-calendar'
+
+# 한국은 일광 절약 시간이 없으므로 고정 오프셋 하나로 충분합니다.
+ICS_VTIMEZONE = [
+    'BEGIN:VTIMEZONE',
+    f'TZID:{ICS_TIMEZONE}',
+    'BEGIN:STANDARD',
+    'DTSTART:19700101T000000',
+    'TZOFFSETFROM:+0900',
+    'TZOFFSETTO:+0900',
+    'TZNAME:KST',
+    'END:STANDARD',
+    'END:VTIMEZONE',
+]
+
+FORMATS = ('csv', 'ics')
+
+def escape_csv(text):
+    """escapeCSV 와 같은 규칙 (쉼표, 줄바꿈, 큰따옴표가 있으면 큰따옴표로 감싸기)"""
+    if not text:
+        return ''
+    if ',' in text or '\n' in text or '"' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def csv_line(row):
+    """이벤트 행 하나를 convertEventsToCSV 의 한 줄로 변환"""
+    return ','.join([
+        str(row['date'])[:10],
+        escape_csv(row['title']),
+        CATEGORY_LABELS.get(row['category'], row['category']),
+        row.get('start_time') or '',
+        row.get('end_time') or '',
+        escape_csv(row.get('location') or ''),
+        escape_csv(row.get('description') or ''),
+        '예' if row.get('is_all_day') else '아니오',
+        str(row.get('reminder') or ''),
+        row.get('recurring') or '',
+    ])
+
+def write_csv(rows, out):
+    """CSV 스트리밍 쓰기 (마지막 줄 뒤에 줄바꿈 없음 - convertEventsToCSV 와 동일)
+
+    반환값: 쓴 행 수
+    """
+    out.write(BOM + ','.join(CSV_HEADERS))
+    written = 0
+    for row in rows:
+        out.write('\n' + csv_line(row))
+        written += 1
+    return written
+
+def escape_ics_text(text: str):
+    """RFC 5545 TEXT 값 이스케이프"""
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def fold_ics_line(line: str):
+    """한 줄이 75옥텟을 넘으면 CRLF + 공백으로 접기 (UTF-8 문자 중간에서 자르지 않음)"""
+    if len(line.encode('utf-8')) <= 75:
+        return line + '\r\n'
+    parts = []
+    current = ''
+    size = 0
+    limit = 75
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > limit:
+            parts.append(current)
+            # 이어지는 줄은 앞의 공백 1옥텟을 포함해 75옥텟
+            current, size, limit = char, width, 74
+        else:
+            current += char
+            size += width
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+def _ics_date(value):
+    return str(value)[:10].replace('-', '')
+
+def _ics_local(day, clock):
+    """'YYYY-MM-DD' + 'HH:MM[:SS]' -> YYYYMMDDTHHMMSS"""
+    hour, minute, *rest = str(clock).split(':')
+    second = rest[0][:2] if rest else '00'
+    return f"{_ics_date(day)}T{int(hour):02d}{minute}{second}"
+
+def _ics_utc(value):
+    """timestamptz 문자열 -> YYYYMMDDTHHMMSSZ (값이 없으면 현재 시각)"""
+    if value:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+    else:
+        parsed = datetime.now(timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+def rrule_for(kind: str, anchor):
+    """recurring 값 -> RRULE
+
+    RFC 5545 의 FREQ=MONTHLY 는 31일이 없는 달을 건너뛰지만 recurrence.py 는 말일로 맞추므로,
+    29일 이후에 시작하는 월/연 반복은 BYMONTHDAY=<일>,-1;BYSETPOS=1 로 같은 날짜를 만듭니다.
+    """
+    if not kind:
+        return None
+    anchor = date.fromisoformat(str(anchor)[:10])
+    if kind == 'monthly' and anchor.day > 28:
+        return f'FREQ=MONTHLY;BYMONTHDAY={anchor.day},-1;BYSETPOS=1'
+    if kind == 'yearly' and anchor.month == 2 and anchor.day == 29:
+        return 'FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=29,-1;BYSETPOS=1'
+    return f'FREQ={kind.upper()}'
+
+def ics_event_lines(row):
+    """이벤트 행 하나를 VEVENT 줄 목록으로 변환 (접기 전)"""
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{row['id']}@{ICS_UID_DOMAIN}",
+        f"DTSTAMP:{_ics_utc(row.get('updated_at'))}",
+    ]
+
+    start_time = row.get('start_time')
+    end_time = row.get('end_time')
+    if row.get('is_all_day') or not start_time:
+        day = date.fromisoformat(str(row['date'])[:10])
+        lines.append(f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}")
+        # 종일 일정의 DTEND 는 다음 날(미포함)
+        lines.append(f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}")
+    else:
+        lines.append(f"DTSTART;TZID={ICS_TIMEZONE}:{_ics_local(row['date'], start_time)}")
+        if end_time:
+            end_day = str(row['date'])[:10]
+            # 자정을 넘기는 일정은 종료일을 다음 날로
+            if _ics_local(end_day, end_time) < _ics_local(end_day, start_time):
+                end_day = (date.fromisoformat(end_day) + timedelta(days=1)).isoformat()
+            lines.append(f"DTEND;TZID={ICS_TIMEZONE}:{_ics_local(end_day, end_time)}")
+
+    rrule = rrule_for(row.get('recurring'), row['date'])
+    if rrule:
+        lines.append(f'RRULE:{rrule}')
+
+    lines.append(f"SUMMARY:{escape_ics_text(row['title'])}")
+    if row.get('location'):
+        lines.append(f"LOCATION:{escape_ics_text(row['location'])}")
+    if row.get('description'):
+        lines.append(f"DESCRIPTION:{escape_ics_text(row['description'])}")
+    lines.append(f"CATEGORIES:{escape_ics_text(CATEGORY_LABELS.get(row['category'], row['category']))}")
+
+    if row.get('reminder'):
+        lines.extend([
+            'BEGIN:VALARM',
+            'ACTION:DISPLAY',
+            f"DESCRIPTION:{escape_ics_text(row['title'])}",
+            f"TRIGGER:-PT{int(row['reminder'])}M",
+            'END:VALARM',
+        ])
+    lines.append('END:VEVENT')
+    return lines
+
+def write_ics(rows, out):
+    """iCalendar 스트리밍 쓰기
+
+    반환값: 쓴 행 수
+    """
+    header = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{ICS_PRODID}', 'CALSCALE:GREGORIAN',
+              'X-WR-CALNAME:나주교회 일정', f'X-WR-TIMEZONE:{ICS_TIMEZONE}'] + ICS_VTIMEZONE
+    out.write(''.join(fold_ics_line(line) for line in header))
+    written = 0
+    for row in rows:
+        out.write(''.join(fold_ics_line(line) for line in ics_event_lines(row)))
+        written += 1
+    out.write(fold_ics_line('END:VCALENDAR'))
+    return written
+
+def export_filters(categories=None, start=None, end=None):
+    """카테고리/기간 옵션 -> iter_events filters"""
+    filters = []
+    if categories:
+        filters.append(('eq', 'category', categories[0]) if len(categories) == 1 else ('in_', 'category', list(categories)))
+    if start:
+        filters.append(('gte', 'date', str(start)))
+    if end:
+        filters.append(('lte', 'date', str(end)))
+    return filters
+
+def export_events(supabase: Client, out, export_format: str = 'csv', categories=None, start=None, end=None,
+                  page_size: int = DEFAULT_PAGE_SIZE, with_archive: bool = False, archive_dir: str = None):
+    """조건에 맞는 일정을 (날짜, id) 순으로 out 에 스트리밍
+
+    with_archive 이면 보관본(archive_dir 이 있으면 파일, 없으면 events_archive)도 합칩니다.
+    반환값: 내보낸 행 수
+    """
+    filters = export_filters(categories, start, end)
+    if with_archive or archive_dir:
+        rows = iter_events_with_archive(supabase, EXPORT_COLUMNS, page_size, filters, archive_dir)
+    else:
+        rows = iter_events(supabase, EXPORT_COLUMNS, page_size, filters)
+    writer = write_ics if export_format == 'ics' else write_csv
+    return writer(rows, out)
+
+def export_to_path(supabase: Client, path: str, export_format: str = 'csv', categories=None, start=None, end=None,
+                   page_size: int = DEFAULT_PAGE_SIZE, with_archive: bool = False, archive_dir: str = None):
+    """파일로 내보내기 ('-' 이면 표준 출력)
+
+    파일은 임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 이전 파일이 남습니다.
+    """
+    if path == '-':
+        out = open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False)
+        try:
+            return export_events(supabase, out, export_format, categories, start, end, page_size, with_archive,
+                                 archive_dir)
+        finally:
+            out.flush()
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+            written = export_events(supabase, out, export_format, categories, start, end, page_size, with_archive,
+                                    archive_dir)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return written
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 CSV/iCalendar 내보내기")
+    parser.add_argument('output', help="출력 파일 경로 ('-' 이면 표준 출력)")
+    parser.add_argument('--format', choices=FORMATS, default=None, help="출력 형식 (기본: 확장자로 판단, 없으면 csv)")
+    parser.add_argument('--category', action='append', choices=sorted(CATEGORY_LABELS), help="카테고리 (여러 번 지정 가능)")
+    parser.add_argument('--start', type=date.fromisoformat, default=None, help="시작일 YYYY-MM-DD (포함)")
+    parser.add_argument('--end', type=date.fromisoformat, default=None, help="종료일 YYYY-MM-DD (포함)")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="요청당 행 수")
+    parser.add_argument('--with-archive', action='store_true', help="events_archive 로 옮긴 과거 일정 포함")
+    parser.add_argument('--archive-dir', default=None, help="보관 파일 디렉터리 (지정하면 --with-archive 로 파일을 읽음)")
+    args = parser.parse_args()
+
+    export_format = args.format or ('ics' if args.output.lower().endswith('.ics') else 'csv')
+    # 표준 출력으로 내보낼 때는 진행 메시지가 데이터에 섞이지 않도록 stderr 로 출력합니다.
+    log = sys.stderr if args.output == '-' else sys.stdout
+
+    print("🏛️ 나주교회 캘린더 내보내기", file=log)
+    print("=" * 60, file=log)
+    started = time.perf_counter()
+    written = export_to_path(get_client(), args.output, export_format, args.category, args.start, args.end,
+                             args.page_size, args.with_archive, args.archive_dir)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {written}개 일정을 {export_format.upper()} 로 내보냈습니다. ({elapsed:.2f}초)", file=log)
+    if args.output != '-':
+        print(f"💾 {args.output}", file=log)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 events 스트리밍 조회 모듈
+(date, id) 키셋 페이지네이션으로 전체 테이블을 일정한 메모리로 순회합니다.
+증분 동기화는 같은 방식으로 (updated_at, id) 순서를 사용합니다.
+"""
+
+from supabase import Client
+
+DEFAULT_PAGE_SIZE = 1000
+
+# 키셋 정렬 기준 컬럼
+KEYSET_COLUMNS = ('date', 'id')
+
+def _select_columns(columns, keyset=KEYSET_COLUMNS):
+    """조회 컬럼 문자열 생성 (키셋 컬럼은 항상 포함)"""
+    if not columns:
+        return '*'
+    selected = list(columns)
+    for column in keyset:
+        if column not in selected:
+            selected.append(column)
+    return ','.join(selected)
+
+def _logic_value(value):
+    """or_() 조건 값 (타임스탬프처럼 '.', ':' 가 있으면 큰따옴표로 감쌈)"""
+    text = str(value)
+    if any(char in text for char in ',.:()"'):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
+
+def iter_event_pages(supabase: Client, columns=None, page_size: int = DEFAULT_PAGE_SIZE, filters=(),
+                     keyset=KEYSET_COLUMNS, table: str = 'events'):
+    """events 를 keyset 순서((date, id) 기본)의 페이지 단위로 반환하는 제너레이터
+
+    filters 는 (operator, column, value) 튜플 목록입니다. 예: ('eq', 'category', 'youth')
+    keyset 은 (정렬 컬럼, 유일 컬럼) 쌍이며 같은 순서의 인덱스가 있어야 합니다.
+    PostgREST 의 max-rows 제한이 page_size 보다 작아도 행을 놓치지 않도록
+    빈 페이지가 올 때까지 계속 조회합니다.
+    """
+    select = _select_columns(columns, keyset)
+    sort_column, unique_column = keyset
+    last_key = None
+
+    while True:
+        query = supabase.table(table).select(select)
+        for operator, column, value in filters:
+            query = getattr(query, operator)(column, value)
+        if last_key is not None:
+            # sort >= X 를 별도 조건으로 두어 (sort, unique) 인덱스에서 범위 탐색이 되도록 합니다.
+            last_sort, last_unique = last_key
+            query = query.gte(sort_column, last_sort).or_(
+                f"{sort_column}.gt.{_logic_value(last_sort)},{unique_column}.gt.{_logic_value(last_unique)}")
+
+        rows = query.order(sort_column).order(unique_column).limit(page_size).execute().data
+        if not rows:
+            return
+
+        yield rows
+        last_key = (rows[-1][sort_column], rows[-1][unique_column])
+
+def iter_events(supabase: Client, columns=None, page_size: int = DEFAULT_PAGE_SIZE, filters=()):
+    """events 를 한 행씩 반환하는 제너레이터 (한 번에 최대 page_size 행만 메모리에 유지)"""
+    for page in iter_event_pages(supabase, columns, page_size, filters):
+        yield from page
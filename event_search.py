@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 이벤트 검색 색인
+title / location / description 의 글자 바이그램(2-gram) 역색인을 만들어 파일(.events_search.npz)로 보관합니다.
+
+한국어는 띄어쓰기 단위 단어 분리로는 "수요기도회" 안의 "기도회" 를 찾지 못하고, 서버의 ilike '%...%' 는
+idx_events_date/idx_events_category 를 쓸 수 없어 전체 행을 훑습니다. pg_trgm 은 3글자 단위라 두 글자 단어
+("예배", "찬양")는 색인으로 찾을 수 없으므로 바이그램 색인을 클라이언트 쪽에 둡니다.
+
+- 정규화: NFKC + casefold, 공백은 단어 경계로만 사용
+- 키: (필드 2비트, 글자, 다음 글자) 를 uint64 하나로 묶고, 단어 끝 글자는 다음 글자 0 으로 기록합니다.
+  그래서 한 글자 검색도 키 범위 하나로 찾습니다.
+- 게시 목록(postings): 키 정렬 후 문서 번호(int32)를 이어 붙이고 키별 시작 위치(offsets)만 보관합니다.
+- 순위: 단어마다 찾은 필드 가중치(제목 3, 장소 2, 설명 1)의 합, 같으면 오늘과 가까운 날짜 순
+  세 글자 이상 단어는 바이그램이 모두 있어도 붙어 있지 않을 수 있어 상위 결과만 원문으로 확인합니다.
+
+증분 갱신은 event_sync 와 같이 updated_at 워터마크 이후 바뀐 행과 events_tombstones 로 반영합니다.
+바뀐 행은 작은 델타(delta) 목록에 쌓아 직접 비교로 검색하고, 델타가 기본 색인의 DELTA_RATIO 를 넘으면
+저장된 원문으로 색인을 다시 만듭니다(서버를 다시 읽지 않음).
+
+사용 예:
+    python event_search.py 기도회                 # 색인 갱신 후 검색 (색인이 없으면 새로 생성)
+    python event_search.py 새벽 예배 --limit 5
+    python event_search.py --rebuild              # 전체 다시 색인
+    python event_search.py 기도회 --no-update --benchmark 200
+"""
+
+import argparse
+import json
+import os
+import time
+import unicodedata
+from array import array
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from supabase import Client
+
+from event_reader import DEFAULT_PAGE_SIZE, iter_event_pages
+from event_watermarks import TOMBSTONE_COLUMNS, iter_change_pages, normalize_timestamp, warn_tombstones_unavailable
+from supabase_client import get_client
+
+DEFAULT_INDEX = '.events_search.npz'
+
+SEARCH_FIELDS = ('title', 'location', 'description')
+FIELD_WEIGHTS = np.array([3, 2, 1], dtype=np.int16)
+SEARCH_COLUMNS = ('id', 'date', 'updated_at') + SEARCH_FIELDS
+
+# 원문 보관 시 필드 구분자 (정규화된 본문에는 나오지 않는 제어 문자)
+FIELD_SEPARATOR = '\x1f'
+
+# 키 = field << 42 | char << 21 | next_char (유니코드 코드 포인트는 21비트)
+CHAR_BITS = 21
+FIELD_SHIFT = 2 * CHAR_BITS
+# 배치 안의 (키, 문서) 쌍을 uint64 하나로 묶어 정렬/중복 제거하므로 배치 크기는 2^20 미만이어야 합니다.
+BATCH_DOC_BITS = 20
+BUILD_BATCH = 100_000
+
+# 델타가 기본 색인의 이 비율(최소 DELTA_MIN 행)을 넘으면 다시 색인합니다.
+DELTA_RATIO = 0.05
+DELTA_MIN = 1000
+
+DEFAULT_LIMIT = 20
+# 순위는 limit 의 이 배수만큼만 먼저 부분 정렬합니다 (원문 확인에서 빠지는 후보가 많을 때만 나머지를 정렬).
+RANK_HEAD = 4
+
+def normalize_text(value):
+    """검색용 정규화 (NFKC + casefold, 연속 공백은 공백 하나로)"""
+    if not value:
+        return ''
+    return ' '.join(unicodedata.normalize('NFKC', value).casefold().split())
+
+def query_words(query: str):
+    """검색어를 정규화된 단어 목록으로 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(normalize_text(query).split()))
+
+def _field_key(field: int, char: str, next_char: str = None):
+    key = (field << FIELD_SHIFT) | (ord(char) << CHAR_BITS)
+    return key | ord(next_char) if next_char else key
+
+def bigram_pairs(field_texts, start: int):
+    """배치의 (키, 문서 번호) 쌍을 키 -> 문서 순으로 정렬해 반환 (문서 안의 중복 키는 하나로)
+
+    field_texts 는 필드별 정규화 문자열 목록이고, 문서 번호는 start 부터 매깁니다.
+    """
+    size = len(field_texts[0])
+    packed = []
+    for field, texts in enumerate(field_texts):
+        # 문서마다 끝에 공백을 붙여 이어 붙이면 문서 경계도 단어 경계가 됩니다.
+        joined = ' '.join(texts) + ' '
+        chars = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=size)
+        docs = np.repeat(np.arange(size, dtype=np.uint64), lengths)
+
+        following = np.empty_like(chars)
+        following[:-1] = chars[1:]
+        following[-1] = 32
+        following[following == 32] = 0
+        valid = chars != 32
+        keys = (np.uint64(field) << np.uint64(FIELD_SHIFT)) | (chars[valid] << np.uint64(CHAR_BITS)) | following[valid]
+        packed.append((keys << np.uint64(BATCH_DOC_BITS)) | docs[valid])
+
+    combined = np.sort(np.concatenate(packed))
+    combined = combined[np.r_[True, combined[1:] != combined[:-1]]]
+    keys = combined >> np.uint64(BATCH_DOC_BITS)
+    docs = (combined & np.uint64((1 << BATCH_DOC_BITS) - 1)).astype(np.int32) + start
+    return keys, docs
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+def _date_ordinal(value):
+    return date.fromisoformat(str(value)[:10]).toordinal() if value else 0
+
+def _micros(timestamp):
+    """timestamptz 문자열 -> epoch 마이크로초 (없으면 0)"""
+    if not timestamp:
+        return 0
+    parsed = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - EPOCH) // MICROSECOND
+
+def _timestamp(micros: int):
+    return normalize_timestamp((EPOCH + timedelta(microseconds=int(micros))).isoformat()) if micros else None
+
+class SearchIndex:
+    """바이그램 역색인 + 원문 + 델타"""
+
+    def __init__(self, ids, dates, updated, text_offsets, text_blob, keys, offsets, postings, live, delta=None,
+                 events_watermark=None, tombstones_watermark=None):
+        self.ids = ids
+        self.dates = dates
+        # 문서별 updated_at (epoch 마이크로초): 겹침 구간에서 다시 읽힌 행을 건너뛰는 데 사용
+        self.updated = updated
+        self.text_offsets = text_offsets
+        self.text_blob = text_blob
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+        self.live = live
+        # id(hex) -> {"id", "date", "updated_at", "fields"}: 마지막 색인 이후 바뀐 행
+        self.delta = delta or {}
+        self.events_watermark = events_watermark
+        self.tombstones_watermark = tombstones_watermark
+        self._sorted_ids = None
+        self._delta_texts = {}
+
+    @property
+    def size(self):
+        """기본 색인의 문서 수 (삭제/교체된 행 포함)"""
+        return len(self.dates)
+
+    @property
+    def live_count(self):
+        return int(self.live.sum()) + len(self.delta)
+
+    @property
+    def nbytes(self):
+        return (self.ids.nbytes + self.dates.nbytes + self.updated.nbytes + self.text_offsets.nbytes
+                + len(self.text_blob) + self.keys.nbytes + self.offsets.nbytes + self.postings.nbytes + self.live.nbytes)
+
+    @classmethod
+    def build(cls, rows):
+        """행(이터러블)을 한 번 순회하며 색인 생성
+
+        같은 id 가 여러 번 나오면(색인 중 갱신된 행) 마지막 행만 살아 있는 문서로 둡니다.
+        """
+        ids = bytearray()
+        dates = array('i')
+        updated = array('q')
+        text_offsets = array('q', [0])
+        blob = bytearray()
+        key_parts, doc_parts = [], []
+        batch = [[] for _ in SEARCH_FIELDS]
+        # 장소/설명과 날짜는 같은 값이 반복되므로 변환 결과를 재사용합니다.
+        normalized = {}
+        ordinals = {}
+        count = 0
+
+        def flush():
+            if batch[0]:
+                keys, docs = bigram_pairs(batch, count - len(batch[0]))
+                key_parts.append(keys)
+                doc_parts.append(docs)
+                for texts in batch:
+                    texts.clear()
+
+        for row in rows:
+            fields = [row.get(name) or '' for name in SEARCH_FIELDS]
+            ids += bytes.fromhex(row['id'].replace('-', ''))
+            event_date = row.get('date')
+            ordinal = ordinals.get(event_date)
+            if ordinal is None:
+                ordinal = ordinals[event_date] = _date_ordinal(event_date)
+            dates.append(ordinal)
+            blob += FIELD_SEPARATOR.join(fields).encode('utf-8')
+            text_offsets.append(len(blob))
+            batch[0].append(normalize_text(fields[0]))
+            for texts, value in zip(batch[1:], fields[1:]):
+                text = normalized.get(value)
+                if text is None:
+                    text = normalized[value] = normalize_text(value)
+                texts.append(text)
+            updated.append(_micros(row.get('updated_at')))
+            count += 1
+            if len(batch[0]) >= BUILD_BATCH:
+                flush()
+        flush()
+
+        if key_parts:
+            keys = np.concatenate(key_parts)
+            docs = np.concatenate(doc_parts)
+            # 배치 순서대로 문서 번호가 커지므로 안정 정렬이면 키 안에서 문서 번호가 오름차순으로 유지됩니다.
+            order = np.argsort(keys, kind='stable')
+            keys, postings = keys[order], docs[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            unique_keys = keys[starts]
+            offsets = np.r_[starts, len(postings)].astype(np.int64)
+        else:
+            unique_keys = np.zeros(0, dtype=np.uint64)
+            postings = np.zeros(0, dtype=np.int32)
+            offsets = np.zeros(1, dtype=np.int64)
+
+        id_array = np.frombuffer(bytes(ids), dtype=np.uint8).reshape(-1, 16)
+        live = np.ones(count, dtype=bool)
+        if count:
+            # 뒤에서부터 처음 나온 id = 마지막 행
+            _, last = np.unique(id_array[::-1].copy().view('S16').ravel(), return_index=True)
+            live[:] = False
+            live[count - 1 - last] = True
+
+        return cls(id_array, np.frombuffer(dates, dtype=np.int32).copy(), np.frombuffer(updated, dtype=np.int64).copy(),
+                   np.frombuffer(text_offsets, dtype=np.int64).copy(), bytes(blob),
+                   unique_keys, offsets, postings, live, events_watermark=_timestamp(max(updated, default=0)))
+
+    @classmethod
+    def from_supabase(cls, supabase: Client, page_size: int = DEFAULT_PAGE_SIZE):
+        """events 전체를 (updated_at, id) 순서로 읽어 색인 생성
+
+        updated_at 순서로 읽으므로 색인 중에 바뀐 행은 뒤쪽에서 다시 나오고, 마지막 updated_at 이 워터마크가 됩니다.
+        """
+        pages = iter_event_pages(supabase, SEARCH_COLUMNS, page_size, keyset=('updated_at', 'id'))
+        return cls.build(row for page in pages for row in page)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(data['ids'], data['dates'], data['updated'], data['text_offsets'], data['text_blob'].tobytes(),
+                       data['keys'], data['offsets'], data['postings'], data['live'],
+                       delta={entry['id'].replace('-', ''): entry for entry in meta['delta']},
+                       events_watermark=meta.get('events_watermark'),
+                       tombstones_watermark=meta.get('tombstones_watermark'))
+
+    def save(self, path: str = DEFAULT_INDEX):
+        """색인 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        meta = {
+            "events_watermark": self.events_watermark,
+            "tombstones_watermark": self.tombstones_watermark,
+            "delta": list(self.delta.values()),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, ids=self.ids, dates=self.dates, updated=self.updated, text_offsets=self.text_offsets,
+                     text_blob=np.frombuffer(self.text_blob, dtype=np.uint8), keys=self.keys,
+                     offsets=self.offsets, postings=self.postings, live=self.live,
+                     meta=np.array(json.dumps(meta, ensure_ascii=False)))
+        os.replace(tmp_path, path)
+
+    def fields(self, doc: int):
+        """기본 색인 문서의 원문 (title, location, description)"""
+        start, end = self.text_offsets[doc], self.text_offsets[doc + 1]
+        return self.text_blob[start:end].decode('utf-8').split(FIELD_SEPARATOR)
+
+    def _base_docs(self, hex_ids):
+        """id(hex) 목록과 같은 순서의 살아 있는 기본 색인 문서 번호 (없으면 -1)"""
+        if not self.size or not hex_ids:
+            return np.full(len(hex_ids), -1, dtype=np.int64)
+        if self._sorted_ids is None:
+            flat = self.ids.view('S16').ravel()
+            order = np.argsort(flat)
+            self._sorted_ids = (flat[order], order)
+        sorted_ids, order = self._sorted_ids
+        wanted = np.frombuffer(b''.join(bytes.fromhex(value) for value in hex_ids),
+                               dtype=np.uint8).reshape(-1, 16).view('S16').ravel()
+        positions = np.minimum(np.searchsorted(sorted_ids, wanted), len(sorted_ids) - 1)
+        docs = order[positions].astype(np.int64)
+        docs[(sorted_ids[positions] != wanted) | ~self.live[docs]] = -1
+        return docs
+
+    def apply_changes(self, rows):
+        """바뀐 행 반영: 기본 색인의 같은 id 는 지우고 델타에 최신 행 보관
+
+        워터마크 겹침 구간에서 다시 읽힌 행 중 이미 반영된 것은 건너뜁니다.
+        반환값: 반영한 행 수
+        """
+        rows = [row for row in rows if row.get('id')]
+        hex_ids = [row['id'].replace('-', '') for row in rows]
+        applied = 0
+        for hex_id, doc, row in zip(hex_ids, self._base_docs(hex_ids).tolist(), rows):
+            updated_at = normalize_timestamp(row.get('updated_at'))
+            if updated_at:
+                self.events_watermark = max(self.events_watermark or updated_at, updated_at)
+                entry = self.delta.get(hex_id)
+                if (doc >= 0 and self.updated[doc] >= _micros(updated_at)) or (
+                        entry is not None and (entry['updated_at'] or '') >= updated_at):
+                    continue
+            if doc >= 0:
+                self.live[doc] = False
+            self.delta[hex_id] = {
+                "id": row['id'],
+                "date": row.get('date'),
+                "updated_at": updated_at,
+                "fields": [row.get(name) or '' for name in SEARCH_FIELDS],
+            }
+            self._delta_texts.pop(hex_id, None)
+            applied += 1
+        return applied
+
+    def apply_deletes(self, rows):
+        """삭제 기록 반영 (삭제 이후 다시 갱신된 행은 유지)
+
+        반환값: 지운 문서 수
+        """
+        rows = [row for row in rows if row.get('id')]
+        hex_ids = [row['id'].replace('-', '') for row in rows]
+        deleted = 0
+        for hex_id, doc, row in zip(hex_ids, self._base_docs(hex_ids).tolist(), rows):
+            deleted_at = normalize_timestamp(row['deleted_at'])
+            self.tombstones_watermark = max(self.tombstones_watermark or deleted_at, deleted_at)
+            entry = self.delta.get(hex_id)
+            if entry is not None and (entry['updated_at'] or '') <= deleted_at:
+                del self.delta[hex_id]
+                self._delta_texts.pop(hex_id, None)
+                deleted += 1
+            if doc >= 0 and self.updated[doc] <= _micros(deleted_at):
+                self.live[doc] = False
+                deleted += 1
+        return deleted
+
+    def needs_compaction(self):
+        dead = self.size - int(self.live.sum())
+        return len(self.delta) + dead > max(DELTA_MIN, self.size * DELTA_RATIO)
+
+    def compact(self):
+        """살아 있는 기본 문서와 델타를 합쳐 다시 색인 (저장된 원문 사용)"""
+        def rows():
+            for doc in np.flatnonzero(self.live):
+                title, location, description = self.fields(doc)
+                yield {"id": self.ids[doc].tobytes().hex(), "date": date.fromordinal(int(self.dates[doc])).isoformat(),
+                       "updated_at": _timestamp(self.updated[doc]),
+                       "title": title, "location": location, "description": description}
+            for entry in self.delta.values():
+                yield {"id": entry['id'], "date": entry['date'], "updated_at": entry['updated_at'],
+                       **dict(zip(SEARCH_FIELDS, entry['fields']))}
+
+        rebuilt = SearchIndex.build(rows())
+        rebuilt.events_watermark = self.events_watermark
+        rebuilt.tombstones_watermark = self.tombstones_watermark
+        return rebuilt
+
+    def _key_docs(self, field: int, word: str):
+        """한 필드에서 단어가 들어 있을 수 있는 문서 번호 (오름차순)"""
+        if len(word) == 1:
+            # 단어 끝은 다음 글자 0 으로 기록되므로 이 글자로 시작하는 키 범위에 모든 위치가 있습니다.
+            low = np.uint64(_field_key(field, word))
+            first, last = np.searchsorted(self.keys, [low, low + np.uint64(1 << CHAR_BITS)])
+            docs = self.postings[self.offsets[first]:self.offsets[last]]
+            if last - first <= 1:
+                return docs
+            mask = np.zeros(self.size, dtype=bool)
+            mask[docs] = True
+            return np.flatnonzero(mask).astype(np.int32)
+
+        wanted = np.unique(np.array([_field_key(field, a, b) for a, b in zip(word, word[1:])], dtype=np.uint64))
+        positions = np.minimum(np.searchsorted(self.keys, wanted), max(len(self.keys) - 1, 0))
+        if not len(self.keys) or (self.keys[positions] != wanted).any():
+            return np.zeros(0, dtype=np.int32)
+        lists = sorted((self.postings[self.offsets[p]:self.offsets[p + 1]] for p in positions.tolist()), key=len)
+        docs = lists[0]
+        for other in lists[1:]:
+            docs = docs[_lookup(other, docs)[0]]
+            if not len(docs):
+                break
+        return docs
+
+    def _word_docs(self, word: str):
+        """단어가 들어 있을 수 있는 문서 번호(오름차순)와 필드 가중치 최댓값"""
+        parts = [(self._key_docs(field, word), FIELD_WEIGHTS[field]) for field in range(len(SEARCH_FIELDS))]
+        parts = [(docs, weight) for docs, weight in parts if len(docs)]
+        if not parts:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int16)
+        if len(parts) == 1:
+            docs, weight = parts[0]
+            return docs, np.full(len(docs), weight, dtype=np.int16)
+        if sum(len(docs) for docs, _ in parts) < self.size // 64:
+            docs = np.concatenate([docs for docs, _ in parts])
+            weights = np.concatenate([np.full(len(docs), weight, dtype=np.int16) for docs, weight in parts])
+            order = np.lexsort((-weights, docs))
+            docs, weights = docs[order], weights[order]
+            first = np.r_[True, docs[1:] != docs[:-1]]
+            return docs[first], weights[first]
+        # 후보가 많으면 문서 수 크기의 배열에 가중치가 낮은 필드부터 덮어써 최댓값을 구합니다.
+        scores = np.zeros(self.size, dtype=np.int8)
+        for docs, weight in sorted(parts, key=lambda part: part[1]):
+            scores[docs] = weight
+        # bool 배열의 nonzero 가 정수 배열보다 몇 배 빠릅니다.
+        docs = np.flatnonzero(scores != 0).astype(np.int32)
+        return docs, scores[docs].astype(np.int16)
+
+    def _candidates(self, words):
+        """모든 단어가 들어 있을 수 있는 살아 있는 기본 문서와 점수 상한"""
+        matches = sorted((self._word_docs(word) for word in words), key=lambda match: len(match[0]))
+        docs, scores = matches[0]
+        scores = scores.astype(np.int32)
+        for word_docs, word_scores in matches[1:]:
+            if len(word_docs) > self.size // 64:
+                # 큰 목록은 문서 수 크기의 배열에 펼쳐 이진 탐색 대신 인덱싱으로 찾습니다.
+                dense = np.zeros(self.size, dtype=np.int16)
+                dense[word_docs] = word_scores
+                gained = dense[docs]
+                found = gained > 0
+                docs, scores = docs[found], scores[found] + gained[found]
+            else:
+                found, positions = _lookup(word_docs, docs)
+                docs, scores = docs[found], scores[found] + word_scores[positions[found]]
+            if not len(docs):
+                break
+        alive = self.live[docs]
+        return docs[alive], scores[alive]
+
+    def _delta_fields(self, hex_id, entry):
+        texts = self._delta_texts.get(hex_id)
+        if texts is None:
+            texts = self._delta_texts[hex_id] = [normalize_text(value) for value in entry['fields']]
+        return texts
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, today: date = None):
+        """검색 결과 상위 limit 개 [{"id", "date", "title", "location", "score"}]
+
+        반환값: (결과 목록, 후보 수)
+        """
+        words = query_words(query)
+        if not words:
+            return [], 0
+        today = (today or date.today()).toordinal()
+
+        docs, bounds = self._candidates(words)
+        distance = np.abs(self.dates[docs].astype(np.int64) - today)
+        # (점수 내림차순, 날짜 거리 오름차순) 을 정수 하나로
+        rank = (-bounds.astype(np.int64) << 32) | distance
+        exact = all(len(word) <= 2 for word in words)
+
+        results = []
+        for hex_id, entry in self.delta.items():
+            score = exact_score(words, self._delta_fields(hex_id, entry))
+            if score:
+                results.append((score, abs(_date_ordinal(entry['date']) - today), entry['id'], entry['date'],
+                                entry['fields']))
+
+        for count, position in enumerate(_ranked(rank, limit * RANK_HEAD)):
+            doc = int(docs[position])
+            if exact:
+                # 두 글자 이하 단어는 바이그램 일치가 곧 부분 문자열 일치이므로 원문을 확인하지 않습니다.
+                if count >= limit:
+                    break
+                fields = self.fields(doc)
+                score = int(bounds[position])
+            else:
+                # 상한(bounds) 순서로 보므로 이미 limit 개가 다음 후보보다 앞서면 멈춥니다.
+                bound = (-int(bounds[position]), int(distance[position]))
+                if sum(1 for item in results if (-item[0], item[1]) <= bound) >= limit:
+                    break
+                fields = self.fields(doc)
+                score = exact_score(words, [normalize_text(value) for value in fields])
+                if not score:
+                    continue
+            results.append((score, int(distance[position]), self.ids[doc].tobytes().hex(),
+                            date.fromordinal(int(self.dates[doc])).isoformat(), fields))
+
+        results.sort(key=lambda item: (-item[0], item[1]))
+        return [{"id": _format_uuid(hex_id), "date": event_date, "title": fields[0], "location": fields[1],
+                 "score": score} for score, _, hex_id, event_date, fields in results[:limit]], len(docs)
+
+def _lookup(sorted_docs, docs):
+    """docs 각 원소가 정렬된 sorted_docs 에 있는지와 그 위치"""
+    if not len(sorted_docs):
+        return np.zeros(len(docs), dtype=bool), np.zeros(len(docs), dtype=np.int64)
+    positions = np.minimum(np.searchsorted(sorted_docs, docs), len(sorted_docs) - 1)
+    return sorted_docs[positions] == docs, positions
+
+def _ranked(rank, head: int):
+    """rank 오름차순 위치를 차례로 반환 (앞의 head 개만 먼저 부분 정렬하고 나머지는 필요할 때 정렬)"""
+    if len(rank) <= head:
+        yield from np.argsort(rank, kind='stable').tolist()
+        return
+    first = np.argpartition(rank, head)[:head]
+    yield from first[np.argsort(rank[first], kind='stable')].tolist()
+    rest = np.ones(len(rank), dtype=bool)
+    rest[first] = False
+    rest = np.flatnonzero(rest)
+    yield from rest[np.argsort(rank[rest], kind='stable')].tolist()
+
+def exact_score(words, normalized_fields):
+    """원문 기준 점수 (단어마다 찾은 필드 가중치 최댓값의 합, 하나라도 없으면 0)"""
+    total = 0
+    for word in words:
+        weight = max((int(FIELD_WEIGHTS[field]) for field, text in enumerate(normalized_fields) if word in text),
+                     default=0)
+        if not weight:
+            return 0
+        total += weight
+    return total
+
+def _format_uuid(hex_id: str):
+    hex_id = hex_id.replace('-', '')
+    return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
+
+def update_index(supabase: Client, index: SearchIndex, page_size: int = DEFAULT_PAGE_SIZE):
+    """워터마크 이후 바뀐 행과 삭제 기록 반영
+
+    반환값: {"changed": 받은 변경 행 수, "deleted": 지운 문서 수}
+    """
+    changed = 0
+    for page in iter_change_pages(supabase, 'events', SEARCH_COLUMNS, index.events_watermark, page_size):
+        changed += index.apply_changes(page)
+
+    deleted = 0
+    try:
+        for page in iter_change_pages(supabase, 'events_tombstones', TOMBSTONE_COLUMNS, index.tombstones_watermark,
+                                      page_size):
+            deleted += index.apply_deletes(page)
+    except Exception as e:
+        warn_tombstones_unavailable(e, "삭제는 --rebuild 로 반영해야 합니다")
+    return {"changed": changed, "deleted": deleted}
+
+def open_index(supabase: Client, path: str = DEFAULT_INDEX, rebuild: bool = False, update: bool = True,
+               page_size: int = DEFAULT_PAGE_SIZE):
+    """색인 파일을 열고 필요하면 생성/갱신/재색인 후 저장"""
+    if rebuild or not os.path.exists(path):
+        started = time.perf_counter()
+        index = SearchIndex.from_supabase(supabase, page_size)
+        print(f"🔨 색인 생성: {index.live_count:,}개 문서, {len(index.keys):,}개 키, "
+              f"{index.nbytes / 1024 / 1024:.1f} MB ({time.perf_counter() - started:.2f}초)")
+        index.save(path)
+        return index
+
+    index = SearchIndex.load(path)
+    if not update:
+        return index
+    started = time.perf_counter()
+    stats = update_index(supabase, index, page_size)
+    if index.needs_compaction():
+        index = index.compact()
+        print("🔨 델타가 커서 색인을 다시 만들었습니다.")
+    if stats['changed'] or stats['deleted']:
+        index.save(path)
+    print(f"🔄 색인 갱신: 변경 {stats['changed']:,}개, 삭제 {stats['deleted']:,}개 "
+          f"({time.perf_counter() - started:.2f}초)")
+    return index
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 이벤트 검색")
+    parser.add_argument('query', nargs='*', help="검색어 (공백으로 나눈 단어가 모두 들어 있는 이벤트)")
+    parser.add_argument('--index', default=DEFAULT_INDEX, help="색인 파일 경로")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help="결과 수")
+    parser.add_argument('--rebuild', action='store_true', help="전체 다시 색인")
+    parser.add_argument('--no-update', action='store_true', help="색인 갱신 없이 검색")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="요청당 행 수")
+    parser.add_argument('--benchmark', type=int, default=0, help="검색을 N번 반복해 평균 시간 측정")
+    args = parser.parse_args()
+
+    supabase = get_client()
+    index = open_index(supabase, args.index, args.rebuild, not args.no_update, args.page_size)
+    if not args.query:
+        return
+
+    query = ' '.join(args.query)
+    started = time.perf_counter()
+    results, candidates = index.search(query, args.limit)
+    elapsed = time.perf_counter() - started
+    print(f"\n🔍 '{query}': 후보 {candidates:,}개 중 상위 {len(results)}개 ({elapsed * 1000:.2f}ms)")
+    for result in results:
+        location = f" @ {result['location']}" if result['location'] else ''
+        print(f"   [{result['score']}] {result['date']} {result['title']}{location}")
+
+    if args.benchmark:
+        started = time.perf_counter()
+        for _ in range(args.benchmark):
+            index.search(query, args.limit)
+        print(f"\n⏱️ 평균 {(time.perf_counter() - started) / args.benchmark * 1000:.2f}ms ({args.benchmark}회)")
+
+if __name__ == "__main__":
+    main()
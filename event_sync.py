@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 events 로컬 SQLite 미러 증분 동기화 스크립트
+저장된 updated_at 워터마크 이후 바뀐 행만 (updated_at, id) 키셋으로 받아오고,
+삭제는 events_tombstones(database/migrations/0004_events_sync.sql) 로 반영합니다.
+
+- 페이지마다 행과 워터마크를 같은 트랜잭션으로 기록하므로 중단되어도 이어서 동기화합니다.
+- now() 는 트랜잭션 시작 시각이라 늦게 커밋된 행을 놓치지 않도록 워터마크보다 SYNC_OVERLAP 만큼 앞에서 다시 읽습니다.
+  (시각 형식과 SYNC_OVERLAP 은 event_watermarks)
+- --reconcile 은 원격 id 전체와 대조해 tombstone 이 없거나 정리된 삭제까지 반영합니다.
+
+미러는 local_backend 와 같은 스키마이므로 읽기 전용 검증/리포트 작업은
+NAJU_LOCAL_DB=.events_mirror.sqlite python setup_supabase.py 처럼 원격 대신 미러에서 실행할 수 있습니다.
+
+사용 예:
+    python event_sync.py                    # 증분 동기화
+    python event_sync.py --report           # 동기화 후 미러에서 검증 리포트 출력
+    python event_sync.py --reconcile        # id 대조로 삭제 누락 정리
+"""
+
+import argparse
+import sqlite3
+import time
+
+from supabase import Client
+
+from event_constants import EVENT_COLUMNS
+from event_reader import iter_event_pages
+from event_watermarks import (TOMBSTONE_COLUMNS, normalize_timestamp, pull_changes, utc_timestamp,
+                              warn_tombstones_unavailable)
+from local_backend import LOCAL_SCHEMA, create_local_client
+from supabase_client import get_client
+from verify_report import fetch_report, print_report
+
+DEFAULT_MIRROR = '.events_mirror.sqlite'
+DEFAULT_PAGE_SIZE = 1000
+
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+
+MIRROR_STATE_SQL = """
+CREATE TABLE IF NOT EXISTS sync_state (
+  name TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+def open_mirror(path: str = DEFAULT_MIRROR):
+    """미러 SQLite 연결 (스키마가 없으면 생성)"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(LOCAL_SCHEMA + MIRROR_STATE_SQL)
+    return conn
+
+def get_state(conn, name: str):
+    """동기화 상태 값 조회"""
+    row = conn.execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+    return row[0] if row else None
+
+def set_state(conn, name: str, value: str):
+    """동기화 상태 값 저장"""
+    conn.execute('INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)', (name, value))
+
+def _mirror_row(row):
+    """원격 행을 미러 컬럼 순서의 값 튜플로 변환"""
+    values = []
+    for column in EVENT_COLUMNS:
+        value = row.get(column)
+        if column in TIMESTAMP_COLUMNS:
+            value = normalize_timestamp(value)
+        elif column == 'is_all_day' and value is not None:
+            value = int(bool(value))
+        values.append(value)
+    return values
+
+def apply_event_page(conn, rows):
+    """변경된 행 반영
+
+    INSERT OR REPLACE 는 같은 id 뿐 아니라 같은 자연 키의 행도 교체합니다. 동기화 도중 원격에서
+    자연 키가 서로 바뀐 행이 있어도, 밀려난 행은 자신의 변경이 도착할 때 다시 들어옵니다.
+    """
+    placeholders = ','.join('?' * len(EVENT_COLUMNS))
+    conn.executemany(f'INSERT OR REPLACE INTO events ({",".join(EVENT_COLUMNS)}) VALUES ({placeholders})',
+                     [_mirror_row(row) for row in rows])
+
+def apply_tombstone_page(conn, rows):
+    """삭제 기록 반영 (삭제 이후 같은 id 로 다시 갱신된 행은 유지)
+
+    반환값: 미러에서 지운 행 수
+    """
+    return conn.executemany('DELETE FROM events WHERE id = ? AND updated_at <= ?',
+                            [(row['id'], normalize_timestamp(row['deleted_at'])) for row in rows]).rowcount
+
+def sync_events(supabase: Client, conn, page_size: int = DEFAULT_PAGE_SIZE):
+    """변경된 행과 삭제 기록을 미러에 반영
+
+    반환값: {"changed": 받은 변경 행 수, "deleted": 미러에서 지운 행 수, "tombstones": 삭제 기록 사용 여부}
+    """
+    changed, _ = pull_changes(supabase, conn, 'events', EVENT_COLUMNS, 'sync_state', 'events_watermark',
+                              apply_event_page, page_size)
+    try:
+        _, deleted = pull_changes(supabase, conn, 'events_tombstones', TOMBSTONE_COLUMNS, 'sync_state',
+                                  'tombstones_watermark', apply_tombstone_page, page_size)
+        tombstones = True
+    except Exception as e:
+        warn_tombstones_unavailable(e, "삭제는 --reconcile 로 반영해야 합니다")
+        deleted, tombstones = 0, False
+    return {"changed": changed, "deleted": deleted, "tombstones": tombstones}
+
+def reconcile_ids(supabase: Client, conn, page_size: int = DEFAULT_PAGE_SIZE):
+    """원격 id 전체와 대조해 원격에 없는 미러 행 삭제
+
+    반환값: 미러에서 지운 행 수
+    """
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS remote_ids (id TEXT PRIMARY KEY)')
+    conn.execute('BEGIN')
+    try:
+        conn.execute('DELETE FROM temp.remote_ids')
+        for page in iter_event_pages(supabase, ['id'], page_size):
+            conn.executemany('INSERT OR IGNORE INTO temp.remote_ids (id) VALUES (?)', [(row['id'],) for row in page])
+
+        deleted = conn.execute('DELETE FROM events WHERE id NOT IN (SELECT id FROM temp.remote_ids)').rowcount
+        set_state(conn, 'reconciled_at', utc_timestamp())
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('DROP TABLE temp.remote_ids')
+    return deleted
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 events 로컬 미러 증분 동기화")
+    parser.add_argument('--mirror', default=DEFAULT_MIRROR, help="미러 SQLite 파일 경로")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="요청당 행 수")
+    parser.add_argument('--reconcile', action='store_true', help="원격 id 전체와 대조해 삭제 누락 정리")
+    parser.add_argument('--report', action='store_true', help="동기화 후 미러에서 검증 리포트 출력")
+    args = parser.parse_args()
+
+    print("🏛️ 나주교회 캘린더 미러 동기화")
+    print("=" * 60)
+    conn = open_mirror(args.mirror)
+    watermark = get_state(conn, 'events_watermark')
+    print(f"🔄 {'워터마크 ' + watermark + ' 이후 변경분' if watermark else '전체 행'}을 동기화합니다...")
+
+    started = time.perf_counter()
+    result = sync_events(get_client(), conn, args.page_size)
+    print(f"✅ 변경 {result['changed']}행 반영, 삭제 {result['deleted']}행 반영 ({time.perf_counter() - started:.2f}초)")
+
+    if args.reconcile or not result["tombstones"]:
+        started = time.perf_counter()
+        deleted = reconcile_ids(get_client(), conn, args.page_size)
+        print(f"🧹 id 대조로 {deleted}행 삭제 ({time.perf_counter() - started:.2f}초)")
+
+    total = conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+    print(f"💾 미러 {args.mirror}: {total}개 이벤트, 워터마크 {get_state(conn, 'events_watermark')}")
+    conn.close()
+
+    if args.report:
+        started = time.perf_counter()
+        mirror = create_local_client(args.mirror)
+        report = fetch_report(mirror)
+        mirror.close()
+        print(f"\n📊 미러 검증 리포트 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
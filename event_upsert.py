@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 자연 키 중복 제거 및 upsert 모듈
+lib/store.ts 의 addEvent 중복 체크(같은 날짜, 공백 제거한 제목, 같은 시작 시간)를
+배치 안에서는 해시 인덱스로, 테이블에서는 idx_events_natural_key 유일 인덱스로 처리합니다.
+
+같은 데이터를 다시 적재해도 on_conflict upsert 한 번으로 끝나고 중복 행이 생기지 않습니다.
+"""
+
+import re
+
+from supabase import Client
+
+# database/migrations/0003_events_natural_key.sql 의 유일 인덱스 컬럼
+NATURAL_KEY_COLUMNS = ('date', 'title', 'start_time')
+ON_CONFLICT = ','.join(NATURAL_KEY_COLUMNS)
+
+def normalize_time(value):
+    """'11:00' 과 '11:00:00' 이 같은 키가 되도록 정규화 (빈 값은 None)"""
+    if not value:
+        return None
+    if isinstance(value, str) and re.fullmatch(r'\d{1,2}:\d{2}', value):
+        hour, minute = value.split(':')
+        return f"{int(hour):02d}:{minute}:00"
+    return value
+
+def natural_key(row):
+    """(날짜, 공백 제거한 제목, 시작 시간) 자연 키"""
+    return (str(row['date'])[:10], row['title'].strip(), normalize_time(row.get('start_time')))
+
+def dedupe_rows(rows):
+    """배치 안의 자연 키 중복 제거 (먼저 나온 행 유지, 제목 공백 제거)
+
+    반환값: (중복 없는 행 목록, 제거된 행 수)
+    """
+    unique = {}
+    for row in rows:
+        key = natural_key(row)
+        if key not in unique:
+            unique[key] = dict(row, title=key[1])
+    return list(unique.values()), len(rows) - len(unique)
+
+def upsert_query(supabase, rows, update_existing: bool = False):
+    """자연 키 on_conflict upsert 쿼리 생성 (동기/비동기 클라이언트 공용)
+
+    update_existing=False 이면 이미 있는 행은 건드리지 않고(DO NOTHING),
+    True 이면 나머지 컬럼을 새 값으로 갱신합니다(DO UPDATE).
+    """
+    unique, _ = dedupe_rows(rows)
+    return supabase.table('events').upsert(unique, on_conflict=ON_CONFLICT, ignore_duplicates=not update_existing,
+                                           count='exact', returning='minimal')
+
+def upsert_events(supabase: Client, rows, update_existing: bool = False):
+    """자연 키 기준으로 이벤트 upsert
+
+    반환값: 새로 삽입되었거나(update_existing=True 이면 갱신된) 행 수
+    """
+    if not rows:
+        return 0
+    result = upsert_query(supabase, rows, update_existing).execute()
+    return result.count if result.count is not None else len(dedupe_rows(rows)[0])
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 updated_at/deleted_at 워터마크 공용 함수
+event_sync 의 미러 동기화와 스냅샷/비트맵/검색 색인/알림 스케줄러의 증분 갱신이 같은 형식의 시각을 씁니다.
+
+- 시각은 마이크로초까지 고정된 UTC 문자열이라 사전순 비교가 시간순 비교와 같습니다.
+- now() 는 트랜잭션 시작 시각이라 늦게 커밋된 행을 놓치지 않도록 워터마크보다 SYNC_OVERLAP 만큼 앞에서 다시 읽습니다.
+- 바뀐 행은 events 의 (updated_at, id), 삭제는 events_tombstones(0004) 의 (deleted_at, id) 키셋 순서로 읽습니다.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from supabase import Client
+
+from event_reader import DEFAULT_PAGE_SIZE, iter_event_pages
+
+# 워터마크보다 이만큼 앞에서부터 다시 읽어 늦게 커밋된 트랜잭션의 행을 포함합니다.
+SYNC_OVERLAP = timedelta(minutes=2)
+
+TOMBSTONE_TABLE = 'events_tombstones'
+TOMBSTONE_COLUMNS = ('id', 'deleted_at')
+# 변경을 읽는 테이블 -> 워터마크 컬럼
+WATERMARK_COLUMNS = {
+    'events': 'updated_at',
+    TOMBSTONE_TABLE: 'deleted_at',
+}
+
+def utc_timestamp():
+    """PostgreSQL timestamptz 와 같은 형식의 현재 시각 (사전순 = 시간순)"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+def normalize_timestamp(value):
+    """timestamptz 문자열을 마이크로초까지 고정된 UTC 형식으로 변환 (사전순 = 시간순)"""
+    if not value:
+        return value
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+def since_watermark(watermark: str):
+    """워터마크에서 SYNC_OVERLAP 을 뺀 조회 시작 시각"""
+    return normalize_timestamp((datetime.fromisoformat(watermark) - SYNC_OVERLAP).isoformat())
+
+def iter_change_pages(supabase: Client, table: str, columns, watermark: str = None,
+                      page_size: int = DEFAULT_PAGE_SIZE):
+    """워터마크 이후 바뀐 행(events) 또는 삭제 기록(events_tombstones) 페이지 (워터마크가 없으면 전체)"""
+    sort_column = WATERMARK_COLUMNS[table]
+    filters = [('gte', sort_column, since_watermark(watermark))] if watermark else []
+    return iter_event_pages(supabase, columns, page_size, filters, keyset=(sort_column, 'id'), table=table)
+
+def pull_changes(supabase: Client, conn, table: str, columns, state_table: str, state_name: str, apply,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+    """워터마크 이후의 페이지를 SQLite 상태 파일에 반영하고 페이지마다 워터마크 저장
+
+    state_table 은 (name, value) 상태 테이블이고 apply(conn, page) 와 워터마크를 같은 트랜잭션으로 기록하므로
+    중단되어도 이어서 반영합니다.
+    반환값: (받은 행 수, apply 반환값 합계)
+    """
+    sort_column = WATERMARK_COLUMNS[table]
+    row = conn.execute(f'SELECT value FROM {state_table} WHERE name = ?', (state_name,)).fetchone()
+    fetched = 0
+    applied = 0
+
+    for page in iter_change_pages(supabase, table, columns, row[0] if row else None, page_size):
+        conn.execute('BEGIN')
+        try:
+            applied += apply(conn, page) or 0
+            # (sort, id) 오름차순이므로 마지막 행이 이 페이지의 최대값입니다.
+            conn.execute(f'INSERT OR REPLACE INTO {state_table} (name, value) VALUES (?, ?)',
+                         (state_name, normalize_timestamp(page[-1][sort_column])))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        fetched += len(page)
+    return fetched, applied
+
+def latest_tombstone(supabase: Client):
+    """가장 최근 삭제 기록 시각 (삭제 기록이 없거나 테이블이 없으면 None)"""
+    try:
+        rows = (supabase.table(TOMBSTONE_TABLE).select('deleted_at').order('deleted_at', desc=True).limit(1)
+                .execute().data)
+    except Exception:
+        return None
+    return normalize_timestamp(rows[0]['deleted_at']) if rows else None
+
+def warn_tombstones_unavailable(error, remedy: str):
+    """events_tombstones 가 없거나 읽을 수 없을 때 안내 (remedy: 삭제를 반영하는 다른 방법)"""
+    print(f"⚠️ events_tombstones 를 읽을 수 없어 {remedy}: {str(error)}")
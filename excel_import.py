@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+나주교회 월간 일정표 엑셀 일괄 가져오기 스크립트
+여러 달/여러 해의 워크북을 프로세스 풀에서 병렬로 파싱하고(excel_parser.py),
+파싱된 행을 크기 조정된 청크로 모아 동시 전송 수를 제한해 삽입합니다.
+
+사용 예:
+    python excel_import.py archive/2023/*.xlsx archive/2024/*.xlsx
+    python excel_import.py archive --workers 8 --concurrency 4
+    python excel_import.py archive --dry-run                      # 파싱 결과만 확인
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+
+from supabase import Client
+
+from excel_parser import parse_workbook
+from seed_events import chunk_size_for, insert_chunk
+from supabase_client import get_client
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+
+def collect_workbooks(paths):
+    """파일/디렉터리 인자에서 워크북 경로 목록 수집 (디렉터리는 하위까지 탐색)"""
+    workbooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                workbooks.extend(os.path.join(root, filename) for filename in filenames
+                                 if filename.lower().endswith(WORKBOOK_EXTENSIONS) and not filename.startswith('~$'))
+        else:
+            workbooks.append(path)
+    return sorted(workbooks)
+
+def import_workbooks(supabase: Client, paths, workers: int = None, chunk_size: int = None,
+                     concurrency: int = 4, dry_run: bool = False, update_existing: bool = False):
+    """워크북들을 병렬 파싱하고 청크 단위로 upsert
+
+    파싱이 끝난 파일부터 행을 버퍼에 모으고, 버퍼가 청크 크기를 넘을 때마다 삽입을 보냅니다.
+    동시에 전송 중인 청크는 최대 concurrency 개입니다. 같은 워크북을 다시 가져와도
+    자연 키 (date, title, start_time) 가 같은 일정은 새로 쓰지 않습니다(update_existing=True 이면 갱신).
+    """
+    print(f"📂 워크북 {len(paths)}개를 파싱합니다... (워커 {workers or os.cpu_count()}개)")
+
+    parsed = 0
+    inserted = 0
+    failed_files = []
+    failed_chunks = 0
+    buffer = []
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as parsers, ThreadPoolExecutor(max_workers=concurrency) as writers:
+        in_flight = set()
+
+        def collect(done):
+            nonlocal inserted, failed_chunks
+            for future in done:
+                in_flight.discard(future)
+                try:
+                    inserted += future.result()
+                except Exception as e:
+                    failed_chunks += 1
+                    print(f"❌ 청크 삽입 실패: {str(e)}")
+
+        def submit(rows):
+            if len(in_flight) >= concurrency:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(writers.submit(insert_chunk, supabase, rows, update_existing))
+
+        futures = {parsers.submit(parse_workbook, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                failed_files.append(path)
+                print(f"❌ {path} 파싱 실패: {str(e)}")
+                continue
+
+            print(f"   📄 {os.path.basename(path)}: {len(rows)}개 일정")
+            parsed += len(rows)
+            if dry_run:
+                continue
+
+            buffer.extend(rows)
+            chunk_size = chunk_size or chunk_size_for(buffer)
+            while len(buffer) >= chunk_size:
+                submit(buffer[:chunk_size])
+                buffer = buffer[chunk_size:]
+
+        if buffer and not dry_run:
+            submit(buffer)
+        collect(wait(in_flight)[0])
+
+    elapsed = time.perf_counter() - started
+    if dry_run:
+        print(f"ℹ️ dry-run: {parsed}개 일정을 파싱했고 삽입하지 않았습니다. ({elapsed:.1f}초)")
+    else:
+        rate = inserted / elapsed if elapsed > 0 else 0.0
+        print(f"✅ {inserted}개 일정 삽입 완료, 기존/중복 {parsed - inserted}개 ({elapsed:.1f}초, {rate:,.0f} rows/sec)")
+    if failed_files:
+        print(f"⚠️ 파싱 실패한 워크북 {len(failed_files)}개: {failed_files[:20]}")
+    if failed_chunks:
+        print(f"⚠️ 삽입 실패한 청크 {failed_chunks}개")
+
+    return {"files": len(paths), "parsed": parsed, "inserted": inserted, "seconds": elapsed,
+            "failed_files": failed_files, "failed_chunks": failed_chunks}
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 월간 일정표 엑셀 일괄 가져오기")
+    parser.add_argument('paths', nargs='+', help="워크북 파일 또는 디렉터리")
+    parser.add_argument('--workers', type=int, default=None, help="파싱 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--chunk-size', type=int, default=None, help="요청당 행 수 (기본: 자동)")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시에 전송할 최대 청크 수")
+    parser.add_argument('--dry-run', action='store_true', help="파싱만 하고 삽입하지 않음")
+    parser.add_argument('--update-existing', action='store_true', help="이미 있는 일정도 새 값으로 갱신")
+    args = parser.parse_args()
+
+    print("🏛️ 나주교회 엑셀 일정 가져오기")
+    print("=" * 60)
+    workbooks = collect_workbooks(args.paths)
+    if not workbooks:
+        print("⚠️ 가져올 워크북이 없습니다.")
+        return
+
+    supabase = None if args.dry_run else get_client()
+    import_workbooks(supabase, workbooks, args.workers, args.chunk_size, args.concurrency, args.dry_run,
+                     args.update_existing)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+나주교회 월간 일정표 엑셀 파서
+lib/excel-parser.ts 의 parseExcelToEvents 와 같은 규칙으로 워크북 하나를 events 행 목록으로 변환합니다.
+
+- B1 에서 연도, C1 에서 월을 읽습니다.
+- 날짜 셀(날짜 타입, 엑셀 일련번호, "10월 1일", 월 정보가 있을 때 "15") 아래/오른쪽의 텍스트를 그 날의 일정으로 봅니다.
+- "메모:" 섹션의 카테고리 레이블과 주간 안내 문구는 제외합니다.
+- 셀 배경색(없으면 제목)으로 카테고리를, 제목의 "14:00"/"3시"/"오후 2" 로 시간을 추론합니다.
+
+워크북은 read-only 모드로 행 단위 스트리밍하며, supabase 를 import 하지 않으므로
+프로세스 풀 워커에서 가볍게 실행할 수 있습니다.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+
+from openpyxl import load_workbook
+
+# 메모 섹션의 카테고리 레이블 등 일정이 아닌 텍스트
+EXCLUDED_LABELS = [
+    '메모:',
+    '예배, 인맞음',
+    '송하행사',
+    '신학부(센터)',
+    '신학부(모임)',
+    '관리부',
+    '나주지역회의',
+    '교육부',
+    '봉사,홍보',
+    '봉사, 홍보',
+    '전도부',
+    '전도기획',
+]
+
+# 제목 키워드 -> 카테고리 (앞에서부터 먼저 일치하는 것 사용)
+CATEGORY_KEYWORDS = [
+    (('예배', '인맞음'), 'worship'),
+    (('송하', '졸업'), 'celebration'),
+    (('신학', '센터'), 'theology'),
+    (('관리', '재정'), 'admin'),
+    (('교육', '학습'), 'education'),
+    (('전도', '선교'), 'evangelism'),
+    (('봉사', '홍보'), 'service'),
+    (('지역', '나주'), 'regional'),
+]
+
+# 엑셀 ARGB 배경색 -> 카테고리
+COLOR_CATEGORIES = {
+    # 파란색 계열 - 예배, 인맞음
+    'FF0070C0': 'worship',
+    'FF00B0F0': 'worship',
+    'FF5B9BD5': 'worship',
+    # 초록색 계열 - 송하행사
+    'FF70AD47': 'celebration',
+    'FF92D050': 'celebration',
+    'FF00B050': 'celebration',
+    # 보라색 계열 - 신학부
+    'FF7030A0': 'theology',
+    'FFB455B4': 'theology',
+    'FFCC99FF': 'theology',
+    # 회색 계열 - 관리부
+    'FFA6A6A6': 'admin',
+    'FF808080': 'admin',
+    'FF595959': 'admin',
+    # 주황색 계열 - 교육부
+    'FFED7D31': 'education',
+    'FFFFC000': 'education',
+    'FFFFCC00': 'education',
+    # 빨간색 계열 - 전도부
+    'FFFF0000': 'evangelism',
+    'FFFF6666': 'evangelism',
+    'FFE26B0A': 'evangelism',
+    # 노란색 계열 - 봉사/홍보
+    'FFFFFF00': 'service',
+    'FFFFEB9C': 'service',
+    'FFFFF2CC': 'service',
+    # 청록색 계열 - 나주지역회의
+    'FF00FFFF': 'regional',
+    'FF00CCFF': 'regional',
+    'FF99FFFF': 'regional',
+}
+
+DEFAULT_YEAR = 2025
+DEFAULT_DESCRIPTION = '엑셀에서 가져온 일정'
+DEFAULT_LOCATION = '나주지역'
+DEFAULT_REMINDER = 30
+
+# 날짜 셀로 볼 엑셀 일련번호 범위 (2009~2036년)
+SERIAL_DATE_RANGE = (40000, 50000)
+EXCEL_EPOCH = date(1899, 12, 30)
+
+YEAR_PATTERN = re.compile(r'(\d{4})')
+MONTH_PATTERN = re.compile(r'(\d{1,2})월')
+KOREAN_DATE_PATTERN = re.compile(r'(\d{1,2})월\s*(\d{1,2})일')
+ISO_DATE_PATTERN = re.compile(r'\d{4}[-/.]\d{1,2}[-/.]\d{1,2}')
+SIMPLE_DAY_PATTERN = re.compile(r'^\d{1,2}$')
+WEEKDAY_MARKERS = ('(월)', '(화)', '(수)', '(목)', '(금)', '(토)', '(일)')
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})|(\d{1,2})시|오전\s*(\d{1,2})|오후\s*(\d{1,2})')
+
+def is_excluded_text(text: str):
+    """메모 섹션 레이블이거나 주간 안내처럼 일정이 아닌 텍스트인지 확인"""
+    stripped = text.strip()
+    if any(stripped == label or stripped == label.replace(',', ', ') for label in EXCLUDED_LABELS):
+        return True
+    # 찾기주간, 전도주간 등 기간 안내
+    if '주간' in text and ('(' in text or '~' in text):
+        return True
+    return '찾기주간' in text
+
+def infer_category_from_text(text: str):
+    """제목 키워드로 카테고리 추론 (없으면 None)"""
+    lowered = text.lower()
+    for keywords, category in CATEGORY_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return None
+
+def map_color_to_category(color: str = None, title: str = None):
+    """배경색(ARGB)을 카테고리로 매핑 (색이 없으면 제목으로 추론)"""
+    if not color and title:
+        inferred = infer_category_from_text(title)
+        if inferred:
+            return inferred
+    if not color:
+        return 'church'
+
+    upper = color.upper()
+    if upper in COLOR_CATEGORIES:
+        return COLOR_CATEGORIES[upper]
+
+    # 정확히 일치하는 색이 없으면 RGB 성분으로 가장 비슷한 계열 선택
+    if len(upper) >= 6:
+        try:
+            r, g, b = int(upper[-6:-4], 16), int(upper[-4:-2], 16), int(upper[-2:], 16)
+        except ValueError:
+            return 'church'
+        if b > r and b > g:
+            return 'worship'
+        if g > r and g > b:
+            return 'celebration'
+        if r > 200 and g > 200 and b < 100:
+            return 'service'
+        if r > g and r > b and r > 200:
+            return 'evangelism'
+        if abs(r - g) < 30 and abs(g - b) < 30:
+            return 'admin'
+    return 'church'
+
+def infer_time_from_title(title: str):
+    """제목에 적힌 시간으로 시작/종료 시간 추론 (없으면 종일 일정, 종료는 시작 + 2시간)"""
+    match = TIME_PATTERN.search(title)
+    if match:
+        minute = 0
+        if match.group(1):
+            hour, minute = int(match.group(1)), int(match.group(2))
+        elif match.group(3):
+            hour = int(match.group(3))
+        elif match.group(4):
+            hour = int(match.group(4))
+        else:
+            hour = int(match.group(5)) + 12
+
+        # "오후 12" 처럼 하루를 넘는 시간은 종일 일정으로 둡니다.
+        if hour <= 23 and minute <= 59:
+            end_minute = min(hour * 60 + minute + 120, 23 * 60 + 59)
+            return {
+                "start_time": f"{hour:02d}:{minute:02d}",
+                "end_time": f"{end_minute // 60:02d}:{end_minute % 60:02d}",
+                "is_all_day": False,
+            }
+    return {"start_time": None, "end_time": None, "is_all_day": True}
+
+def _replace_year(value: date, year: int):
+    """연도만 바꾼 날짜 (2월 29일이 없는 해면 None)"""
+    try:
+        return date(year, value.month, value.day)
+    except ValueError:
+        return None
+
+def _cell_color(cell):
+    """셀 배경색 ARGB 문자열 (채우기가 없거나 테마 색이면 None)"""
+    fill = getattr(cell, 'fill', None)
+    if fill is None or not getattr(fill, 'fill_type', None):
+        return None
+    for color in (fill.fgColor, fill.bgColor):
+        if color is not None and color.type == 'rgb' and isinstance(color.rgb, str):
+            return color.rgb
+    return None
+
+def _parse_date_value(value, year: int, month: int = None):
+    """셀 값이 날짜이면 date 반환
+
+    반환값: (date 또는 None, 날짜 셀 여부) - 날짜 패턴이지만 해석할 수 없는 셀도 텍스트로 쓰지 않습니다.
+    """
+    if isinstance(value, datetime):
+        return _replace_year(value.date(), year), True
+    if isinstance(value, date):
+        return _replace_year(value, year), True
+    if isinstance(value, (int, float)) and not isinstance(value, bool) \
+            and SERIAL_DATE_RANGE[0] < value < SERIAL_DATE_RANGE[1]:
+        return _replace_year(EXCEL_EPOCH + timedelta(days=int(value)), year), True
+    if not isinstance(value, str):
+        return None, False
+
+    text = value.strip()
+    if KOREAN_DATE_PATTERN.search(text) or ISO_DATE_PATTERN.search(text) \
+            or any(marker in text for marker in WEEKDAY_MARKERS):
+        match = KOREAN_DATE_PATTERN.search(text)
+        if match:
+            try:
+                return date(year, int(match.group(1)), int(match.group(2))), True
+            except ValueError:
+                pass
+        return None, True
+    if SIMPLE_DAY_PATTERN.match(text) and month is not None:
+        try:
+            return date(year, month, int(text)), True
+        except ValueError:
+            return None, True
+    return None, False
+
+def _is_column_noise(title: str):
+    """날짜 아래 열에서 일정이 아닌 텍스트 필터"""
+    return (len(title) < 2 or title.isdigit() or re.fullmatch(r'\d+월', title) is not None
+            or re.fullmatch(r'\d+일', title) is not None or '요일' in title or '작성' in title
+            or title == 'nan' or is_excluded_text(title))
+
+def _is_row_noise(title: str):
+    """날짜 오른쪽 셀에서 일정이 아닌 텍스트 필터"""
+    return len(title) < 2 or title.isdigit() or '요일' in title or title == 'nan' or is_excluded_text(title)
+
+def parse_sheet(rows, year: int = None, month: int = None):
+    """(행 번호, 열 번호, 값, 배경색) 셀 목록을 events 행 목록으로 변환
+
+    year/month 가 없으면 B1/C1 셀에서 읽습니다.
+    """
+    cells = {}
+    for row, col, value, color in rows:
+        if value is not None:
+            cells[(row, col)] = (value, color)
+    if not cells:
+        return []
+
+    if year is None:
+        match = YEAR_PATTERN.search(str(cells.get((1, 2), ('',))[0]).strip())
+        year = int(match.group(1)) if match else DEFAULT_YEAR
+    if month is None:
+        match = MONTH_PATTERN.search(str(cells.get((1, 3), ('',))[0]).strip())
+        month = int(match.group(1)) if match else None
+
+    # 1단계: 날짜 셀과 일정 후보 텍스트 분류
+    dates = {}
+    texts = {}
+    for key, (value, _) in sorted(cells.items()):
+        parsed, is_date_cell = _parse_date_value(value, year, month)
+        if parsed is not None:
+            dates[key] = parsed
+        if is_date_cell:
+            continue
+        text = value.strip() if isinstance(value, str) else str(value).strip()
+        if 1 < len(text) < 100 and not is_excluded_text(text):
+            texts[key] = text
+
+    max_row = max(row for row, _ in cells)
+    max_col = max(col for _, col in cells)
+
+    # 2단계: 날짜 셀 아래(같은 열)와 오른쪽(최대 3칸, 아래로 2행까지)의 텍스트를 그 날 일정으로 매핑
+    events = []
+    seen = set()
+
+    def add_event(key, event_date):
+        title = texts[key]
+        if (event_date, title) in seen:
+            return
+        seen.add((event_date, title))
+        event = {
+            "title": title,
+            "date": event_date.isoformat(),
+            "category": map_color_to_category(cells[key][1], title),
+            "description": DEFAULT_DESCRIPTION,
+            "location": DEFAULT_LOCATION,
+            "reminder": DEFAULT_REMINDER,
+            "recurring": None,
+        }
+        event.update(infer_time_from_title(title))
+        events.append(event)
+
+    for (date_row, date_col), event_date in dates.items():
+        for check_row in range(date_row + 1, max_row + 1):
+            if (check_row, date_col) in dates:
+                break
+            key = (check_row, date_col)
+            if key in texts and not _is_column_noise(texts[key]):
+                add_event(key, event_date)
+
+        for check_col in range(date_col + 1, min(date_col + 3, max_col) + 1):
+            if (date_row, check_col) in dates:
+                break
+            for row_offset in range(3):
+                key = (date_row + row_offset, check_col)
+                if key in texts and not _is_row_noise(texts[key]):
+                    add_event(key, event_date)
+
+    return events
+
+def iter_sheet_cells(worksheet):
+    """read-only 워크시트를 (행, 열, 값, 배경색) 으로 스트리밍"""
+    for row in worksheet.iter_rows():
+        for cell in row:
+            value = getattr(cell, 'value', None)
+            if value is None:
+                continue
+            yield cell.row, cell.column, value, _cell_color(cell)
+
+def parse_workbook(path: str):
+    """워크북 첫 번째 시트를 events 행 목록으로 변환"""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return parse_sheet(iter_sheet_cells(workbook.worksheets[0]))
+    finally:
+        workbook.close()
@@ -0,0 +1,787 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 로컬 Supabase 대체 백엔드
+네트워크 없이 스크립트를 측정/테스트할 수 있도록 supabase-py 클라이언트 중
+스크립트들이 사용하는 부분을 SQLite 위에 같은 프로세스 안에서 구현합니다.
+
+    from local_backend import create_local_client
+    supabase = create_local_client(latency=0.02)   # 왕복마다 20ms 지연 주입
+    insert_sample_data(supabase)
+    print(supabase.stats.summary())
+
+지원 범위:
+- table().select(count='exact', head=True)/insert/upsert/update/delete
+- eq/neq/gt/gte/lt/lte/like/ilike/in_/is_/or_ 필터, order, limit, range, single
+- rpc('ping'), rpc('exec_sql'), rpc('events_count_report'), rpc('archive_events'), rpc('update_events')
+  및 register_rpc 로 추가한 함수
+- create_async_local_client() 는 execute() 가 코루틴인 AsyncClient 형태를 제공합니다.
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from event_watermarks import utc_timestamp
+
+# PostgreSQL 스키마(database/schema.sql)에 대응하는 SQLite 스키마
+LOCAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+  id UUID PRIMARY KEY,
+  title VARCHAR(255) NOT NULL,
+  date DATE NOT NULL,
+  start_time TIME,
+  end_time TIME,
+  category TEXT NOT NULL DEFAULT 'church'
+    CHECK (category IN ('church', 'adult', 'youth', 'advisory', 'women', 'student', 'children',
+                        'worship', 'celebration', 'theology', 'admin', 'education', 'evangelism',
+                        'service', 'regional')),
+  description TEXT,
+  location VARCHAR(255),
+  is_all_day BOOLEAN NOT NULL DEFAULT 0,
+  reminder INTEGER,
+  recurring TEXT CHECK (recurring IN ('daily', 'weekly', 'monthly', 'yearly')),
+  created_at TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
+CREATE INDEX IF NOT EXISTS idx_events_category ON events(category);
+CREATE INDEX IF NOT EXISTS idx_events_created_at ON events(created_at);
+CREATE INDEX IF NOT EXISTS idx_events_date_id ON events(date, id);
+-- SQLite 는 유일 인덱스에서 NULL 을 서로 다른 값으로 보므로 종일 일정 중복은 upsert 의 IS 비교로 막습니다.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_natural_key ON events(date, title, start_time);
+CREATE INDEX IF NOT EXISTS idx_events_updated_at_id ON events(updated_at, id);
+CREATE TABLE IF NOT EXISTS events_tombstones (
+  id UUID PRIMARY KEY,
+  deleted_at TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_tombstones_deleted_at_id ON events_tombstones(deleted_at, id);
+CREATE TRIGGER IF NOT EXISTS record_events_tombstone AFTER DELETE ON events
+BEGIN
+  INSERT OR REPLACE INTO events_tombstones (id, deleted_at)
+  VALUES (OLD.id, strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'));
+END;
+CREATE TABLE IF NOT EXISTS events_archive (
+  id UUID PRIMARY KEY,
+  title VARCHAR(255) NOT NULL,
+  date DATE NOT NULL,
+  start_time TIME,
+  end_time TIME,
+  category TEXT NOT NULL DEFAULT 'church',
+  description TEXT,
+  location VARCHAR(255),
+  is_all_day BOOLEAN NOT NULL DEFAULT 0,
+  reminder INTEGER,
+  recurring TEXT,
+  created_at TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL,
+  archived_at TIMESTAMPTZ NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_events_archive_date_id ON events_archive(date, id);
+"""
+
+# events_archive 로 옮기는 컬럼 (archived_at 제외)
+ARCHIVE_COLUMNS = ('id', 'title', 'date', 'start_time', 'end_time', 'category', 'description', 'location',
+                   'is_all_day', 'reminder', 'recurring', 'created_at', 'updated_at')
+
+FILTER_OPERATORS = {
+    'eq': '=',
+    'neq': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'like': 'LIKE',
+    'ilike': 'LIKE',
+}
+
+class LocalAPIError(Exception):
+    """PostgREST APIError 에 대응하는 예외 (code 는 APIError.code 처럼 SQLSTATE)"""
+
+    def __init__(self, message: str, code: str = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+def _normalize_time(value):
+    """'11:00' 을 PostgreSQL TIME 출력 형식 '11:00:00' 으로 정규화"""
+    if isinstance(value, str) and re.fullmatch(r'\d{2}:\d{2}', value):
+        return f"{value}:00"
+    return value
+
+def _ident(name: str):
+    """SQLite 식별자 인용"""
+    return '"' + name.replace('"', '""') + '"'
+
+def _to_sql_value(value):
+    """필터 값을 SQLite 값으로 변환"""
+    if isinstance(value, bool):
+        return int(value)
+    if value in ('true', 'false'):
+        return int(value == 'true')
+    return value
+
+def split_sql_statements(sql: str):
+    """따옴표, $$ 본문, -- 주석을 고려하여 SQL 을 문장 단위로 분리"""
+    statements, current = [], []
+    i, length = 0, len(sql)
+    while i < length:
+        char = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        if char == "'":
+            end = i + 1
+            while end < length:
+                if sql[end] == "'" and not sql.startswith("''", end):
+                    break
+                end += 2 if sql.startswith("''", end) else 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        if char == '$':
+            tag = re.match(r'\$[A-Za-z_]*\$', sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                end = length if end == -1 else end + len(tag.group(0))
+                current.append(sql[i:end])
+                i = end
+                continue
+        if char == ';':
+            statement = ''.join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statement = ''.join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+def _split_logic_tree(expression: str):
+    """PostgREST or/and 식의 최상위 콤마로 분리"""
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(expression):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(expression[start:index])
+            start = index + 1
+    parts.append(expression[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+def _parse_logic_tree(expression: str, joiner: str, columns):
+    """'date.gt.X,and(date.eq.X,id.gt.Y)' 형식을 SQL 조건과 파라미터로 변환"""
+    clauses, params = [], []
+    for part in _split_logic_tree(expression):
+        nested = re.fullmatch(r'(and|or)\((.*)\)', part, re.S)
+        if nested:
+            clause, nested_params = _parse_logic_tree(nested.group(2), nested.group(1).upper(), columns)
+        else:
+            column, operator, value = part.split('.', 2)
+            clause, nested_params = _filter_clause(column, operator, value.strip('"'), columns)
+        clauses.append(f"({clause})")
+        params.extend(nested_params)
+    return f" {joiner} ".join(clauses), params
+
+def _filter_clause(column: str, operator: str, value, columns):
+    """단일 필터를 SQL 조건으로 변환"""
+    if column not in columns:
+        raise LocalAPIError(f'column "{column}" does not exist')
+    if operator == 'is':
+        keyword = {'null': 'NULL', None: 'NULL', 'true': '1', True: '1', 'false': '0', False: '0'}[value]
+        return f'"{column}" IS {keyword}', []
+    if operator == 'in':
+        values = value if isinstance(value, (list, tuple, set)) else value.strip('()').split(',')
+        values = [_to_sql_value(item) for item in values]
+        if not values:
+            return '0', []
+        return f'"{column}" IN ({",".join("?" * len(values))})', values
+    sql_operator = FILTER_OPERATORS.get(operator)
+    if sql_operator is None:
+        raise LocalAPIError(f"unsupported operator: {operator}")
+    if operator in ('like', 'ilike') and isinstance(value, str):
+        value = value.replace('*', '%')
+    return f'"{column}" {sql_operator} ?', [_to_sql_value(value)]
+
+class LocalResponse:
+    """postgrest APIResponse 에 대응하는 응답 객체"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"LocalResponse(data={self.data!r}, count={self.count!r})"
+
+class RoundTripStats:
+    """요청 왕복 횟수와 전송 바이트 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """집계 초기화"""
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.by_operation = {}
+
+    def record(self, operation: str, sent: int, received: int):
+        """요청 하나 기록"""
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+            entry = self.by_operation.setdefault(operation, {"requests": 0, "bytes_sent": 0, "bytes_received": 0})
+            entry["requests"] += 1
+            entry["bytes_sent"] += sent
+            entry["bytes_received"] += received
+
+    def summary(self):
+        """집계 결과 dict"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "by_operation": {name: dict(entry) for name, entry in self.by_operation.items()},
+            }
+
+def _payload_size(value):
+    """JSON 직렬화 기준 바이트 수"""
+    if value is None:
+        return 0
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+
+class LocalQuery:
+    """table() 이 반환하는 쿼리 빌더"""
+
+    def __init__(self, client, table: str):
+        self._client = client
+        self._table = table
+        self._columns = client._table_columns(table)
+        self._action = 'select'
+        self._select = '*'
+        self._count = None
+        self._head = False
+        self._payload = None
+        self._returning = 'representation'
+        self._on_conflict = ''
+        self._ignore_duplicates = False
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+        self._single = False
+
+    # 동작 선택
+    def select(self, *columns, count=None, head=None):
+        self._action = 'select'
+        self._select = ','.join(columns) if columns else '*'
+        self._count = count
+        self._head = bool(head)
+        return self
+
+    def insert(self, json, *, count=None, returning='representation', upsert=False, default_to_null=True):
+        self._action = 'upsert' if upsert else 'insert'
+        self._payload = json
+        self._count = count
+        self._returning = returning
+        return self
+
+    def upsert(self, json, *, count=None, returning='representation', ignore_duplicates=False,
+               on_conflict='', default_to_null=True):
+        self._action = 'upsert'
+        self._payload = json
+        self._count = count
+        self._returning = returning
+        self._on_conflict = on_conflict
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, json, *, count=None, returning='representation'):
+        self._action = 'update'
+        self._payload = json
+        self._count = count
+        self._returning = returning
+        return self
+
+    def delete(self, *, count=None, returning='representation'):
+        self._action = 'delete'
+        self._count = count
+        self._returning = returning
+        return self
+
+    # 필터
+    def _add_filter(self, column, operator, value):
+        self._filters.append(_filter_clause(column, operator, value, self._columns))
+        return self
+
+    def eq(self, column, value):
+        return self._add_filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._add_filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._add_filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._add_filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._add_filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._add_filter(column, 'lte', value)
+
+    def like(self, column, pattern):
+        return self._add_filter(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self._add_filter(column, 'ilike', pattern)
+
+    def in_(self, column, values):
+        return self._add_filter(column, 'in', list(values))
+
+    def is_(self, column, value):
+        return self._add_filter(column, 'is', value)
+
+    def or_(self, filters, reference_table=None):
+        self._filters.append(_parse_logic_tree(filters, 'OR', self._columns))
+        return self
+
+    # 정렬/페이지
+    def order(self, column, *, desc=False, nullsfirst=None, foreign_table=None):
+        if column not in self._columns:
+            raise LocalAPIError(f'column "{column}" does not exist')
+        nulls = 'FIRST' if (desc if nullsfirst is None else nullsfirst) else 'LAST'
+        self._order.append(f'"{column}" {"DESC" if desc else "ASC"} NULLS {nulls}')
+        return self
+
+    def limit(self, size, *, foreign_table=None):
+        self._limit = size
+        return self
+
+    def range(self, start, end, foreign_table=None):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def execute(self):
+        return self._client._execute(self)
+
+    # SQL 조립
+    def _where(self):
+        if not self._filters:
+            return '', []
+        clauses = [clause for clause, _ in self._filters]
+        params = [param for _, clause_params in self._filters for param in clause_params]
+        return ' WHERE ' + ' AND '.join(f"({clause})" for clause in clauses), params
+
+    def _selected_columns(self):
+        if self._select.strip() == '*':
+            return list(self._columns)
+        selected = [column.strip() for column in self._select.split(',') if column.strip()]
+        for column in selected:
+            if column not in self._columns:
+                raise LocalAPIError(f'column "{column}" does not exist')
+        return selected
+
+    def _tail(self):
+        sql = ''
+        if self._order:
+            sql += ' ORDER BY ' + ', '.join(self._order)
+        if self._limit is not None:
+            sql += f' LIMIT {int(self._limit)}'
+            if self._offset:
+                sql += f' OFFSET {int(self._offset)}'
+        return sql
+
+class LocalRpc:
+    """rpc() 가 반환하는 호출 객체"""
+
+    def __init__(self, client, name: str, params):
+        self._client = client
+        self._name = name
+        self._params = params or {}
+
+    def execute(self):
+        return self._client._execute_rpc(self)
+
+class LocalSupabase:
+    """SQLite 기반 Supabase 클라이언트 대체 구현"""
+
+    def __init__(self, path: str = ':memory:', latency: float = 0.0):
+        self.latency = latency
+        self.stats = RoundTripStats()
+        self.skipped_statements = []
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(LOCAL_SCHEMA)
+        self._columns_cache = {}
+        self._rpcs = {
+            'ping': lambda client, params: 'pong',
+            'exec_sql': lambda client, params: client._exec_sql(params['sql']),
+            'events_count_report': lambda client, params: client._events_count_report(),
+            'archive_events': lambda client, params: client._archive_events(params),
+            'update_events': lambda client, params: client._update_events(params['changes']),
+        }
+
+    # 클라이언트 표면
+    def table(self, name: str):
+        return LocalQuery(self, name)
+
+    def from_(self, name: str):
+        return self.table(name)
+
+    def rpc(self, name: str, params=None):
+        return LocalRpc(self, name, params)
+
+    def register_rpc(self, name: str, handler):
+        """로컬 RPC 함수 등록 (handler(client, params) -> data)"""
+        self._rpcs[name] = handler
+
+    def close(self):
+        """SQLite 연결 종료"""
+        self._conn.close()
+
+    def sql(self, statement: str, params=()):
+        """벤치마크/검증용 직접 SQL 실행 (왕복 집계에 포함되지 않음)"""
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(statement, params).fetchall()]
+
+    # 내부 구현
+    def _wait_round_trip(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _table_columns(self, table: str):
+        columns = self._columns_cache.get(table)
+        if columns is None:
+            with self._lock:
+                info = self._conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+            if not info:
+                raise LocalAPIError(f'relation "public.{table}" does not exist', '42P01')
+            columns = {row['name']: (row['type'] or '').upper() for row in info}
+            self._columns_cache[table] = columns
+        return columns
+
+    def _row_to_dict(self, columns, row):
+        result = dict(row)
+        for column, value in result.items():
+            if columns.get(column) == 'BOOLEAN' and value is not None:
+                result[column] = bool(value)
+        return result
+
+    def _prepare_row(self, columns, row, now):
+        prepared = {}
+        for column, value in row.items():
+            if column not in columns:
+                raise LocalAPIError(f'column "{column}" of relation does not exist')
+            if columns[column] == 'TIME':
+                value = _normalize_time(value)
+            elif columns[column] == 'BOOLEAN' and value is not None:
+                value = int(bool(value))
+            prepared[column] = value
+        if 'id' in columns and columns['id'] == 'UUID' and not prepared.get('id'):
+            prepared['id'] = str(uuid.uuid4())
+        for column in ('created_at', 'updated_at'):
+            if column in columns and not prepared.get(column):
+                prepared[column] = now
+        return prepared
+
+    def _insert_rows(self, query, rows, now):
+        inserted = []
+        for row in rows:
+            prepared = self._prepare_row(query._columns, row, now)
+            names = list(prepared)
+            self._conn.execute(
+                f'INSERT INTO {_ident(query._table)} ({",".join(_ident(name) for name in names)}) '
+                f'VALUES ({",".join("?" * len(names))})',
+                [prepared[name] for name in names],
+            )
+            inserted.append(prepared)
+        return inserted
+
+    def _upsert_rows(self, query, rows, now):
+        conflict = [column.strip() for column in (query._on_conflict or 'id').split(',')]
+        written = []
+        for row in rows:
+            prepared = self._prepare_row(query._columns, row, now)
+            if any(column not in prepared for column in conflict):
+                written.extend(self._insert_rows(query, [row], now))
+                continue
+            where = ' AND '.join(f'{_ident(column)} IS ?' for column in conflict)
+            key = [prepared[column] for column in conflict]
+            existing = self._conn.execute(f'SELECT 1 FROM {_ident(query._table)} WHERE {where}', key).fetchone()
+            if existing is None:
+                written.extend(self._insert_rows(query, [row], now))
+                continue
+            if query._ignore_duplicates:
+                continue
+            # 기존 행의 id/created_at 은 유지하고 나머지 컬럼만 갱신 (updated_at 트리거 대응)
+            updates = {column: value for column, value in prepared.items()
+                       if column in row and column not in conflict and column not in ('id', 'created_at')}
+            if 'updated_at' in query._columns:
+                updates['updated_at'] = now
+            if updates:
+                self._conn.execute(
+                    f'UPDATE {_ident(query._table)} SET {", ".join(f"{_ident(column)} = ?" for column in updates)} WHERE {where}',
+                    list(updates.values()) + key,
+                )
+            written.append(prepared)
+        return written
+
+    def _execute(self, query, wait: bool = True):
+        if wait:
+            self._wait_round_trip()
+        action = query._action
+        sent = _payload_size(query._payload) + len(query._table) + sum(len(str(p)) for _, p in query._filters)
+        now = utc_timestamp()
+
+        with self._lock:
+            try:
+                where, params = query._where()
+                count = None
+                if action != 'select':
+                    self._conn.execute('BEGIN')
+
+                if action == 'select':
+                    if query._count:
+                        count = self._conn.execute(f'SELECT COUNT(*) FROM {_ident(query._table)}{where}', params).fetchone()[0]
+                    if query._head:
+                        data = []
+                    else:
+                        selected = query._selected_columns()
+                        rows = self._conn.execute(
+                            f'SELECT {",".join(_ident(column) for column in selected)} FROM {_ident(query._table)}{where}{query._tail()}',
+                            params,
+                        ).fetchall()
+                        data = [self._row_to_dict(query._columns, row) for row in rows]
+
+                elif action in ('insert', 'upsert'):
+                    rows = query._payload if isinstance(query._payload, list) else [query._payload]
+                    if action == 'insert':
+                        written = self._insert_rows(query, rows, now)
+                    else:
+                        written = self._upsert_rows(query, rows, now)
+                    count = len(written) if query._count else None
+                    data = [self._row_to_dict(query._columns, row) for row in written]
+
+                elif action == 'update':
+                    updates = {column: value for column, value in
+                               self._prepare_row(query._columns, query._payload, now).items()
+                               if column in query._payload}
+                    if 'updated_at' in query._columns:
+                        updates['updated_at'] = now
+                    ids = [row[0] for row in self._conn.execute(f'SELECT rowid FROM {_ident(query._table)}{where}', params)]
+                    if ids:
+                        self._conn.execute(
+                            f'UPDATE {_ident(query._table)} SET {", ".join(f"{_ident(column)} = ?" for column in updates)} '
+                            f'WHERE rowid IN ({",".join("?" * len(ids))})',
+                            list(updates.values()) + ids,
+                        )
+                    rows = self._conn.execute(
+                        f'SELECT * FROM {_ident(query._table)} WHERE rowid IN ({",".join("?" * len(ids))})', ids
+                    ).fetchall() if ids else []
+                    data = [self._row_to_dict(query._columns, row) for row in rows]
+                    count = len(data) if query._count else None
+
+                elif action == 'delete':
+                    rows = self._conn.execute(f'SELECT * FROM {_ident(query._table)}{where}', params).fetchall()
+                    self._conn.execute(f'DELETE FROM {_ident(query._table)}{where}', params)
+                    data = [self._row_to_dict(query._columns, row) for row in rows]
+                    count = len(data) if query._count else None
+
+                else:
+                    raise LocalAPIError(f"unsupported action: {action}")
+
+                if self._conn.in_transaction:
+                    self._conn.execute('COMMIT')
+
+            except (sqlite3.Error, LocalAPIError) as e:
+                if self._conn.in_transaction:
+                    self._conn.execute('ROLLBACK')
+                if isinstance(e, LocalAPIError):
+                    raise
+                unique = isinstance(e, sqlite3.IntegrityError) and 'UNIQUE' in str(e)
+                raise LocalAPIError(str(e), '23505' if unique else None) from e
+
+        if action != 'select' and str(getattr(query._returning, 'value', query._returning)) == 'minimal':
+            data = []
+        if query._single:
+            if len(data) != 1:
+                raise LocalAPIError(f"JSON object requested, multiple (or no) rows returned ({len(data)})")
+            data = data[0]
+
+        self.stats.record(action, sent, _payload_size(data))
+        return LocalResponse(data, count)
+
+    def _execute_rpc(self, call, wait: bool = True):
+        if wait:
+            self._wait_round_trip()
+        handler = self._rpcs.get(call._name)
+        if handler is None:
+            raise LocalAPIError(f"Could not find the function public.{call._name} in the schema cache", 'PGRST202')
+        with self._lock:
+            data = handler(self, call._params)
+        self.stats.record(f"rpc:{call._name}", _payload_size(call._params), _payload_size(data))
+        return LocalResponse(data)
+
+    def _exec_sql(self, sql: str):
+        """SQLite 가 이해하는 문장만 하나의 트랜잭션으로 실행하고 PostgreSQL 전용 문장은 건너뜀"""
+        self._conn.execute('BEGIN')
+        try:
+            for statement in split_sql_statements(sql):
+                try:
+                    self._conn.execute('SAVEPOINT stmt')
+                    self._conn.execute(statement)
+                    self._conn.execute('RELEASE stmt')
+                except sqlite3.Error:
+                    self._conn.execute('ROLLBACK TO stmt')
+                    self._conn.execute('RELEASE stmt')
+                    self.skipped_statements.append(statement)
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+        finally:
+            self._columns_cache.clear()
+        return None
+
+    def _events_count_report(self):
+        """events_count_report() 의 GROUPING SETS 결과와 같은 형태의 행 목록"""
+        rows = [{"category": row[0], "month": None, "n": row[1]} for row in
+                self._conn.execute('SELECT category, COUNT(*) FROM events GROUP BY category')]
+        rows += [{"category": None, "month": row[0], "n": row[1]} for row in
+                 self._conn.execute("SELECT substr(date, 1, 7), COUNT(*) FROM events GROUP BY 1")]
+        rows.append({"category": None, "month": None, "n": self._conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]})
+        return rows
+
+    def _archive_events(self, params):
+        """archive_events() (database/migrations/0005_events_archive.sql) 와 같이 한 배치를 한 트랜잭션으로 이동"""
+        after_date, after_id = params.get('after_date'), params.get('after_id')
+        keyset = 'AND (date, id) > (?, ?)' if after_date else ''
+        batch = self._conn.execute(
+            f'SELECT id, date FROM events WHERE date < ? AND recurring IS NULL {keyset} ORDER BY date, id LIMIT ?',
+            [params['cutoff']] + ([after_date, after_id] if after_date else []) + [params.get('batch_size', 1000)],
+        ).fetchall()
+        if not batch:
+            return [{"moved": 0, "last_date": None, "last_id": None}]
+
+        ids = [row['id'] for row in batch]
+        placeholders = ','.join('?' * len(ids))
+        columns = ', '.join(ARCHIVE_COLUMNS)
+        self._conn.execute('BEGIN')
+        try:
+            moved = self._conn.execute(
+                f'INSERT OR REPLACE INTO events_archive ({columns}, archived_at) '
+                f'SELECT {columns}, ? FROM events WHERE id IN ({placeholders})', [utc_timestamp()] + ids).rowcount
+            self._conn.execute(f'DELETE FROM events WHERE id IN ({placeholders})', ids)
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+        return [{"moved": moved, "last_date": batch[-1]['date'], "last_id": batch[-1]['id']}]
+
+    def _update_events(self, changes):
+        """update_events() (database/migrations/0006_events_batch_update.sql) 와 같이 행마다 다른 부분 갱신을 한 트랜잭션으로 처리"""
+        columns = self._table_columns('events')
+        now = utc_timestamp()
+        updated = 0
+        self._conn.execute('BEGIN')
+        try:
+            for change in changes:
+                values = {column: value for column, value in self._prepare_row(columns, change, now).items()
+                          if column in change and column not in ('id', 'created_at', 'updated_at')}
+                values['updated_at'] = now
+                updated += self._conn.execute(
+                    f'UPDATE events SET {", ".join(f"{_ident(column)} = ?" for column in values)} WHERE id = ?',
+                    list(values.values()) + [change['id']]).rowcount
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+        return updated
+
+class AsyncLocalQuery(LocalQuery):
+    """AsyncClient 의 table() 에 대응하는 비동기 쿼리 빌더"""
+
+    async def execute(self):
+        # 지연은 이벤트 루프를 막지 않도록 asyncio.sleep 으로 주입하여 동시 요청이 겹치게 합니다.
+        if self._client.latency > 0:
+            await asyncio.sleep(self._client.latency)
+        return self._client._execute(self, wait=False)
+
+class AsyncLocalRpc(LocalRpc):
+    """AsyncClient 의 rpc() 에 대응하는 비동기 호출 객체"""
+
+    async def execute(self):
+        if self._client.latency > 0:
+            await asyncio.sleep(self._client.latency)
+        return self._client._execute_rpc(self, wait=False)
+
+class AsyncLocalSupabase(LocalSupabase):
+    """supabase AsyncClient 대체 구현 (execute() 가 코루틴)"""
+
+    def table(self, name: str):
+        return AsyncLocalQuery(self, name)
+
+    def rpc(self, name: str, params=None):
+        return AsyncLocalRpc(self, name, params)
+
+def create_local_client(path: str = ':memory:', latency: float = 0.0):
+    """로컬 대체 클라이언트 생성"""
+    return LocalSupabase(path, latency)
+
+def create_async_local_client(path: str = ':memory:', latency: float = 0.0):
+    """로컬 대체 비동기 클라이언트 생성"""
+    return AsyncLocalSupabase(path, latency)
+
+def main():
+    """각 설정 스크립트의 main() 을 로컬 백엔드로 실행하고 왕복 통계 출력"""
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="로컬 백엔드로 설정 스크립트 실행")
+    parser.add_argument('--latency', type=float, default=0.0, help="왕복당 주입할 지연 (초)")
+    parser.add_argument('scripts', nargs='*', default=['setup_database', 'create_tables', 'setup_supabase'])
+    args = parser.parse_args()
+
+    import supabase_client
+
+    results = {}
+    for name in args.scripts:
+        module = importlib.import_module(name)
+        client = create_local_client(latency=args.latency)
+        # 공유 클라이언트를 로컬 백엔드로 교체
+        supabase_client._client = client
+        started = time.perf_counter()
+        module.main()
+        results[name] = dict(client.stats.summary(), seconds=round(time.perf_counter() - started, 4))
+
+    print("\n📊 로컬 백엔드 왕복 통계")
+    print("=" * 60)
+    for name, summary in results.items():
+        print(f"   • {name}: {summary['requests']}회 요청, 송신 {summary['bytes_sent']}B, "
+              f"수신 {summary['bytes_received']}B, {summary['seconds']}초")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 마이그레이션 실행 스크립트
+database/schema.sql 과 database/migrations/NNNN_이름.sql 을 순서대로 적용하고
+적용 이력을 체크섬과 함께 schema_migrations 원장 테이블에 기록합니다.
+
+- 원장 조회 1회 + (적용할 마이그레이션이 있을 때만) exec_sql 1회로 끝납니다.
+- exec_sql 함수 호출은 하나의 트랜잭션이므로 배치 중 하나라도 실패하면 전체가 롤백됩니다.
+- 이미 적용된 마이그레이션 파일이 바뀌면 체크섬 불일치로 중단합니다.
+- PostgreSQL 15 이상이 필요합니다. (0003 의 NULLS NOT DISTINCT 유일 인덱스)
+"""
+
+import hashlib
+import os
+import re
+import sys
+
+from supabase import Client
+
+from supabase_client import get_client
+
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database')
+SCHEMA_PATH = os.path.join(DATABASE_DIR, 'schema.sql')
+MIGRATIONS_DIR = os.path.join(DATABASE_DIR, 'migrations')
+
+# schema.sql 은 기준 마이그레이션 0000 으로 취급합니다.
+BASELINE_VERSION = '0000'
+
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_([a-z0-9_]+)\.sql$')
+
+# 원장 테이블이 없을 때의 오류 코드 (PostgreSQL undefined_table, PostgREST 스키마 캐시에 없는 테이블)
+UNDEFINED_TABLE_CODES = ('42P01', 'PGRST205')
+
+LEDGER_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  checksum TEXT NOT NULL,
+  applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+ALTER TABLE schema_migrations ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Enable read access for all users" ON schema_migrations;
+CREATE POLICY "Enable read access for all users" ON schema_migrations
+    FOR SELECT USING (true);
+"""
+
+def _read_sql(path: str):
+    """SQL 파일 읽기 (줄바꿈 정규화)"""
+    with open(path, encoding='utf-8') as f:
+        return f.read().replace('\r\n', '\n')
+
+def _checksum(sql: str):
+    """마이그레이션 본문 체크섬"""
+    return hashlib.sha256(sql.encode('utf-8')).hexdigest()
+
+def load_migrations():
+    """적용 순서대로 마이그레이션 목록 반환"""
+    sql = _read_sql(SCHEMA_PATH)
+    migrations = [{"version": BASELINE_VERSION, "name": "schema", "sql": sql, "checksum": _checksum(sql)}]
+
+    if os.path.isdir(MIGRATIONS_DIR):
+        for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+            match = MIGRATION_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            sql = _read_sql(os.path.join(MIGRATIONS_DIR, filename))
+            migrations.append({"version": match.group(1), "name": match.group(2),
+                               "sql": sql, "checksum": _checksum(sql)})
+
+    versions = [migration["version"] for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"중복된 마이그레이션 버전이 있습니다: {versions}")
+    return migrations
+
+def fetch_applied(supabase: Client):
+    """원장에서 적용된 버전과 체크섬 조회 (원장이 없으면 빈 dict)
+
+    권한 오류처럼 원장이 있는데 읽지 못한 경우에는 모든 마이그레이션을 다시 계획하지 않도록 예외를 그대로 던집니다.
+    """
+    try:
+        result = supabase.table('schema_migrations').select('version,checksum').execute()
+    except Exception as e:
+        if str(getattr(e, 'code', None)) in UNDEFINED_TABLE_CODES:
+            return {}
+        raise
+    return {row['version']: row['checksum'] for row in result.data or []}
+
+def _quote(value: str):
+    """SQL 문자열 리터럴"""
+    return "'" + value.replace("'", "''") + "'"
+
+def build_batch(pending):
+    """적용할 마이그레이션과 원장 기록을 하나의 SQL 배치로 결합"""
+    parts = [LEDGER_SQL]
+    for migration in pending:
+        parts.append(f"-- migration {migration['version']}_{migration['name']}\n{migration['sql'].rstrip()}\n")
+        parts.append(
+            "INSERT INTO schema_migrations (version, name, checksum) VALUES "
+            f"({_quote(migration['version'])}, {_quote(migration['name'])}, {_quote(migration['checksum'])});\n"
+        )
+    return "\n".join(parts)
+
+def migrate(supabase: Client, dry_run: bool = False):
+    """대기 중인 마이그레이션 적용
+
+    반환값: 성공 여부 (적용할 것이 없어도 True)
+    """
+    migrations = load_migrations()
+    applied = fetch_applied(supabase)
+
+    for migration in migrations:
+        checksum = applied.get(migration["version"])
+        if checksum is not None and checksum != migration["checksum"]:
+            print(f"❌ 이미 적용된 마이그레이션 {migration['version']}_{migration['name']} 의 내용이 변경되었습니다.")
+            print("   적용된 파일은 수정하지 말고 새 마이그레이션을 추가하세요.")
+            return False
+
+    pending = [migration for migration in migrations if migration["version"] not in applied]
+    if not pending:
+        print(f"✅ 모든 마이그레이션이 적용되어 있습니다. ({len(migrations)}개)")
+        return True
+
+    print(f"🚀 {len(pending)}개의 마이그레이션을 하나의 트랜잭션으로 적용합니다...")
+    for migration in pending:
+        print(f"   - {migration['version']}_{migration['name']}")
+
+    if dry_run:
+        print("ℹ️ dry-run: 실제로 적용하지 않았습니다.")
+        return True
+
+    try:
+        supabase.rpc('exec_sql', {'sql': build_batch(pending)}).execute()
+    except Exception as e:
+        print(f"❌ 마이그레이션 실패 (전체 롤백): {str(e)}")
+        return False
+
+    print(f"✅ 마이그레이션 {len(pending)}개 적용 완료")
+    return True
+
+def main():
+    """메인 실행 함수"""
+    print("🏛️ 나주교회 캘린더 마이그레이션")
+    print("=" * 60)
+    if not migrate(get_client(), dry_run='--dry-run' in sys.argv):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
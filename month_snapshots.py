@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 월별 이벤트 스냅샷 생성 스크립트
+월 보기에서 정적으로 내려줄 수 있도록 public/snapshots/events/YYYY-MM.json 을 만듭니다.
+각 파일은 날짜별로 묶이고 (종일 일정, 시작 시간, 제목) 순으로 정렬된 Event 형태(camelCase)의 목록입니다.
+
+updated_at 워터마크 이후 바뀐 행과 events_tombstones 의 삭제 기록으로 영향을 받은 달만 다시 만듭니다.
+상태 파일에 스냅샷에 들어간 행의 (id, 월, updated_at) 을 보관해 다른 달로 옮겨진 일정의 이전 달을 찾고,
+워터마크 겹침 구간에서 다시 읽힌 행 중 이미 반영된 것은 건너뜁니다.
+
+사용 예:
+    python month_snapshots.py                 # 바뀐 달만 다시 생성
+    python month_snapshots.py --full          # 전체 다시 생성
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import date
+
+from supabase import Client
+
+from event_constants import EVENT_COLUMNS
+from event_reader import iter_events
+from event_watermarks import (iter_change_pages, latest_tombstone, normalize_timestamp, utc_timestamp,
+                              warn_tombstones_unavailable)
+from supabase_client import get_client
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'snapshots', 'events')
+DEFAULT_STATE = '.snapshot_state.sqlite'
+
+STATE_SQL = """
+CREATE TABLE IF NOT EXISTS snapshot_rows (
+  id TEXT PRIMARY KEY,
+  month TEXT NOT NULL,
+  updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshot_rows_month ON snapshot_rows(month);
+CREATE TABLE IF NOT EXISTS snapshot_state (
+  name TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+# events 컬럼 -> 스냅샷(Event 타입) 키
+SNAPSHOT_KEYS = {
+    'id': 'id',
+    'title': 'title',
+    'start_time': 'startTime',
+    'end_time': 'endTime',
+    'category': 'category',
+    'description': 'description',
+    'location': 'location',
+    'is_all_day': 'isAllDay',
+    'reminder': 'reminder',
+    'recurring': 'recurring',
+    'created_at': 'createdAt',
+    'updated_at': 'updatedAt',
+}
+
+def open_state(path: str = DEFAULT_STATE):
+    """스냅샷 상태 SQLite 연결"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(STATE_SQL)
+    return conn
+
+def _get_state(conn, name: str):
+    row = conn.execute('SELECT value FROM snapshot_state WHERE name = ?', (name,)).fetchone()
+    return row[0] if row else None
+
+def _set_state(conn, name: str, value: str):
+    conn.execute('INSERT OR REPLACE INTO snapshot_state (name, value) VALUES (?, ?)', (name, value))
+
+def month_range(month: str):
+    """'YYYY-MM' 의 첫날과 다음 달 첫날"""
+    year, number = int(month[:4]), int(month[5:7])
+    return date(year, number, 1).isoformat(), date(year + number // 12, number % 12 + 1, 1).isoformat()
+
+def _sort_key(row):
+    """같은 날 안에서 종일 일정, 시작 시간, 제목 순"""
+    return (not row.get('is_all_day'), row.get('start_time') or '', row.get('title') or '')
+
+def build_snapshot(month: str, rows):
+    """한 달치 행을 날짜별로 묶인 스냅샷 dict 로 변환 (값이 없는 키는 생략)"""
+    days = {}
+    for row in sorted(rows, key=lambda row: (row['date'],) + _sort_key(row)):
+        event = {key: row[column] for column, key in SNAPSHOT_KEYS.items() if row.get(column) is not None}
+        days.setdefault(row['date'], []).append(event)
+    return {"month": month, "count": len(rows), "days": days}
+
+def _write_json(path: str, data):
+    """원자적으로 JSON 파일 저장 (작은 크기를 위해 공백 없이)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def write_month(conn, output_dir: str, month: str, rows):
+    """월 스냅샷 파일과 id -> 월 대응 갱신 (일정이 없는 달은 파일 삭제)"""
+    path = os.path.join(output_dir, f"{month}.json")
+    if rows:
+        _write_json(path, build_snapshot(month, rows))
+    elif os.path.exists(path):
+        os.remove(path)
+
+    conn.execute('BEGIN')
+    conn.execute('DELETE FROM snapshot_rows WHERE month = ?', (month,))
+    conn.executemany('INSERT OR REPLACE INTO snapshot_rows (id, month, updated_at) VALUES (?, ?, ?)',
+                     [(row['id'], month, normalize_timestamp(row['updated_at'])) for row in rows])
+    conn.execute('COMMIT')
+
+def write_index(conn, output_dir: str):
+    """달별 일정 수 목록(index.json) 저장"""
+    months = {month: count for month, count in
+              conn.execute('SELECT month, COUNT(*) FROM snapshot_rows GROUP BY month ORDER BY month')}
+    _write_json(os.path.join(output_dir, 'index.json'), {"generatedAt": utc_timestamp(), "months": months})
+
+def _stored_rows(conn, ids):
+    """스냅샷에 들어간 행의 id -> (월, updated_at)"""
+    stored = {}
+    for offset in range(0, len(ids), 500):
+        batch = ids[offset:offset + 500]
+        for row_id, month, updated_at in conn.execute(
+                f'SELECT id, month, updated_at FROM snapshot_rows WHERE id IN ({",".join("?" * len(batch))})', batch):
+            stored[row_id] = (month, updated_at)
+    return stored
+
+def changed_months(supabase: Client, conn):
+    """워터마크 이후 바뀌거나 삭제된 행이 속한 달 (옮겨지기 전 달 포함)
+
+    반환값: (달 집합, 새 updated_at 워터마크, 새 deleted_at 워터마크)
+    """
+    months = set()
+    events_watermark = _get_state(conn, 'events_watermark')
+    for page in iter_change_pages(supabase, 'events', ['id', 'date'], events_watermark):
+        stored = _stored_rows(conn, [row['id'] for row in page])
+        for row in page:
+            month, updated_at = row['date'][:7], normalize_timestamp(row['updated_at'])
+            if stored.get(row['id']) == (month, updated_at):
+                continue
+            months.add(month)
+            # 다른 달에서 옮겨 온 일정이면 이전 달도 다시 만들어야 합니다.
+            if row['id'] in stored:
+                months.add(stored[row['id']][0])
+        events_watermark = normalize_timestamp(page[-1]['updated_at'])
+
+    tombstones_watermark = _get_state(conn, 'tombstones_watermark')
+    try:
+        for page in iter_change_pages(supabase, 'events_tombstones', ['id'], tombstones_watermark):
+            months.update(month for month, _ in _stored_rows(conn, [row['id'] for row in page]).values())
+            tombstones_watermark = normalize_timestamp(page[-1]['deleted_at'])
+    except Exception as e:
+        warn_tombstones_unavailable(e, "삭제된 일정은 --full 로 반영해야 합니다")
+
+    return months, events_watermark, tombstones_watermark
+
+def rebuild_all(supabase: Client, conn, output_dir: str):
+    """전체 테이블을 한 번 순회하며 모든 달 스냅샷 생성
+
+    (date, id) 키셋 순회라 한 달의 행은 연속해서 오므로, 다음 달 행이 나오면 그 달을 바로 씁니다.
+    메모리에는 한 달치 행만 둡니다.
+    """
+    written = set()
+    month, rows = None, []
+    watermark = None
+    for row in iter_events(supabase, EVENT_COLUMNS):
+        if row['date'][:7] != month:
+            if month is not None:
+                write_month(conn, output_dir, month, rows)
+                written.add(month)
+            month, rows = row['date'][:7], []
+        rows.append(row)
+        stamp = normalize_timestamp(row['updated_at'])
+        watermark = max(watermark or stamp, stamp)
+    if month is not None:
+        write_month(conn, output_dir, month, rows)
+        written.add(month)
+
+    stale = {row[0] for row in conn.execute('SELECT DISTINCT month FROM snapshot_rows')} - written
+    for month in sorted(stale):
+        write_month(conn, output_dir, month, [])
+    return len(written) + len(stale), watermark
+
+def build_snapshots(supabase: Client, conn, output_dir: str = DEFAULT_OUTPUT_DIR, full: bool = False):
+    """스냅샷 생성 (처음이거나 full=True 이면 전체, 아니면 바뀐 달만)
+
+    반환값: 다시 만든 달 수
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    if full or _get_state(conn, 'events_watermark') is None:
+        # 전체 생성 전에 삭제 기록 워터마크를 먼저 잡아 두면 생성 중 삭제도 다음 실행에 반영됩니다.
+        tombstones_watermark = latest_tombstone(supabase)
+        rebuilt, watermark = rebuild_all(supabase, conn, output_dir)
+        if watermark:
+            _set_state(conn, 'events_watermark', watermark)
+        if tombstones_watermark:
+            _set_state(conn, 'tombstones_watermark', tombstones_watermark)
+        write_index(conn, output_dir)
+        return rebuilt
+
+    months, events_watermark, tombstones_watermark = changed_months(supabase, conn)
+    for month in sorted(months):
+        start, end = month_range(month)
+        rows = list(iter_events(supabase, EVENT_COLUMNS, filters=[('gte', 'date', start), ('lt', 'date', end)]))
+        write_month(conn, output_dir, month, rows)
+
+    # 워터마크는 달을 모두 다시 만든 뒤에 저장해, 중간에 실패하면 다음 실행에서 같은 달을 다시 만듭니다.
+    if events_watermark:
+        _set_state(conn, 'events_watermark', events_watermark)
+    if tombstones_watermark:
+        _set_state(conn, 'tombstones_watermark', tombstones_watermark)
+    if months:
+        write_index(conn, output_dir)
+    return len(months)
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 월별 이벤트 스냅샷 생성")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="스냅샷 디렉터리")
+    parser.add_argument('--state', default=DEFAULT_STATE, help="상태 SQLite 파일 경로")
+    parser.add_argument('--full', action='store_true', help="전체 다시 생성")
+    args = parser.parse_args()
+
+    print("🏛️ 나주교회 캘린더 월별 스냅샷 생성")
+    print("=" * 60)
+    started = time.perf_counter()
+    conn = open_state(args.state)
+    rebuilt = build_snapshots(get_client(), conn, args.output, args.full)
+    conn.close()
+
+    if rebuilt:
+        print(f"✅ {rebuilt}개 달의 스냅샷을 다시 만들었습니다. ({time.perf_counter() - started:.2f}초)")
+    else:
+        print(f"✅ 바뀐 달이 없습니다. ({time.perf_counter() - started:.2f}초)")
+    print(f"💾 {args.output}")
+
+if __name__ == "__main__":
+    main()
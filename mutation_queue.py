@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 쓰기 변경 큐
+정리/수정 스크립트가 변경마다 요청을 한 번씩 보내는 대신, 삽입/수정/삭제를 모아 두었다가 묶어서 보냅니다.
+
+- 같은 id 의 수정은 하나로 합치고, 큐 안에서 삽입한 행의 수정은 삽입 행에 합치며, 삽입 후 삭제는 둘 다 취소합니다.
+  단 이미 반영되었을 수 있는 삽입(저널에서 재생한 삽입, 실패한 flush 에 남은 삽입, 수정 대기 중인 id 의 삽입)은
+  취소하지 않고 삭제를 보냅니다.
+  (insert 는 새 행용입니다. 큐가 모르는 기존 id 를 넣으면 upsert 로 덮어쓰지만, 이어서 삭제하면 둘 다 취소되어 남습니다.)
+- 대기 중인 일정이 max_batch 개가 되거나 가장 오래된 변경이 max_delay 초를 넘으면 flush 합니다.
+  백그라운드 스레드는 없고 enqueue/poll() 할 때 확인합니다.
+- flush 순서: 삭제(in_ 필터) -> 수정(update_events RPC, 없으면 같은 값끼리 update().in_()) -> 삽입(id bulk upsert)
+  삭제가 먼저라 지운 일정의 자연 키(date, title, start_time)를 같은 flush 의 삽입이 쓸 수 있습니다.
+- 변경은 큐에 넣기 전에 저널 파일(JSONL)에 추가하고 flush 가 끝나거나 서로 취소되어 대기 변경이 없어지면 비웁니다.
+  큐를 다시 열면 저널을 재생하므로 중단되어도 대기 중인 변경을 잃지 않습니다. 재생하면 이미 반영된 변경이 다시 나갈 수
+  있지만 삽입은 id upsert, 수정은 같은 값 덮어쓰기, 삭제는 in_ 라 모두 멱등입니다.
+- 삽입이 자연 키 유일 인덱스(0003)와 충돌(23505)하면 그 묶음을 반으로 나눠 다시 보내 충돌한 행만 골라 냅니다.
+  골라 낸 행은 rejected 에 남기고 큐에서 빼므로, 한 행 때문에 이후 enqueue 가 계속 실패하지 않습니다.
+- 삽입할 행에 id 가 없으면 uuid4 를 붙입니다. (이후 수정/삭제와 재생이 같은 행을 가리키도록)
+- 그 밖의 오류로 flush 가 실패하면 대기 변경과 저널은 그대로 남고 예외를 다시 던집니다.
+
+사용 예:
+    with MutationQueue(supabase) as queue:
+        queue.update(event_id, {"location": "교육관"})
+        queue.delete(other_id)
+
+    python mutation_queue.py --flush                   # 남아 있는 저널을 재생해 반영
+    python mutation_queue.py --benchmark 20000 --latency 0.02
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from supabase import Client
+
+from supabase_client import get_client
+
+DEFAULT_JOURNAL = '.mutation_journal.jsonl'
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_DELAY = 2.0
+
+# in_ 필터는 URL 에 들어가므로 요청 하나에 담는 id 수를 제한합니다.
+DELETE_CHUNK = 200
+# update_events RPC / upsert 요청 하나에 담는 행 수
+WRITE_CHUNK = 500
+
+BENCHMARK_SEED = 42
+
+class MutationQueue:
+    """삽입/수정/삭제를 id 별로 합쳐 두었다가 묶어서 보내는 큐
+
+    pending[id] = [종류('insert'/'update'/'delete'), 행 또는 바꿀 값, 삽입 전에 삭제가 필요한지,
+                   이미 DB 에 있을 수 있는지(있으면 이후 삭제를 취소하지 않음)]
+    """
+
+    def __init__(self, supabase: Client, journal_path: str = DEFAULT_JOURNAL, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay: float = DEFAULT_MAX_DELAY, fsync: bool = True):
+        self.supabase = supabase
+        self.journal_path = journal_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self.pending = {}
+        self.oldest = None
+        self.use_rpc = True
+        # 자연 키 충돌로 넣지 못한 삽입 행
+        self.rejected = []
+        self.stats = {"enqueued": 0, "coalesced": 0, "cancelled": 0, "replayed": 0, "flushes": 0, "requests": 0,
+                      "deleted": 0, "updated": 0, "inserted": 0, "rejected": 0}
+        self._replay()
+        self._journal = open(journal_path, 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 예외로 빠져나가면 flush 하지 않고 저널에 남겨 둡니다.
+        if exc_type is None:
+            self.flush()
+        self.close()
+        return False
+
+    def _replay(self):
+        """저널에 남은 변경을 다시 큐에 넣음 (쓰다 만 마지막 줄은 잘라 냄)"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb+') as f:
+            data = f.read()
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                # 이어 쓰는 다음 변경이 깨진 줄에 붙지 않도록 마지막 완전한 줄까지만 남깁니다.
+                print(f"⚠️ 저널 끝의 쓰다 만 줄을 버립니다: {data[complete:][:80]!r}")
+                f.truncate(complete)
+        for line in data[:complete].decode('utf-8').splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ 저널의 손상된 줄을 건너뜁니다: {line[:80]!r}")
+                continue
+            # 저널의 삽입은 flush 가 쓰기 뒤 저널을 비우기 전에 중단되었다면 이미 반영되어 있습니다.
+            self._coalesce(entry['op'], entry['id'], entry.get('values'), applied=True)
+            self.stats["replayed"] += 1
+        if self.pending:
+            self.oldest = time.monotonic()
+
+    def _coalesce(self, op: str, event_id: str, values, applied: bool = False):
+        """변경 하나를 pending 에 합침 (잘못된 순서면 ValueError, pending 은 바뀌지 않음)
+
+        applied: 이 변경이 이미 DB 에 반영되었을 수 있음 (저널 재생)
+        """
+        previous = self.pending.get(event_id)
+        kind = previous[0] if previous else None
+        delete_first = bool(previous) and (kind == 'delete' or previous[2])
+        # 수정 대기 중인 id 는 DB 에 있는 행입니다.
+        exists = applied or (bool(previous) and (kind == 'update' or previous[3]))
+
+        if op == 'insert':
+            entry = ['insert', dict(values, id=event_id), delete_first, exists]
+        elif op == 'update':
+            if kind == 'delete':
+                raise ValueError(f"삭제 대기 중인 일정은 수정할 수 없습니다: {event_id}")
+            merged = dict(previous[1], **values) if previous else dict(values)
+            entry = [kind or 'update', merged, delete_first, exists]
+        elif op == 'delete':
+            if kind == 'insert' and not delete_first and not exists:
+                del self.pending[event_id]
+                self.stats["cancelled"] += 1
+                return
+            entry = ['delete', None, False, False]
+        else:
+            raise ValueError(f"알 수 없는 변경 종류: {op}")
+
+        if previous:
+            self.stats["coalesced"] += 1
+        self.pending[event_id] = entry
+
+    def _enqueue(self, op: str, event_id: str, values=None):
+        previous = self.pending.get(event_id)
+        if op == 'update' and previous and previous[0] == 'delete':
+            raise ValueError(f"삭제 대기 중인 일정은 수정할 수 없습니다: {event_id}")
+        # 저널에 먼저 기록해야 큐에 들어간 변경이 중단으로 사라지지 않습니다.
+        self._journal.write(json.dumps({"op": op, "id": event_id, "values": values}, ensure_ascii=False,
+                                       default=str) + '\n')
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self._coalesce(op, event_id, values)
+        self.stats["enqueued"] += 1
+        if not self.pending:
+            # 모두 서로 취소되었으면 저널에 남길 변경이 없습니다. (남기면 열 때마다 재생되고 저널만 커집니다.)
+            self._truncate_journal()
+            self.oldest = None
+            return
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+        self.poll()
+
+    def insert(self, row):
+        """새 행 삽입 예약 (반환값: 행 id)"""
+        event_id = row.get('id') or str(uuid.uuid4())
+        self._enqueue('insert', event_id, {key: value for key, value in row.items() if key != 'id'})
+        return event_id
+
+    def update(self, event_id: str, changes):
+        """부분 갱신 예약 (같은 id 의 이전 갱신/삽입에 합쳐짐)"""
+        self._enqueue('update', event_id, dict(changes))
+
+    def delete(self, event_id: str):
+        """삭제 예약 (큐 안에서 삽입한 행이면 삽입과 함께 취소)"""
+        self._enqueue('delete', event_id)
+
+    def poll(self):
+        """크기/시간 기준을 넘었으면 flush (반환값: 보낸 요청 수)"""
+        if not self.pending:
+            return 0
+        if len(self.pending) >= self.max_batch or time.monotonic() - self.oldest >= self.max_delay:
+            return self.flush()
+        return 0
+
+    def _delete_ids(self, ids):
+        for offset in range(0, len(ids), DELETE_CHUNK):
+            chunk = ids[offset:offset + DELETE_CHUNK]
+            self.supabase.table('events').delete(returning='minimal').in_('id', chunk).execute()
+            self.stats["requests"] += 1
+
+    def _update_rows(self, changes):
+        """부분 갱신 목록 반영: update_events RPC 로 WRITE_CHUNK 개씩, RPC 가 없으면 같은 값끼리 update().in_()"""
+        offset = 0
+        while self.use_rpc and offset < len(changes):
+            try:
+                self.supabase.rpc('update_events', {"changes": changes[offset:offset + WRITE_CHUNK]}).execute()
+            except Exception as e:
+                if offset:
+                    raise
+                print(f"ℹ️ update_events RPC를 사용할 수 없어 같은 값끼리 묶어 갱신합니다: {str(e)}")
+                self.use_rpc = False
+                break
+            self.stats["requests"] += 1
+            offset += WRITE_CHUNK
+        if self.use_rpc:
+            return
+
+        groups = {}
+        for change in changes:
+            values = {key: value for key, value in change.items() if key != 'id'}
+            key = json.dumps(values, sort_keys=True, default=str)
+            groups.setdefault(key, (values, []))[1].append(change['id'])
+        for values, ids in groups.values():
+            for offset in range(0, len(ids), DELETE_CHUNK):
+                self.supabase.table('events').update(values, returning='minimal').in_(
+                    'id', ids[offset:offset + DELETE_CHUNK]).execute()
+                self.stats["requests"] += 1
+
+    def _upsert_chunk(self, rows):
+        """한 묶음 upsert, 자연 키 충돌이면 반으로 나눠 다시 보냄 (반환값: 충돌한 행 목록)"""
+        try:
+            self.supabase.table('events').upsert(rows, on_conflict='id', returning='minimal').execute()
+            return []
+        except Exception as e:
+            if not _is_unique_violation(e):
+                raise
+            if len(rows) == 1:
+                return rows
+        finally:
+            self.stats["requests"] += 1
+        middle = len(rows) // 2
+        return self._upsert_chunk(rows[:middle]) + self._upsert_chunk(rows[middle:])
+
+    def _upsert_rows(self, rows):
+        """삽입 행을 id 기준 bulk upsert (빠진 컬럼이 NULL 로 채워지지 않도록 컬럼 구성이 같은 행끼리)
+
+        반환값: 자연 키 충돌로 넣지 못한 행 목록
+        """
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        rejected = []
+        for group in groups.values():
+            for offset in range(0, len(group), WRITE_CHUNK):
+                rejected += self._upsert_chunk(group[offset:offset + WRITE_CHUNK])
+        return rejected
+
+    def _truncate_journal(self):
+        if not self._journal.tell():
+            return
+        self._journal.seek(0)
+        self._journal.truncate()
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def flush(self):
+        """대기 중인 변경을 모두 보내고 저널 비우기
+
+        반환값: 보낸 요청 수
+        """
+        if not self.pending:
+            self._truncate_journal()
+            return 0
+        requests = self.stats["requests"]
+        deletes = [event_id for event_id, entry in self.pending.items() if entry[0] == 'delete' or entry[2]]
+        updates = [dict(entry[1], id=event_id) for event_id, entry in self.pending.items() if entry[0] == 'update']
+        inserts = [entry[1] for entry in self.pending.values() if entry[0] == 'insert']
+
+        try:
+            self._delete_ids(deletes)
+            self._update_rows(updates)
+            rejected = self._upsert_rows(inserts)
+        except Exception:
+            # 앞 묶음의 삽입은 이미 들어갔을 수 있으므로 이후 삭제가 취소되지 않게 표시합니다.
+            for entry in self.pending.values():
+                if entry[0] == 'insert':
+                    entry[3] = True
+            raise
+
+        self._truncate_journal()
+        self.pending.clear()
+        self.oldest = None
+        for row in rejected:
+            print(f"⚠️ 자연 키가 겹쳐 삽입하지 못했습니다: {row['id']} "
+                  f"({row.get('date')} {row.get('start_time') or '종일'} {row.get('title')})")
+        self.rejected += rejected
+        self.stats["flushes"] += 1
+        self.stats["deleted"] += len(deletes)
+        self.stats["updated"] += len(updates)
+        self.stats["inserted"] += len(inserts) - len(rejected)
+        self.stats["rejected"] += len(rejected)
+        return self.stats["requests"] - requests
+
+    def close(self):
+        """저널 파일 닫기 (대기 중인 변경은 저널에 남아 다음에 큐를 열 때 재생됨)"""
+        self._journal.close()
+
+def _is_unique_violation(error):
+    """유일 인덱스 충돌(SQLSTATE 23505)인지"""
+    return str(getattr(error, 'code', None)) == '23505'
+
+def apply_direct(supabase: Client, operations):
+    """비교 기준: 변경마다 요청 한 번 (EventService 와 같은 방식)"""
+    for op, event_id, values in operations:
+        if op == 'insert':
+            supabase.table('events').insert(dict(values, id=event_id), returning='minimal').execute()
+        elif op == 'update':
+            supabase.table('events').update(values, returning='minimal').eq('id', event_id).execute()
+        else:
+            supabase.table('events').delete(returning='minimal').eq('id', event_id).execute()
+
+def apply_queued(queue: MutationQueue, operations):
+    for op, event_id, values in operations:
+        if op == 'insert':
+            queue.insert(dict(values, id=event_id))
+        elif op == 'update':
+            queue.update(event_id, values)
+        else:
+            queue.delete(event_id)
+
+def _edit_job(ids, count: int, seed: int = BENCHMARK_SEED):
+    """벤치마크용 편집 작업: 자주 고치는 일정에 몰린 수정, 삽입(일부는 곧 삭제), 기존 일정 삭제"""
+    from seed_events import generate_chunk
+
+    rng = random.Random(seed)
+    template = generate_chunk(seed, 0, 1, 1)[0]
+    hot = ids[:max(len(ids) // 10, 1)]
+    inserted = []
+    deleted = set()
+    operations = []
+    for index in range(count):
+        roll = rng.random()
+        if roll < 0.55:
+            if inserted and rng.random() < 0.1:
+                event_id = rng.choice(inserted)
+            else:
+                event_id = rng.choice(hot if rng.random() < 0.7 else ids)
+            if event_id in deleted:
+                continue
+            field, value = rng.choice([('location', rng.choice(['본당', '교육관', '기도실'])),
+                                       ('reminder', rng.choice([None, 10, 30, 60])),
+                                       ('description', f"수정 {index}")])
+            operations.append(('update', event_id, {field: value}))
+        elif roll < 0.75:
+            event_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            operations.append(('insert', event_id, dict(template, title=f"편집 작업 일정 #{index}")))
+            inserted.append(event_id)
+        elif roll < 0.85 and inserted:
+            operations.append(('delete', inserted.pop(rng.randrange(len(inserted))), None))
+        else:
+            event_id = rng.choice(ids)
+            if event_id in deleted:
+                continue
+            deleted.add(event_id)
+            operations.append(('delete', event_id, None))
+    return operations
+
+def _snapshot(supabase):
+    return supabase.sql('SELECT id, title, date, start_time, end_time, category, description, location, is_all_day, '
+                        'reminder, recurring FROM events ORDER BY id')
+
+def benchmark(rows: int, operations: int, latency: float, max_batch: int = DEFAULT_MAX_BATCH):
+    """같은 데이터의 로컬 백엔드 두 개에 같은 편집 작업을 변경당 요청/큐로 적용해 비교"""
+    from local_backend import create_local_client
+    from seed_events import generate_chunk
+
+    direct = create_local_client(latency=latency)
+    queued = create_local_client(latency=latency)
+    seed_rows = [dict(row, id=str(uuid.UUID(int=random.Random(index).getrandbits(128), version=4)))
+                 for index, row in enumerate(generate_chunk(BENCHMARK_SEED, 0, rows, rows))]
+    for client in (direct, queued):
+        client.table('events').insert(seed_rows, returning='minimal').execute()
+        client.stats.reset()
+    job = _edit_job([row['id'] for row in seed_rows], operations)
+
+    started = time.perf_counter()
+    apply_direct(direct, job)
+    direct_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        with MutationQueue(queued, os.path.join(directory, 'journal.jsonl'), max_batch=max_batch) as queue:
+            apply_queued(queue, job)
+        queued_seconds = time.perf_counter() - started
+
+    return {
+        "operations": len(job),
+        "direct_requests": direct.stats.requests,
+        "direct_seconds": direct_seconds,
+        "queued_requests": queued.stats.requests,
+        "queued_seconds": queued_seconds,
+        "stats": queue.stats,
+        "same": _snapshot(direct) == _snapshot(queued),
+    }
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 쓰기 변경 큐")
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL, help="저널 파일 경로")
+    parser.add_argument('--flush', action='store_true', help="저널에 남은 변경을 재생해 반영")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="로컬 백엔드에서 변경 N 개로 요청당 방식과 비교")
+    parser.add_argument('--rows', type=int, default=10000, help="벤치마크 기존 행 수")
+    parser.add_argument('--latency', type=float, default=0.005, help="벤치마크 왕복당 주입할 지연 (초)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="flush 기준 대기 일정 수")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        result = benchmark(args.rows, args.benchmark, args.latency, args.max_batch)
+        stats = result['stats']
+        print(f"📊 변경 {result['operations']:,}개 (기존 {args.rows:,}행, 왕복 지연 {args.latency * 1000:.0f}ms)")
+        print(f"   변경마다 요청: {result['direct_requests']:,}회, {result['direct_seconds']:.2f}초")
+        print(f"   변경 큐:      {result['queued_requests']:,}회, {result['queued_seconds']:.2f}초 "
+              f"(flush {stats['flushes']}회, 합침 {stats['coalesced']:,}, 삽입 후 삭제 취소 {stats['cancelled']:,})")
+        print(f"   결과 일치: {'✅' if result['same'] else '❌'}")
+        return
+
+    if not args.flush:
+        parser.error("--flush 또는 --benchmark 가 필요합니다.")
+    queue = MutationQueue(get_client(), args.journal)
+    pending = len(queue.pending)
+    try:
+        requests = queue.flush()
+    finally:
+        queue.close()
+    print(f"✅ 저널의 변경 {queue.stats['replayed']:,}개 -> 일정 {pending:,}개를 요청 {requests:,}회로 반영했습니다.")
+    if queue.rejected:
+        print(f"⚠️ 자연 키가 겹친 삽입 {len(queue.rejected):,}개는 반영하지 않았습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 통합 명령줄 도구
+하위 명령마다 필요한 모듈만 실행 시점에 import 합니다.
+
+- check: supabase 패키지 없이 표준 라이브러리(urllib)로 PostgREST 에 직접 요청해 연결과 events 행 수를 확인합니다.
+  supabase 클라이언트(auth, realtime, storage, postgrest)를 불러오지 않아 cron 상태 확인의 시작 시간이 짧습니다.
+  events HEAD 요청 한 번이 연결 확인을 겸합니다.
+- provision: setup_database.py (미적용 마이그레이션 + 샘플 데이터)
+- seed: seed_events.py (나머지 인자를 그대로 전달)
+- verify: 서버 집계 한 번으로 검증 리포트 출력
+
+모든 하위 명령은 성공하면 종료 코드 0, 실패하면 1 을 돌려주므로 cron 에서 실패를 감지할 수 있습니다.
+
+사용 예:
+    python naju.py check
+    python naju.py check --json --timeout 5
+    python naju.py provision
+    python naju.py seed --rows 100000 --concurrency 8
+    python naju.py verify
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from supabase_config import LOCAL_DB_PATH, SUPABASE_ANON_KEY, SUPABASE_URL
+
+DEFAULT_CHECK_TIMEOUT = 10.0
+COUNT_METHODS = ('exact', 'planned', 'estimated')
+
+def _rest_request(method: str, path: str, headers=None, body=None, timeout: float = DEFAULT_CHECK_TIMEOUT):
+    """PostgREST 요청 한 번 (urllib)
+
+    반환값: (HTTP 상태, 응답 헤더 dict, 본문 바이트)
+    """
+    from urllib import error, request
+
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = request.Request(f"{SUPABASE_URL.rstrip('/')}/rest/v1/{path}", data=data, method=method, headers={
+        'apikey': SUPABASE_ANON_KEY,
+        'Authorization': f'Bearer {SUPABASE_ANON_KEY}',
+        'Content-Type': 'application/json',
+        **(headers or {}),
+    })
+    try:
+        with request.urlopen(req, timeout=timeout) as response:
+            return response.status, dict(response.headers), response.read()
+    except error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+def _parse_count(content_range: str):
+    """Content-Range '0-0/123' 또는 '*/123' 에서 전체 행 수"""
+    total = (content_range or '').rsplit('/', 1)[-1]
+    return int(total) if total.isdigit() else None
+
+def check_remote(count_method: str = 'exact', timeout: float = DEFAULT_CHECK_TIMEOUT):
+    """원격 상태 확인: events 행 수 (HEAD 요청이라 행은 받지 않음)"""
+    result = {"backend": SUPABASE_URL, "ok": False}
+
+    started = time.perf_counter()
+    status, headers, _ = _rest_request('HEAD', 'events?select=id', headers={'Prefer': f'count={count_method}'},
+                                       timeout=timeout)
+    result["count_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if status >= 300:
+        result["error"] = f"events 조회 실패 (HTTP {status})"
+        return result
+    result["events"] = _parse_count(headers.get('Content-Range') or headers.get('content-range'))
+    result["ok"] = True
+    return result
+
+def check_local(path: str):
+    """로컬 대체 백엔드(NAJU_LOCAL_DB) 상태 확인"""
+    from local_backend import create_local_client
+
+    result = {"backend": f"local:{path}", "ok": False}
+    client = create_local_client(path)
+    try:
+        started = time.perf_counter()
+        result["events"] = client.table('events').select('id', count='exact', head=True).execute().count
+        result["count_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["ok"] = True
+    finally:
+        client.close()
+    return result
+
+def run_check(args):
+    started = time.perf_counter()
+    try:
+        result = check_local(LOCAL_DB_PATH) if LOCAL_DB_PATH else check_remote(args.count, args.timeout)
+    except Exception as e:
+        result = {"backend": LOCAL_DB_PATH or SUPABASE_URL, "ok": False, "error": str(e)}
+    result["seconds"] = round(time.perf_counter() - started, 3)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    elif result["ok"]:
+        events = f"{result['events']:,}개" if result.get('events') is not None else "알 수 없음"
+        print(f"✅ 연결 정상: events {events} ({result['count_ms']}ms)")
+    else:
+        print(f"❌ 상태 확인 실패: {result.get('error')}")
+    return 0 if result["ok"] else 1
+
+def run_provision(args):
+    from setup_database import main as provision_main
+    return 0 if provision_main() else 1
+
+def run_seed(args):
+    from seed_events import main as seed_main
+    sys.argv = ['seed_events.py'] + args.rest
+    return 0 if seed_main() else 1
+
+def run_verify(args):
+    from supabase_client import get_client
+    from verify_report import fetch_report, print_report
+
+    started = time.perf_counter()
+    report = fetch_report(get_client())
+    print(f"📊 검증 리포트 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+    print_report(report)
+    return 0
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 통합 명령줄 도구")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help="연결/행 수 상태 확인 (supabase 패키지 없이)")
+    check.add_argument('--count', choices=COUNT_METHODS, default='exact', help="행 수 계산 방식")
+    check.add_argument('--timeout', type=float, default=DEFAULT_CHECK_TIMEOUT, help="요청당 타임아웃(초)")
+    check.add_argument('--json', action='store_true', help="결과를 JSON 한 줄로 출력")
+    check.set_defaults(handler=run_check)
+
+    commands.add_parser('provision', help="마이그레이션 적용과 샘플 데이터 삽입").set_defaults(handler=run_provision)
+
+    # seed 의 인자는 seed_events.py 가 해석하므로 여기서는 받지 않고 parse_known_args 로 넘깁니다.
+    commands.add_parser('seed', help="합성 이벤트 적재 (seed_events.py 인자 그대로)",
+                        add_help=False).set_defaults(handler=run_seed)
+
+    commands.add_parser('verify', help="검증 리포트 출력").set_defaults(handler=run_verify)
+
+    args, rest = parser.parse_known_args()
+    if args.handler is not run_seed and rest:
+        parser.error(f"알 수 없는 인자: {' '.join(rest)}")
+    args.rest = rest
+    sys.exit(args.handler(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 연도별/카테고리별 일정 유무 비트맵 생성 스크립트
+월/연 보기의 "일정 있음" 점 표시는 지금 getAllEvents 로 전체 행을 받은 뒤 getEventsForDate 로 날마다 거릅니다.
+이 스크립트는 public/snapshots/occupancy/YYYY.json 에 church_category 마다 366비트(46바이트) 비트맵을
+base64 로 저장해, 한 해 전체 카테고리의 점 표시가 수백 바이트로 끝나게 합니다.
+
+- 비트 i 는 1월 1일부터 i 번째 날 (평년은 마지막 비트를 쓰지 않음)
+- 바이트 안에서는 낮은 비트부터: (bytes[i >> 3] >> (i & 7)) & 1
+- getEventsForDate 와 같이 반복 일정은 펼치지 않고 event.date 만 봅니다.
+- 일정이 없는 카테고리는 파일에서 생략합니다.
+
+상태 파일에 (id, date, category, updated_at) 을 보관하고, updated_at 워터마크 이후 바뀐 행과
+events_tombstones 의 삭제 기록으로 날짜나 카테고리가 바뀐 행의 이전/새 연도만 다시 씁니다.
+상태 반영과 다시 쓸 연도 기록은 같은 트랜잭션이라 파일 쓰기 전에 중단되어도 다음 실행에서 이어서 씁니다.
+
+사용 예:
+    python occupancy_bitmaps.py                    # 바뀐 연도만 다시 생성
+    python occupancy_bitmaps.py --full             # 전체 다시 생성
+    python occupancy_bitmaps.py --benchmark 2026   # 행 기반 방식과 크기/조회 시간 비교
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from supabase import Client
+
+from event_constants import CATEGORY_ENUM, EVENT_COLUMNS
+from event_reader import iter_events
+from event_watermarks import (TOMBSTONE_COLUMNS, latest_tombstone, normalize_timestamp, pull_changes, utc_timestamp,
+                              warn_tombstones_unavailable)
+from supabase_client import get_client
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'snapshots', 'occupancy')
+DEFAULT_STATE = '.occupancy_state.sqlite'
+
+DAYS_IN_BITMAP = 366
+OCCUPANCY_COLUMNS = ('id', 'date', 'category', 'updated_at')
+
+# 벤치마크에서 월 보기 한 화면(6주)을 그릴 때 조회하는 날 수
+MONTH_VIEW_DAYS = 42
+
+STATE_SQL = """
+CREATE TABLE IF NOT EXISTS occupancy_rows (
+  id TEXT PRIMARY KEY,
+  date TEXT NOT NULL,
+  category TEXT NOT NULL,
+  updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_occupancy_rows_date ON occupancy_rows(date);
+CREATE TABLE IF NOT EXISTS dirty_years (
+  year INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS occupancy_state (
+  name TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+def open_state(path: str = DEFAULT_STATE):
+    """비트맵 상태 SQLite 연결"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(STATE_SQL)
+    return conn
+
+def _get_state(conn, name: str):
+    row = conn.execute('SELECT value FROM occupancy_state WHERE name = ?', (name,)).fetchone()
+    return row[0] if row else None
+
+def _set_state(conn, name: str, value: str):
+    conn.execute('INSERT OR REPLACE INTO occupancy_state (name, value) VALUES (?, ?)', (name, value))
+
+def day_of_year(value):
+    """'YYYY-MM-DD' 또는 date -> (연도, 1월 1일 기준 0부터 시작하는 날 번호)"""
+    day = date.fromisoformat(value) if isinstance(value, str) else value
+    return day.year, day.toordinal() - date(day.year, 1, 1).toordinal()
+
+def encode_bitmap(days):
+    """날 번호 목록 -> base64 비트맵 (46바이트)"""
+    bits = np.zeros(DAYS_IN_BITMAP, dtype=bool)
+    bits[np.asarray(list(days), dtype=np.int64)] = True
+    return base64.b64encode(np.packbits(bits, bitorder='little').tobytes()).decode('ascii')
+
+def decode_bitmap(text: str):
+    """base64 비트맵 -> bytes"""
+    return base64.b64decode(text)
+
+def has_events(bitmap: bytes, day: int):
+    """비트맵에서 day 번째 날에 일정이 있는지"""
+    return bool((bitmap[day >> 3] >> (day & 7)) & 1)
+
+def year_bitmaps(conn, year: int):
+    """상태 파일에서 한 해의 카테고리별 비트맵 (ENUM 순서, 일정이 없는 카테고리 생략)"""
+    days = {}
+    for category, event_date in conn.execute(
+            'SELECT DISTINCT category, date FROM occupancy_rows WHERE date >= ? AND date < ?',
+            (f"{year:04d}-01-01", f"{year + 1:04d}-01-01")):
+        days.setdefault(category, []).append(day_of_year(event_date)[1])
+    order = {category: index for index, category in enumerate(CATEGORY_ENUM)}
+    return {category: encode_bitmap(days[category])
+            for category in sorted(days, key=lambda category: (order.get(category, len(order)), category))}
+
+def _write_json(path: str, data):
+    """원자적으로 JSON 파일 저장 (작은 크기를 위해 공백 없이)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def write_year(conn, output_dir: str, year: int):
+    """연도 비트맵 파일 저장 (일정이 없는 해는 파일 삭제) 후 다시 쓸 연도 목록에서 제거"""
+    path = os.path.join(output_dir, f"{year:04d}.json")
+    bitmaps = year_bitmaps(conn, year)
+    if bitmaps:
+        _write_json(path, {"year": year, "days": DAYS_IN_BITMAP, "categories": bitmaps})
+    elif os.path.exists(path):
+        os.remove(path)
+    conn.execute('DELETE FROM dirty_years WHERE year = ?', (year,))
+
+def write_index(conn, output_dir: str):
+    """비트맵이 있는 연도 목록(index.json) 저장"""
+    years = [int(row[0]) for row in conn.execute('SELECT DISTINCT substr(date, 1, 4) FROM occupancy_rows ORDER BY 1')]
+    _write_json(os.path.join(output_dir, 'index.json'), {"generatedAt": utc_timestamp(), "years": years})
+
+def _stored_rows(conn, ids):
+    """상태 파일의 id -> (date, category, updated_at)"""
+    stored = {}
+    for offset in range(0, len(ids), 500):
+        batch = ids[offset:offset + 500]
+        for row_id, event_date, category, updated_at in conn.execute(
+                f'SELECT id, date, category, updated_at FROM occupancy_rows WHERE id IN ({",".join("?" * len(batch))})',
+                batch):
+            stored[row_id] = (event_date, category, updated_at)
+    return stored
+
+def _mark_dirty(conn, dates):
+    conn.executemany('INSERT OR IGNORE INTO dirty_years (year) VALUES (?)',
+                     [(int(year),) for year in {event_date[:4] for event_date in dates}])
+
+def apply_event_page(conn, rows):
+    """바뀐 행 반영: 날짜나 카테고리가 바뀐 행의 이전/새 연도를 다시 쓸 연도로 기록"""
+    stored = _stored_rows(conn, [row['id'] for row in rows])
+    changed, dirty = [], []
+    for row in rows:
+        updated_at = normalize_timestamp(row['updated_at'])
+        previous = stored.get(row['id'])
+        if previous and previous[2] >= updated_at:
+            continue
+        changed.append((row['id'], row['date'], row['category'], updated_at))
+        if previous is None or previous[:2] != (row['date'], row['category']):
+            dirty.append(row['date'])
+            if previous:
+                dirty.append(previous[0])
+    conn.executemany('INSERT OR REPLACE INTO occupancy_rows (id, date, category, updated_at) VALUES (?, ?, ?, ?)',
+                     changed)
+    _mark_dirty(conn, dirty)
+
+def apply_tombstone_page(conn, rows):
+    """삭제 기록 반영 (삭제 이후 다시 갱신된 행은 유지)"""
+    stored = _stored_rows(conn, [row['id'] for row in rows])
+    deleted = [(row['id'], normalize_timestamp(row['deleted_at'])) for row in rows
+               if row['id'] in stored and stored[row['id']][2] <= normalize_timestamp(row['deleted_at'])]
+    conn.executemany('DELETE FROM occupancy_rows WHERE id = ? AND updated_at <= ?', deleted)
+    _mark_dirty(conn, [stored[row_id][0] for row_id, _ in deleted])
+
+def reset_state(supabase: Client, conn):
+    """전체 다시 생성 준비: 상태를 비우고 기존 연도는 모두 다시 쓸 연도로 기록"""
+    # 전체 생성 전에 삭제 기록 워터마크를 먼저 잡아 두면 생성 중 삭제도 다음 실행에 반영됩니다.
+    tombstones_watermark = latest_tombstone(supabase)
+    conn.execute('BEGIN')
+    conn.execute('INSERT OR IGNORE INTO dirty_years (year) '
+                 'SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER) FROM occupancy_rows')
+    conn.execute('DELETE FROM occupancy_rows')
+    conn.execute('DELETE FROM occupancy_state')
+    if tombstones_watermark:
+        _set_state(conn, 'tombstones_watermark', tombstones_watermark)
+    conn.execute('COMMIT')
+
+def build_bitmaps(supabase: Client, conn, output_dir: str = DEFAULT_OUTPUT_DIR, full: bool = False):
+    """비트맵 생성 (처음이거나 full=True 이면 전체, 아니면 바뀐 연도만)
+
+    반환값: 다시 쓴 연도 수
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    first_run = _get_state(conn, 'events_watermark') is None
+    if full or first_run:
+        reset_state(supabase, conn)
+
+    pull_changes(supabase, conn, 'events', OCCUPANCY_COLUMNS, 'occupancy_state', 'events_watermark', apply_event_page)
+    if not (full or first_run):
+        try:
+            pull_changes(supabase, conn, 'events_tombstones', TOMBSTONE_COLUMNS, 'occupancy_state',
+                         'tombstones_watermark', apply_tombstone_page)
+        except Exception as e:
+            warn_tombstones_unavailable(e, "삭제된 일정은 --full 로 반영해야 합니다")
+
+    years = [row[0] for row in conn.execute('SELECT year FROM dirty_years ORDER BY year')]
+    for year in years:
+        write_year(conn, output_dir, year)
+    if years:
+        write_index(conn, output_dir)
+    return len(years)
+
+def benchmark(supabase: Client, output_dir: str, year: int, repeat: int = 20):
+    """한 해 기준 행 기반 방식(getAllEvents + getEventsForDate)과 비트맵의 크기/조회 시간 비교"""
+    rows = list(iter_events(supabase, EVENT_COLUMNS, filters=[('gte', 'date', f"{year:04d}-01-01"),
+                                                              ('lt', 'date', f"{year + 1:04d}-01-01")]))
+    row_payload = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(os.path.join(output_dir, f"{year:04d}.json"), 'rb') as f:
+        bitmap_payload = f.read()
+
+    first_day = date(year, 1, 1)
+    days = [first_day + timedelta(days=offset) for offset in range(MONTH_VIEW_DAYS)]
+    day_strings = [day.isoformat() for day in days]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        # getEventsForDate: 칸마다 전체 행을 거름
+        row_marks = [{row['category'] for row in rows if row['date'] == day} for day in day_strings]
+    row_seconds = (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        bitmaps = {category: decode_bitmap(text)
+                   for category, text in json.loads(bitmap_payload)['categories'].items()}
+        bitmap_marks = [{category for category, bitmap in bitmaps.items() if has_events(bitmap, day_of_year(day)[1])}
+                        for day in days]
+    bitmap_seconds = (time.perf_counter() - started) / repeat
+
+    return {
+        "rows": len(rows),
+        "row_bytes": len(row_payload),
+        "row_gzip_bytes": len(gzip.compress(row_payload)),
+        "bitmap_bytes": len(bitmap_payload),
+        "bitmap_gzip_bytes": len(gzip.compress(bitmap_payload)),
+        "row_ms": row_seconds * 1000,
+        "bitmap_ms": bitmap_seconds * 1000,
+        "same": row_marks == bitmap_marks,
+    }
+
+def print_benchmark(year: int, result):
+    print(f"\n📊 {year}년 {result['rows']:,}개 이벤트, 월 보기 {MONTH_VIEW_DAYS}칸 조회")
+    print(f"   행 기반: {result['row_bytes']:,} bytes (gzip {result['row_gzip_bytes']:,}), "
+          f"{result['row_ms']:.2f}ms")
+    print(f"   비트맵:  {result['bitmap_bytes']:,} bytes (gzip {result['bitmap_gzip_bytes']:,}), "
+          f"{result['bitmap_ms']:.3f}ms (JSON 해석 포함)")
+    print(f"   결과 일치: {'✅' if result['same'] else '❌'}")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 연도별 일정 유무 비트맵 생성")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help="비트맵 디렉터리")
+    parser.add_argument('--state', default=DEFAULT_STATE, help="상태 SQLite 파일 경로")
+    parser.add_argument('--full', action='store_true', help="전체 다시 생성")
+    parser.add_argument('--benchmark', type=int, metavar='YEAR', help="생성 후 행 기반 방식과 비교할 연도")
+    args = parser.parse_args()
+
+    print("🏛️ 나주교회 캘린더 일정 유무 비트맵 생성")
+    print("=" * 60)
+    supabase = get_client()
+    started = time.perf_counter()
+    conn = open_state(args.state)
+    rebuilt = build_bitmaps(supabase, conn, args.output, args.full)
+    conn.close()
+
+    if rebuilt:
+        print(f"✅ {rebuilt}개 연도의 비트맵을 다시 만들었습니다. ({time.perf_counter() - started:.2f}초)")
+    else:
+        print(f"✅ 바뀐 연도가 없습니다. ({time.perf_counter() - started:.2f}초)")
+    print(f"💾 {args.output}")
+
+    if args.benchmark:
+        print_benchmark(args.benchmark, benchmark(supabase, args.output, args.benchmark))
+
+if __name__ == "__main__":
+    main()
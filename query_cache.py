@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 프로세스 내 조회 캐시 (LRU + 모양별 TTL + 메모리 상한)
+리포트 작업이 EventService 와 같은 모양의 조회(월 범위, 하루, 카테고리)를 되풀이할 때
+같은 조회는 네트워크 왕복 없이 메모리에서 돌려줍니다.
+
+- 키: 테이블, select 컬럼, 필터(순서 무관), 정렬/limit 호출을 정규화한 문자열. 읽기 전용 RPC 는 이름과 인자.
+- 모양(date/range/category/report/default)마다 TTL(SHAPE_TTLS)이 다르고, 만료된 항목은 다시 조회합니다.
+- 전체 크기가 max_bytes, 항목 수가 max_entries 를 넘으면 가장 오래 안 쓴 항목부터 버립니다.
+  크기는 캐시에 남는 파이썬 객체(행 dict 와 값)의 sys.getsizeof 합입니다. 같은 응답을 JSON 으로 직렬화한 바이트의
+  3~4배쯤 되므로 JSON 길이로 재면 실제 메모리가 상한을 몇 배 넘습니다.
+- 무효화: probe_interval 초마다 한 번 events 의 max(updated_at) 과 events_tombstones 의 max(deleted_at) 을
+  (updated_at, id)/(deleted_at, id) 인덱스로 한 행만 읽어 확인하고, 값이 바뀌었으면 events 항목을 모두 버립니다.
+  삭제는 updated_at 을 바꾸지 않으므로 tombstone 도 함께 봅니다.
+  같은 클라이언트로 쓰면(insert/upsert/update/delete, RPC_WRITES 의 RPC) 곧바로 버리고 다음 조회에서 다시 확인합니다.
+- 늦게 커밋된 트랜잭션의 updated_at 은 이미 본 최댓값보다 작을 수 있어 확인에서 놓칠 수 있습니다. 이 경우에도 TTL 이
+  지나면 다시 조회합니다. (event_sync 의 SYNC_OVERLAP 과 같은 이유)
+- 캐시에서 돌려주는 행은 복사본이라 호출한 쪽이 고쳐도 캐시는 바뀌지 않습니다.
+- 비동기 클라이언트 요청과 캐시하지 않는 테이블/호출은 그대로 통과합니다.
+
+사용 예:
+    supabase = apply_cache(get_client())
+    rows = supabase.table('events').select('*').gte('date', '2026-03-01').lte('date', '2026-03-31').execute().data
+
+    python query_cache.py --benchmark --rows 20000 --latency 0.02 --repeat 5
+"""
+
+import argparse
+import inspect
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_PROBE_INTERVAL = 5.0
+
+# 조회 모양별 TTL (초)
+SHAPE_TTLS = {
+    'date': 60.0,
+    'range': 300.0,
+    'category': 300.0,
+    'report': 60.0,
+    'default': 120.0,
+}
+
+# 캐시하는 테이블 -> 바뀌었는지 확인할 (테이블, 최신 시각 컬럼) 목록
+PROBES = {
+    'events': (('events', 'updated_at'), ('events_tombstones', 'deleted_at')),
+}
+# 캐시하는 읽기 전용 RPC -> 읽는 테이블
+RPC_TABLES = {
+    'events_count_report': 'events',
+}
+# 테이블을 고치는 RPC -> 무효화할 테이블 (exec_sql 은 마이그레이션/임의 SQL 이라 events 도 바꿀 수 있음)
+RPC_WRITES = {
+    'update_events': 'events',
+    'archive_events': 'events',
+    'exec_sql': 'events',
+}
+
+FILTER_CALLS = ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'like', 'ilike', 'in_', 'is_', 'or_')
+MODIFIER_CALLS = ('order', 'limit', 'range', 'single', 'maybe_single')
+WRITE_VERBS = ('insert', 'upsert', 'update', 'delete')
+
+BENCHMARK_SEED = 42
+
+class CachedResponse:
+    """캐시에서 돌려주는 응답 (APIResponse 의 data/count)"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"CachedResponse(data=<{len(self.data) if isinstance(self.data, list) else 1}>, count={self.count!r})"
+
+def _copy_data(data):
+    """행 dict 는 복사해서 돌려줌 (행 값은 문자열/숫자라 얕은 복사로 충분)"""
+    if isinstance(data, list):
+        return [dict(row) if isinstance(row, dict) else row for row in data]
+    if isinstance(data, dict):
+        return dict(data)
+    return data
+
+def _retained_size(data):
+    """캐시에 남는 객체의 바이트 수 (sys.getsizeof 합, 행끼리 공유하는 키 문자열 등은 한 번만)"""
+    seen = set()
+
+    def size(value):
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        total = sys.getsizeof(value)
+        if isinstance(value, dict):
+            total += sum(size(key) + size(item) for key, item in value.items())
+        elif isinstance(value, (list, tuple)):
+            total += sum(size(item) for item in value)
+        return total
+    return size(data)
+
+def query_shape(calls):
+    """필터 호출로 조회 모양 분류 (TTL 선택용)"""
+    if any(name == 'rpc' for name, _, _ in calls):
+        return 'report'
+    filters = {(name, args[0]) for name, args, _ in calls if name in FILTER_CALLS and args}
+    if ('eq', 'date') in filters:
+        return 'date'
+    if ('gte', 'date') in filters and ('lte', 'date') in filters:
+        return 'range'
+    if ('eq', 'category') in filters:
+        return 'category'
+    return 'default'
+
+def query_key(target: str, calls):
+    """캐시 키 (필터는 순서를 바꿔도 같은 키)"""
+    normalized = [call for call in calls if call[0] not in FILTER_CALLS]
+    filters = sorted((call for call in calls if call[0] in FILTER_CALLS),
+                     key=lambda call: json.dumps(call, ensure_ascii=False, default=str))
+    return json.dumps([target, normalized, filters], ensure_ascii=False, default=str, sort_keys=True)
+
+class QueryCache:
+    """LRU + TTL + 메모리 상한 캐시와 테이블별 버전 확인"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES, ttls=None,
+                 probe_interval: float = DEFAULT_PROBE_INTERVAL):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttls = dict(SHAPE_TTLS, **(ttls or {}))
+        self.probe_interval = probe_interval
+        # key -> (테이블, 만료 시각, 크기, data, count)
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.versions = {}
+        self.probed_at = {}
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0, "expirations": 0,
+                      "invalidations": 0, "probes": 0, "uncacheable": 0}
+
+    def get(self, key: str):
+        """캐시된 (data, count) 또는 None (만료된 항목은 버림)"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return _copy_data(entry[3]), entry[4]
+
+    def put(self, key: str, table: str, shape: str, data, count=None):
+        """항목 저장 후 상한을 넘으면 가장 오래 안 쓴 항목부터 버림"""
+        data = _copy_data(data)
+        size = _retained_size(data) + sys.getsizeof(key)
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            # 한 항목이 상한의 1/4 을 넘으면 다른 항목을 다 밀어내므로 저장하지 않습니다.
+            if size > self.max_bytes // 4:
+                self.stats["uncacheable"] += 1
+                return
+            self.entries[key] = (table, time.monotonic() + self.ttls.get(shape, self.ttls['default']), size, data,
+                                 count)
+            self.bytes += size
+            while self.bytes > self.max_bytes or len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+                self.stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key)
+        self.bytes -= entry[2]
+
+    def invalidate(self, table: str):
+        """테이블의 항목을 모두 버리고 다음 조회에서 버전을 다시 확인"""
+        with self._lock:
+            keys = [key for key, entry in self.entries.items() if entry[0] == table]
+            for key in keys:
+                self._remove(key)
+            self.stats["invalidations"] += len(keys)
+            self.probed_at.pop(table, None)
+
+    def check_version(self, client, table: str):
+        """probe_interval 이 지났으면 테이블 버전을 확인하고 바뀌었으면 무효화"""
+        with self._lock:
+            probed_at = self.probed_at.get(table)
+            if probed_at is not None and time.monotonic() - probed_at < self.probe_interval:
+                return
+            version = probe_version(client, table)
+            self.stats["probes"] += 1
+            self.probed_at[table] = time.monotonic()
+            if self.versions.get(table) != version:
+                if table in self.versions:
+                    self.invalidate(table)
+                    self.probed_at[table] = time.monotonic()
+                self.versions[table] = version
+
+    def summary(self):
+        """카운터와 현재 크기"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, entries=len(self.entries), bytes=self.bytes,
+                        hit_ratio=round(self.stats["hits"] / lookups, 3) if lookups else 0.0)
+
+def probe_version(client, table: str):
+    """테이블 버전: PROBES 의 (테이블, 컬럼) 마다 최댓값 한 행 (읽을 수 없는 테이블은 None)"""
+    version = []
+    for probe_table, column in PROBES[table]:
+        try:
+            rows = client.table(probe_table).select(column).order(column, desc=True).limit(1).execute().data
+        except Exception:
+            # events_tombstones 가 없는 프로젝트에서는 updated_at 만으로 확인합니다.
+            version.append(None)
+            continue
+        version.append(rows[0][column] if rows else None)
+    return tuple(version)
+
+class _CachedQuery:
+    """쿼리 빌더 프록시 - 체이닝 호출을 기록해 두었다가 execute() 에서 캐시 확인"""
+
+    def __init__(self, builder, target: str, verb, calls, client):
+        self._builder = builder
+        self._target = target
+        self._verb = verb
+        self._calls = calls
+        self._client = client
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                verb = self._verb or (name if name in WRITE_VERBS + ('select',) else None)
+                calls = self._calls + [(name, list(args), dict(sorted(kwargs.items())))]
+                return _CachedQuery(result, self._target, verb, calls, self._client)
+            return result
+        return call
+
+    @property
+    def table(self):
+        """캐시/무효화 기준 테이블 (캐시하지 않으면 None)"""
+        if self._target == 'rpc':
+            return RPC_TABLES.get(self._verb) or RPC_WRITES.get(self._verb)
+        return self._target if self._target in PROBES else None
+
+    @property
+    def writes(self):
+        """테이블을 고치는 호출인지 (쓰기 빌더 또는 RPC_WRITES 의 RPC)"""
+        if self._target == 'rpc':
+            return self._verb in RPC_WRITES
+        return self._verb in WRITE_VERBS
+
+    def _cacheable(self):
+        if self.table is None or self.writes:
+            return False
+        if self._target == 'rpc':
+            return True
+        return self._verb == 'select' and all(name in FILTER_CALLS + MODIFIER_CALLS + ('select',)
+                                              for name, _, _ in self._calls)
+
+    def execute(self):
+        cache = self._client.cache
+        # 비동기 빌더는 이벤트 루프에서 실행해야 하므로 캐시 없이 그대로 넘깁니다.
+        if inspect.iscoroutinefunction(self._builder.execute) or not self._cacheable():
+            result = self._builder.execute()
+            if self.writes and self.table is not None:
+                cache.invalidate(self.table)
+            else:
+                cache.stats["bypassed"] += 1
+            return result
+
+        cache.check_version(self._client.raw, self.table)
+        key = query_key(self._target, self._calls)
+        cached = cache.get(key)
+        if cached is not None:
+            return CachedResponse(*cached)
+        result = self._builder.execute()
+        cache.put(key, self.table, query_shape(self._calls), result.data, getattr(result, 'count', None))
+        return result
+
+class CachedClient:
+    """Supabase(또는 로컬 대체) 클라이언트 프록시 - events 조회와 읽기 전용 RPC 를 캐시"""
+
+    def __init__(self, client, cache: QueryCache):
+        self.raw = client
+        self.cache = cache
+
+    def table(self, name: str):
+        return _CachedQuery(self.raw.table(name), name, None, [], self)
+
+    def from_(self, name: str):
+        return self.table(name)
+
+    def rpc(self, name: str, params=None, *args, **kwargs):
+        return _CachedQuery(self.raw.rpc(name, params, *args, **kwargs), 'rpc', name,
+                            [('rpc', [name], {"params": params})], self)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+def apply_cache(client, cache: QueryCache = None):
+    """클라이언트를 캐시 프록시로 감싸기 (이미 감싼 클라이언트는 그대로)"""
+    if isinstance(client, CachedClient):
+        return client
+    return CachedClient(client, cache or QueryCache())
+
+def print_cache_stats(client):
+    """캐시 카운터 출력"""
+    if not isinstance(client, CachedClient):
+        return
+    stats = client.cache.summary()
+    print(f"\n🗃️ 조회 캐시: 적중 {stats['hits']}회, 실패 {stats['misses']}회 (적중률 {stats['hit_ratio']:.0%}), "
+          f"축출 {stats['evictions']}개, 만료 {stats['expirations']}개, 무효화 {stats['invalidations']}개, "
+          f"버전 확인 {stats['probes']}회, {stats['entries']}개 항목 {stats['bytes'] / 1024 / 1024:.1f} MB")
+
+def report_queries(supabase, year: int):
+    """벤치마크용 리포트 작업: EventService 의 월/하루/카테고리 조회와 집계 RPC"""
+    results = []
+    for month in range(1, 13):
+        last_day = (31 if month in (1, 3, 5, 7, 8, 10, 12) else 30) if month != 2 else 28
+        results.append(supabase.table('events').select('*').gte('date', f"{year}-{month:02d}-01")
+                       .lte('date', f"{year}-{month:02d}-{last_day}").order('date').execute().data)
+    for category in ('church', 'youth', 'worship', 'education'):
+        results.append(supabase.table('events').select('*').eq('category', category).gte('date', f"{year}-01-01")
+                       .lte('date', f"{year}-12-31").order('date').execute().data)
+    for day in range(1, 29):
+        results.append(supabase.table('events').select('*').eq('date', f"{year}-03-{day:02d}")
+                       .order('start_time').execute().data)
+    results.append(supabase.rpc('events_count_report').execute().data)
+    return results
+
+def benchmark(rows: int, latency: float, repeat: int, year: int = 2026, probe_interval: float = 0.5):
+    """같은 리포트 작업을 캐시 없이/캐시로 repeat 번 실행해 요청 수와 시간 비교
+
+    두 번째 실행 뒤 캐시를 거치지 않고 한 행을 바꿔 버전 확인으로 무효화되는지도 봅니다.
+    실행 사이에는 probe_interval 만큼 쉬어 버전 확인이 일어나게 합니다. (쉬는 시간은 측정에서 제외)
+    """
+    from local_backend import create_local_client
+    from seed_events import generate_chunk
+
+    client = create_local_client(latency=latency)
+    seed_rows = [dict(row, id=str(uuid.UUID(int=index + 1, version=4)))
+                 for index, row in enumerate(generate_chunk(BENCHMARK_SEED, 0, rows, rows))]
+    client.table('events').insert(seed_rows, returning='minimal').execute()
+    cached = apply_cache(client, QueryCache(probe_interval=probe_interval))
+
+    runs = []
+    for run in range(repeat):
+        if run == 2:
+            client.table('events').update({"location": "교육관"}, returning='minimal').eq(
+                'id', seed_rows[0]['id']).execute()
+        client.stats.reset()
+        started = time.perf_counter()
+        expected = report_queries(client, year)
+        plain_seconds, plain_requests = time.perf_counter() - started, client.stats.requests
+
+        client.stats.reset()
+        hits = cached.cache.stats["hits"]
+        started = time.perf_counter()
+        actual = report_queries(cached, year)
+        runs.append({
+            "plain_seconds": plain_seconds,
+            "plain_requests": plain_requests,
+            "cached_seconds": time.perf_counter() - started,
+            "cached_requests": client.stats.requests,
+            "hits": cached.cache.stats["hits"] - hits,
+            "same": actual == expected,
+        })
+        time.sleep(probe_interval)
+    return runs, cached.cache.summary()
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 조회 캐시 벤치마크")
+    parser.add_argument('--benchmark', action='store_true', help="로컬 백엔드에서 리포트 작업 반복 실행 비교")
+    parser.add_argument('--rows', type=int, default=20000, help="벤치마크 행 수")
+    parser.add_argument('--latency', type=float, default=0.02, help="왕복당 주입할 지연 (초)")
+    parser.add_argument('--repeat', type=int, default=5, help="리포트 작업 반복 횟수")
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.error("--benchmark 가 필요합니다.")
+    runs, stats = benchmark(args.rows, args.latency, args.repeat)
+    print(f"📊 리포트 작업 {args.repeat}회 ({args.rows:,}행, 왕복 지연 {args.latency * 1000:.0f}ms, "
+          f"3회차 전에 한 행 변경)")
+    for index, run in enumerate(runs, 1):
+        print(f"   {index}회차: 캐시 없음 {run['plain_requests']}회 {run['plain_seconds']:.2f}초 | "
+              f"캐시 {run['cached_requests']}회 {run['cached_seconds']:.2f}초 (적중 {run['hits']}) "
+              f"{'✅' if run['same'] else '❌'}")
+    print(f"   적중률 {stats['hit_ratio']:.0%}, 무효화 {stats['invalidations']}개, 버전 확인 {stats['probes']}회, "
+          f"{stats['entries']}개 항목 {stats['bytes'] / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 반복 일정 전개 모듈
+recurring(daily/weekly/monthly/yearly) 이 설정된 행 하나를 요청한 기간 안의 실제 날짜들로 펼칩니다.
+반복 일정은 행 하나만 저장하고 조회할 때 전개하므로 매주 예배를 수십 개의 행으로 저장할 필요가 없습니다.
+
+- 모든 계산은 NumPy datetime64 배열 연산으로 시리즈 수천 개를 한 번에 처리합니다.
+- monthly 는 시작일의 '일'을 유지하고, 그 날이 없는 달은 말일로 맞춥니다. (1월 31일 -> 2월 28/29일, 4월 30일)
+- yearly 도 같은 규칙이라 2월 29일 시작 일정은 평년에 2월 28일로 전개됩니다.
+- 어느 회차든 시작일 기준으로 계산하므로 말일 보정이 다음 달로 누적되지 않습니다.
+
+사용 예:
+    python recurrence.py --series 5000 --year 2026     # 벡터 전개 vs 행 단위 전개 벤치마크
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from event_constants import RECURRING_TYPES
+
+# 반복 종류 -> (단위, 간격)
+RECURRENCE_STEPS = {
+    'daily': ('D', 1),
+    'weekly': ('D', 7),
+    'monthly': ('M', 1),
+    'yearly': ('M', 12),
+}
+
+def _days(values):
+    """date/문자열 목록을 datetime64[D] 배열로 변환"""
+    return np.asarray([str(value)[:10] for value in values], dtype='datetime64[D]')
+
+def _ranges(first, counts):
+    """각 시리즈의 [first, first + count) 를 이어 붙인 배열과 시리즈 번호 배열"""
+    total = int(counts.sum())
+    series = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return series, np.arange(total) - np.repeat(starts, counts) + np.repeat(first, counts)
+
+def _expand_days(anchors, step: int, start, end):
+    """일 단위 간격 반복 전개"""
+    begin = np.maximum(anchors, start)
+    offset = (begin - anchors).astype(np.int64)
+    first = -(-offset // step)
+    last = (end - anchors).astype(np.int64) // step
+    counts = np.maximum(last - first + 1, 0)
+    series, k = _ranges(first, counts)
+    return series, anchors[series] + k * step
+
+def _expand_months(anchors, step: int, start, end):
+    """월 단위 간격 반복 전개 (시작일의 '일' 유지, 없는 날은 말일)"""
+    anchor_months = anchors.astype('datetime64[M]')
+    anchor_days = (anchors - anchor_months.astype('datetime64[D]')).astype(np.int64)
+
+    begin = np.maximum(anchor_months, start.astype('datetime64[M]'))
+    offset = (begin - anchor_months).astype(np.int64)
+    first = -(-offset // step)
+    last = (end.astype('datetime64[M]') - anchor_months).astype(np.int64) // step
+    counts = np.maximum(last - first + 1, 0)
+    series, k = _ranges(first, counts)
+
+    months = anchor_months[series] + k * step
+    month_starts = months.astype('datetime64[D]')
+    month_lengths = ((months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+    dates = month_starts + np.minimum(anchor_days[series], month_lengths - 1)
+
+    # 기간의 첫/마지막 달은 일부만 포함되므로 날짜로 다시 거릅니다.
+    keep = (dates >= start) & (dates <= end)
+    return series[keep], dates[keep]
+
+def expand_occurrences(anchors, kinds, start, end):
+    """반복 시리즈들을 [start, end] 기간의 회차로 전개
+
+    anchors: 시리즈 시작일 목록, kinds: 반복 종류 목록 (None 이면 반복 없음)
+    반환값: (시리즈 번호 배열, 회차 날짜 datetime64[D] 배열) - 날짜, 시리즈 번호 순으로 정렬
+    """
+    anchors = _days(anchors)
+    kinds = np.asarray([kind or '' for kind in kinds], dtype=object)
+    start, end = np.datetime64(str(start)[:10], 'D'), np.datetime64(str(end)[:10], 'D')
+
+    series_parts = []
+    date_parts = []
+
+    # 반복 없는 행은 기간 안에 있을 때 한 번만 나옵니다.
+    single = np.flatnonzero((kinds == '') & (anchors >= start) & (anchors <= end))
+    series_parts.append(single)
+    date_parts.append(anchors[single])
+
+    for kind, (unit, step) in RECURRENCE_STEPS.items():
+        selected = np.flatnonzero(kinds == kind)
+        if not len(selected):
+            continue
+        expand = _expand_days if unit == 'D' else _expand_months
+        series, dates = expand(anchors[selected], step, start, end)
+        series_parts.append(selected[series])
+        date_parts.append(dates)
+
+    series = np.concatenate(series_parts)
+    dates = np.concatenate(date_parts).astype('datetime64[D]')
+    # (날짜, 시리즈 번호) 를 정수 키 하나로 묶어 정렬 (lexsort 보다 빠름)
+    order = np.argsort(dates.astype(np.int64) * len(anchors) + series)
+    return series[order], dates[order]
+
+def expand_events(rows, start, end):
+    """events 행 목록을 기간 안의 회차 목록으로 전개
+
+    각 회차는 원래 행을 복사해 date 를 회차 날짜로 바꾸고, 원래 시작일은 series_date 로 남깁니다.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    series, dates = expand_occurrences([row['date'] for row in rows], [row.get('recurring') for row in rows],
+                                       start, end)
+    return [dict(rows[index], date=str(day), series_date=str(rows[index]['date'])[:10])
+            for index, day in zip(series.tolist(), dates.astype(str).tolist())]
+
+def expand_series_python(anchor: date, kind: str, start: date, end: date):
+    """시리즈 하나를 날짜 단위 반복문으로 전개 (벤치마크 기준선/검증용)"""
+    if not kind:
+        return [anchor] if start <= anchor <= end else []
+    occurrences = []
+    if kind in ('daily', 'weekly'):
+        step = timedelta(days=1 if kind == 'daily' else 7)
+        current = anchor
+        while current <= end:
+            if current >= start:
+                occurrences.append(current)
+            current += step
+        return occurrences
+
+    months = 1 if kind == 'monthly' else 12
+    index = 0
+    while True:
+        month_index = anchor.month - 1 + index * months
+        year, month = anchor.year + month_index // 12, month_index % 12 + 1
+        if date(year, month, 1) > end:
+            return occurrences
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        current = date(year, month, min(anchor.day, (next_month - timedelta(days=1)).day))
+        if start <= current <= end:
+            occurrences.append(current)
+        index += 1
+
+def _synthetic_series(count: int, seed: int):
+    """벤치마크용 반복 시리즈 (시작일 2020~2026년, 2월 29일/말일 포함)"""
+    rng = np.random.default_rng(seed)
+    anchors = np.datetime64('2020-01-01') + rng.integers(0, 365 * 7, count)
+    # 말일/윤일 경계를 반드시 포함
+    edges = np.array(['2020-02-29', '2024-02-29', '2024-01-31', '2023-03-31', '2025-08-30'], dtype='datetime64[D]')
+    anchors[:len(edges)] = edges[:count]
+    kinds = rng.choice(RECURRING_TYPES, count)
+    return anchors.astype(str).tolist(), kinds.tolist()
+
+def main():
+    """벡터 전개와 행 단위 전개를 비교하는 벤치마크"""
+    parser = argparse.ArgumentParser(description="반복 일정 전개 벤치마크")
+    parser.add_argument('--series', type=int, default=5000, help="반복 시리즈 수")
+    parser.add_argument('--year', type=int, default=2026, help="전개할 연도")
+    parser.add_argument('--seed', type=int, default=42, help="합성 시리즈 시드")
+    args = parser.parse_args()
+
+    anchors, kinds = _synthetic_series(args.series, args.seed)
+    start, end = date(args.year, 1, 1), date(args.year, 12, 31)
+    print(f"🔁 반복 시리즈 {args.series}개를 {args.year}년 전체로 전개합니다...")
+
+    started = time.perf_counter()
+    series, dates = expand_occurrences(anchors, kinds, start, end)
+    vectorized = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = sorted((day, index) for index, (anchor, kind) in enumerate(zip(anchors, kinds))
+                      for day in expand_series_python(date.fromisoformat(anchor), kind, start, end))
+    baseline = time.perf_counter() - started
+
+    actual = list(zip(dates.astype(object).tolist(), series.tolist()))
+    if actual != expected:
+        print("❌ 벡터 전개 결과가 기준 구현과 다릅니다.")
+        raise SystemExit(1)
+
+    print(f"✅ 회차 {len(dates):,}개 (기준 구현과 일치)")
+    print(f"   ⚡ NumPy 전개: {vectorized * 1000:.1f}ms")
+    print(f"   🐢 행 단위 전개: {baseline * 1000:.1f}ms ({baseline / vectorized:.1f}x)")
+
+if __name__ == "__main__":
+    main()
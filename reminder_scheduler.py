@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 알림(reminder) 스케줄러
+events.reminder(일정 시작 몇 분 전) 에 맞춰 알림을 싱크(로그, JSONL 파일 등)로 보냅니다.
+매분 전체 테이블을 훑는 cron 대신, 앞으로 DEFAULT_LOOKAHEAD 안에 울릴 알림만 최소 힙에 올려 둡니다.
+
+- 시작 시각은 Asia/Seoul(KST) 기준, 종일 일정은 그날 00:00 입니다. (event_export 의 VALARM 과 같음)
+- reminder 가 NULL 이거나 0 인 일정은 알림이 없습니다. (앱과 ICS 내보내기가 0 을 '없음'으로 다룸)
+- 창은 REFILL_STEP 단위로 조금씩 앞으로 채웁니다. 한 번에 읽는 행은 그 구간에 알림이 울릴 수 있는
+  날짜 범위의 단일 일정뿐이고, 반복 일정은 시리즈 행만 메모리에 두고 구간마다 recurrence 로 전개합니다.
+- 바뀐 일정은 updated_at 워터마크, 삭제는 events_tombstones 로 받아 해당 일정의 힙 항목만 교체합니다.
+  힙 항목은 지우지 않고 행 객체 비교로 무효화하며, 무효 항목이 절반을 넘으면 힙을 다시 만듭니다.
+- 메모리는 창 안의 알림 수 + 반복 시리즈 수에 비례하고 테이블 크기와는 무관합니다.
+  틱 한 번의 비용은 울릴 알림 수 x O(log 힙 크기) 입니다.
+- 보낸 시각까지를 상태 파일에 기록해 재시작해도 다시 보내지 않습니다. 멈춰 있던 사이의 알림은
+  MAX_CATCH_UP 안의 것만 늦게라도 보냅니다. (싱크 전송 후 기록 전에 멈추면 한 번 더 보낼 수 있음)
+- reminder 가 MAX_REMINDER_MINUTES 보다 긴 일정은 창을 채울 때 읽는 날짜 범위 밖이라 놓칠 수 있습니다.
+
+사용 예:
+    python reminder_scheduler.py                           # 계속 실행 (로그 싱크)
+    python reminder_scheduler.py --sink file:reminders.jsonl
+    python reminder_scheduler.py --once                    # 지금 울릴 알림만 보내고 종료 (cron 용)
+    python reminder_scheduler.py --benchmark 1000000       # 합성 알림 100만 개로 틱 비용/메모리 측정
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from supabase import Client
+
+from event_constants import RECURRING_TYPES
+from event_reader import DEFAULT_PAGE_SIZE, iter_events
+from event_watermarks import (TOMBSTONE_COLUMNS, iter_change_pages, normalize_timestamp, utc_timestamp,
+                              warn_tombstones_unavailable)
+from recurrence import expand_occurrences
+from supabase_client import get_client
+
+DEFAULT_STATE = '.reminder_state.json'
+
+KST = timezone(timedelta(hours=9), 'KST')
+KST_OFFSET = 9 * 3600
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DEFAULT_LOOKAHEAD = timedelta(hours=6)
+# 창 끝이 now + lookahead 보다 이만큼 뒤처지면 다음 구간을 읽습니다.
+REFILL_STEP = timedelta(minutes=30)
+DEFAULT_POLL = 30.0
+# 이벤트 루프가 한 번에 쉬는 최대 시간 (초)
+MAX_SLEEP = 1.0
+# 재시작 시 이보다 오래 지난 알림은 보내지 않습니다.
+MAX_CATCH_UP = timedelta(minutes=10)
+# 창을 채울 때 이 시간 뒤에 시작하는 일정까지 읽습니다. (앱에서 고르는 알림은 최대 1일 전)
+MAX_REMINDER_MINUTES = 7 * 24 * 60
+# 힙이 이보다 작으면 무효 항목이 많아도 다시 만들지 않습니다.
+COMPACT_MIN = 1024
+
+REMINDER_COLUMNS = ('id', 'title', 'date', 'start_time', 'is_all_day', 'reminder', 'recurring', 'updated_at')
+
+def _compact(row):
+    """행 -> 힙에서 공유하는 튜플 (id, title, date, start_time, is_all_day, reminder, recurring, updated_at,
+    시작일(epoch 일수), 알림 시각 오프셋(초))"""
+    start_time = row.get('start_time')
+    minutes = 0 if row.get('is_all_day') or not start_time else int(start_time[:2]) * 60 + int(start_time[3:5])
+    reminder = int(row.get('reminder') or 0)
+    day = date.fromisoformat(str(row['date'])[:10]).toordinal() - EPOCH_ORDINAL
+    # updated_at 은 같은 일정을 다시 읽었는지 비교만 하므로 서버가 준 문자열 그대로 둡니다.
+    return (row['id'], row.get('title'), str(row['date'])[:10], start_time, bool(row.get('is_all_day')), reminder,
+            row.get('recurring'), row.get('updated_at'), day, minutes * 60 - KST_OFFSET - reminder * 60)
+
+def _kst_date(seconds: int):
+    """epoch 초 -> KST 날짜"""
+    return datetime.fromtimestamp(seconds, KST).date()
+
+def due_at(row, day: int):
+    """회차(epoch 일수) 의 알림 시각 (epoch 초)"""
+    return day * 86400 + row[9]
+
+def reminder_payload(row, day: int, due: int):
+    """싱크로 보내는 알림 한 건"""
+    payload = {
+        "id": row[0],
+        "title": row[1],
+        "date": date.fromordinal(day + EPOCH_ORDINAL).isoformat(),
+        "start_time": row[3],
+        "is_all_day": row[4],
+        "reminder": row[5],
+        "due_at": datetime.fromtimestamp(due, KST).isoformat(),
+    }
+    if row[6]:
+        payload["recurring"] = row[6]
+        payload["series_date"] = row[2]
+    return payload
+
+class LogSink:
+    """표준 출력으로 알림을 찍는 싱크"""
+
+    def send(self, reminder):
+        when = reminder['start_time'] or '종일'
+        print(f"🔔 [{reminder['due_at'][11:16]}] {reminder['title']} - {reminder['date']} {when} "
+              f"({reminder['reminder']}분 전)", flush=True)
+
+    def close(self):
+        pass
+
+class FileSink:
+    """알림을 JSONL 파일 끝에 한 줄씩 쓰는 싱크 (테스트/다른 프로세스 연동용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def send(self, reminder):
+        self.file.write(json.dumps(reminder, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class NullSink:
+    """보낸 수만 세는 싱크 (벤치마크용)"""
+
+    def __init__(self):
+        self.sent = 0
+
+    def send(self, reminder):
+        self.sent += 1
+
+    def close(self):
+        pass
+
+def open_sink(spec: str):
+    """싱크 지정 문자열 해석: 'log', 'file:경로', 'null'"""
+    if spec == 'log':
+        return LogSink()
+    if spec == 'null':
+        return NullSink()
+    if spec.startswith('file:'):
+        return FileSink(spec[len('file:'):])
+    raise ValueError(f"알 수 없는 싱크: {spec} (log, file:경로, null)")
+
+class ReminderScheduler:
+    """창 안의 알림을 (알림 시각, 순번, 행, 회차) 최소 힙으로 관리
+
+    send 는 알림 한 건(dict) 을 받는 호출 가능 객체입니다. (싱크의 send)
+    current[id] = (행 튜플, 힙에 남은 유효 항목 수). 힙 항목의 행이 current 의 행과 같은 객체일 때만 유효합니다.
+    series 는 알림이 있는 반복 일정 시리즈 행입니다. [fired_until, loaded_until) 구간의 알림이 힙에 있습니다.
+    """
+
+    def __init__(self, send, fired_until: int):
+        self.send = send
+        self.fired_until = fired_until
+        self.loaded_until = fired_until
+        self.heap = []
+        self.current = {}
+        self.series = {}
+        self.live = 0
+        self.fired = 0
+        self._sequence = itertools.count()
+
+    def _push(self, row, days):
+        """행의 회차들 중 [fired_until, loaded_until) 에 울리는 것을 힙에 추가"""
+        entries = [(due, next(self._sequence), row, day) for day in days
+                   if self.fired_until <= (due := due_at(row, day)) < self.loaded_until]
+        self._replace(row[0], row if entries else None, len(entries))
+        for entry in entries:
+            heapq.heappush(self.heap, entry)
+
+    def _replace(self, event_id, row, count: int):
+        """일정의 기존 힙 항목을 무효화하고 새 행/항목 수 기록"""
+        _, previous = self.current.pop(event_id, (None, 0))
+        self.live += count - previous
+        if row is not None:
+            self.current[event_id] = (row, count)
+
+    def _series_days(self, rows, start: int, end: int):
+        """반복 시리즈 행들이 [start, end) 에 알림을 울릴 수 있는 회차 (행 번호 배열, epoch 일수 배열)"""
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        first = _kst_date(start) - timedelta(days=1)
+        last = _kst_date(end) + timedelta(minutes=MAX_REMINDER_MINUTES)
+        series, dates = expand_occurrences([row[2] for row in rows], [row[6] for row in rows], first, last)
+        return series, dates.astype(np.int64)
+
+    def extend(self, rows, until: int):
+        """[loaded_until, until) 구간을 채움
+
+        rows: 그 구간에 알림이 울릴 수 있는 날짜 범위의 단일 일정 행 (반복 시리즈는 self.series 에서 전개)
+        """
+        start = self.loaded_until
+        if until <= start:
+            return 0
+        entries = []
+        for row in rows:
+            row = _compact(row)
+            if row[5] <= 0 or row[6]:
+                continue
+            due = due_at(row, row[8])
+            if start <= due < until:
+                entries.append((due, row, row[8]))
+
+        series_rows = list(self.series.values())
+        series, days = self._series_days(series_rows, start, until)
+        if len(series):
+            offsets = np.asarray([row[9] for row in series_rows], dtype=np.int64)
+            dues = days * 86400 + offsets[series]
+            keep = np.flatnonzero((dues >= start) & (dues < until))
+            entries.extend((due, series_rows[index], day) for due, index, day
+                           in zip(dues[keep].tolist(), series[keep].tolist(), days[keep].tolist()))
+
+        pushed = []
+        for due, row, day in entries:
+            current_row, count = self.current.get(row[0], (None, 0))
+            if current_row is row:
+                self.current[row[0]] = (row, count + 1)
+                self.live += 1
+            else:
+                # 앞 구간에서 읽은 같은 일정의 예전 행은 무효화 (아직 폴링으로 받지 못한 변경)
+                self._replace(row[0], row, 1)
+            pushed.append((due, next(self._sequence), row, day))
+        # 새 항목이 많으면 붙인 뒤 한 번에 heapify, 적으면 하나씩 push
+        if len(pushed) > len(self.heap) // 8:
+            self.heap.extend(pushed)
+            heapq.heapify(self.heap)
+        else:
+            for entry in pushed:
+                heapq.heappush(self.heap, entry)
+        self.loaded_until = until
+        return len(entries)
+
+    def apply_changes(self, rows):
+        """바뀐 행 반영 (창 안의 회차만 다시 계산)
+
+        반환값: 실제로 다시 계산한 행 수 (워터마크 겹침 구간에서 다시 읽은 같은 행은 건너뜀)
+        """
+        changed = 0
+        for row in rows:
+            row = _compact(row)
+            known = self.current.get(row[0], (None,))[0] or self.series.get(row[0])
+            if known is not None and known[7] == row[7]:
+                continue
+            changed += 1
+            if row[5] > 0 and row[6]:
+                self.series[row[0]] = row
+            else:
+                self.series.pop(row[0], None)
+            if row[5] <= 0:
+                self._replace(row[0], None, 0)
+            elif row[6]:
+                series, days = self._series_days([row], self.fired_until, self.loaded_until)
+                self._push(row, days.tolist())
+            else:
+                self._push(row, [row[8]])
+        self._maybe_compact()
+        return changed
+
+    def apply_deletes(self, ids):
+        """삭제된 일정의 알림 취소 (반환값: 대기 중인 알림이나 시리즈가 있던 일정 수)"""
+        removed = 0
+        for event_id in ids:
+            if event_id in self.current or event_id in self.series:
+                removed += 1
+            self.series.pop(event_id, None)
+            self._replace(event_id, None, 0)
+        self._maybe_compact()
+        return removed
+
+    def _maybe_compact(self):
+        """무효 항목이 절반을 넘으면 유효 항목만으로 힙 재구성"""
+        if len(self.heap) < COMPACT_MIN or self.live * 2 >= len(self.heap):
+            return
+        current = self.current
+        self.heap = [entry for entry in self.heap if current.get(entry[2][0], (None,))[0] is entry[2]]
+        heapq.heapify(self.heap)
+
+    def tick(self, now: int):
+        """now(epoch 초) 까지 울릴 알림을 보냄
+
+        반환값: 보낸 알림 수
+        """
+        heap = self.heap
+        current = self.current
+        sent = 0
+        while heap and heap[0][0] <= now:
+            due, _, row, day = heapq.heappop(heap)
+            row_count = current.get(row[0])
+            if row_count is None or row_count[0] is not row:
+                continue
+            if row_count[1] == 1:
+                del current[row[0]]
+            else:
+                current[row[0]] = (row, row_count[1] - 1)
+            self.live -= 1
+            self.send(reminder_payload(row, day, due))
+            sent += 1
+        self.fired_until = max(self.fired_until, now + 1)
+        self.fired += sent
+        return sent
+
+    def next_due(self):
+        """가장 가까운 알림 시각 (무효 항목일 수 있음)"""
+        return self.heap[0][0] if self.heap else None
+
+def load_series(supabase: Client, page_size: int = DEFAULT_PAGE_SIZE):
+    """알림이 있는 반복 일정 시리즈 행"""
+    return list(iter_events(supabase, REMINDER_COLUMNS, page_size,
+                            filters=[('gt', 'reminder', 0), ('in_', 'recurring', RECURRING_TYPES)]))
+
+def load_slice(supabase: Client, start: int, end: int, page_size: int = DEFAULT_PAGE_SIZE):
+    """[start, end) 에 알림이 울릴 수 있는 단일 일정 행 (시작일 범위로 조회)"""
+    first = _kst_date(start) - timedelta(days=1)
+    last = _kst_date(end) + timedelta(minutes=MAX_REMINDER_MINUTES)
+    return list(iter_events(supabase, REMINDER_COLUMNS, page_size, filters=[
+        ('gte', 'date', first.isoformat()), ('lte', 'date', last.isoformat()),
+        ('gt', 'reminder', 0), ('is_', 'recurring', 'null')]))
+
+def refill(supabase: Client, scheduler: ReminderScheduler, until: int, page_size: int = DEFAULT_PAGE_SIZE):
+    """창을 until 까지 채움 (반환값: 추가한 알림 수)"""
+    return scheduler.extend(load_slice(supabase, scheduler.loaded_until, until, page_size), until)
+
+def poll_changes(supabase: Client, scheduler: ReminderScheduler, state, page_size: int = DEFAULT_PAGE_SIZE):
+    """워터마크 이후 바뀐 행과 삭제 기록 반영
+
+    반환값: {"changed": 다시 계산한 행 수, "deleted": 알림을 취소한 일정 수}
+    """
+    changed = 0
+    for page in iter_change_pages(supabase, 'events', REMINDER_COLUMNS, state['events_watermark'], page_size):
+        changed += scheduler.apply_changes(page)
+        state['events_watermark'] = max(state['events_watermark'], normalize_timestamp(page[-1]['updated_at']))
+
+    deleted = 0
+    try:
+        for page in iter_change_pages(supabase, 'events_tombstones', TOMBSTONE_COLUMNS, state['tombstones_watermark'],
+                                      page_size):
+            deleted += scheduler.apply_deletes([row['id'] for row in page])
+            state['tombstones_watermark'] = max(state['tombstones_watermark'],
+                                                normalize_timestamp(page[-1]['deleted_at']))
+    except Exception as e:
+        warn_tombstones_unavailable(e, "삭제된 일정의 알림은 재시작해야 취소됩니다")
+    return {"changed": changed, "deleted": deleted}
+
+def load_state(path: str = DEFAULT_STATE):
+    """상태 파일 (없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state, path: str = DEFAULT_STATE):
+    """상태 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def start_scheduler(supabase: Client, send, state_path: str = DEFAULT_STATE, now: float = None,
+                    lookahead: timedelta = DEFAULT_LOOKAHEAD, page_size: int = DEFAULT_PAGE_SIZE):
+    """상태 파일의 보낸 시각부터 now + lookahead 까지 창을 채운 스케줄러와 상태 dict"""
+    now = int(now if now is not None else time.time())
+    saved = load_state(state_path)
+    fired_until = max(saved.get('fired_until', now), now - int(MAX_CATCH_UP.total_seconds()))
+    # 창을 읽기 전에 워터마크를 잡아 두면 읽는 동안 바뀐 행은 첫 폴링에서 다시 받습니다.
+    watermark = utc_timestamp()
+    state = {"fired_until": fired_until, "events_watermark": watermark, "tombstones_watermark": watermark}
+
+    scheduler = ReminderScheduler(send, fired_until)
+    scheduler.series = {row[0]: row for row in map(_compact, load_series(supabase, page_size))}
+    refill(supabase, scheduler, now + int(lookahead.total_seconds()), page_size)
+    return scheduler, state
+
+def run(supabase: Client, scheduler: ReminderScheduler, state, state_path: str = DEFAULT_STATE,
+        lookahead: timedelta = DEFAULT_LOOKAHEAD, poll: float = DEFAULT_POLL, page_size: int = DEFAULT_PAGE_SIZE):
+    """이벤트 루프: 알림 보내기, poll 초마다 변경 반영, 창 끝이 REFILL_STEP 만큼 비면 다음 구간 읽기"""
+    step = int(REFILL_STEP.total_seconds())
+    ahead = int(lookahead.total_seconds())
+    last_poll = time.monotonic()
+    while True:
+        now = int(time.time())
+        if scheduler.tick(now):
+            state['fired_until'] = scheduler.fired_until
+            save_state(state, state_path)
+
+        if time.monotonic() - last_poll >= poll:
+            try:
+                stats = poll_changes(supabase, scheduler, state, page_size)
+                if stats['changed'] or stats['deleted']:
+                    print(f"🔄 변경 {stats['changed']}개, 삭제 {stats['deleted']}개 반영 "
+                          f"(대기 중인 알림 {scheduler.live:,}개)")
+            except Exception as e:
+                print(f"⚠️ 변경 조회 실패, 다음 폴링에서 다시 시도합니다: {str(e)}")
+            last_poll = time.monotonic()
+
+        if now + ahead - scheduler.loaded_until >= step:
+            try:
+                refill(supabase, scheduler, now + ahead, page_size)
+            except Exception as e:
+                print(f"⚠️ 다음 구간 조회 실패, 다시 시도합니다: {str(e)}")
+
+        next_due = scheduler.next_due()
+        wait = MAX_SLEEP if next_due is None else min(MAX_SLEEP, max(next_due - time.time(), 0))
+        time.sleep(wait)
+
+def _synthetic_rows(count: int, start: int, span: int, seed: int = 42):
+    """벤치마크용 단일 일정 행: 알림 시각이 [start, start + span) 에 고르게 퍼지도록 생성"""
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        reminder = rng.choice((10, 30, 60, 1440))
+        begins = datetime.fromtimestamp(start + rng.randrange(span) + reminder * 60, KST)
+        rows.append({
+            "id": f"00000000-0000-4000-8000-{index:012d}",
+            "title": f"합성 일정 {index}",
+            "date": begins.date().isoformat(),
+            "start_time": begins.strftime('%H:%M:00'),
+            "is_all_day": False,
+            "reminder": reminder,
+            "recurring": None,
+            "updated_at": "2026-01-01T00:00:00+00:00",
+        })
+    return rows
+
+def benchmark(count: int, ticks: int = 3600, changes: int = 10000, memory_sample: int = 100000):
+    """합성 알림 count 개로 창 적재/메모리/틱 비용 측정 (매분 전체를 훑는 방식과 비교)
+
+    tracemalloc 은 할당을 크게 느리게 하므로 메모리는 memory_sample 개 표본으로 따로 잽니다.
+    """
+    start = int(time.time()) // 60 * 60
+    span = int(DEFAULT_LOOKAHEAD.total_seconds())
+    rows = _synthetic_rows(count, start, span)
+    sink = NullSink()
+
+    sample = rows[:memory_sample]
+    tracemalloc.start()
+    sampled = ReminderScheduler(sink.send, start)
+    sampled.extend(sample, start + span)
+    memory_per_reminder = tracemalloc.get_traced_memory()[0] / max(sampled.live, 1)
+    tracemalloc.stop()
+    del sampled
+
+    started = time.perf_counter()
+    scheduler = ReminderScheduler(sink.send, start)
+    loaded = scheduler.extend(rows, start + span)
+    load_seconds = time.perf_counter() - started
+
+    # 일부 일정의 시각을 바꿔 무효 항목이 생긴 상태에서 틱을 측정합니다.
+    rng = random.Random(7)
+    updated = [dict(row, start_time=f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:00",
+                    updated_at="2026-01-02T00:00:00+00:00") for row in rng.sample(rows, min(changes, count))]
+    started = time.perf_counter()
+    scheduler.apply_changes(updated)
+    change_seconds = time.perf_counter() - started
+
+    # start_time 과 reminder 가 분 단위라 알림은 매분 0초에 몰립니다. 나머지 59초의 틱은 힙 맨 앞만 봅니다.
+    idle = []
+    busy = []
+    for second in range(start, start + ticks):
+        sent = sink.sent
+        started = time.perf_counter()
+        scheduler.tick(second)
+        elapsed = time.perf_counter() - started
+        (busy if sink.sent > sent else idle).append(elapsed)
+    idle.sort()
+
+    # 매분 전체 행을 읽어 이번 분에 울릴 알림을 고르는 방식 (행 조회 시간 제외)
+    compact_rows = [_compact(row) for row in rows]
+    started = time.perf_counter()
+    due_now = [row for row in compact_rows if start <= due_at(row, row[8]) < start + 60]
+    scan_seconds = time.perf_counter() - started
+
+    return {
+        "count": count,
+        "loaded": loaded,
+        "load_seconds": load_seconds,
+        "memory_bytes": memory_per_reminder * loaded,
+        "memory_per_reminder": memory_per_reminder,
+        "changes": len(updated),
+        "change_seconds": change_seconds,
+        "ticks": ticks,
+        "sent": sink.sent,
+        "idle_ticks": len(idle),
+        "idle_p50_us": idle[len(idle) // 2] * 1e6 if idle else 0.0,
+        "idle_max_us": idle[-1] * 1e6 if idle else 0.0,
+        "busy_ticks": len(busy),
+        "busy_max_ms": max(busy, default=0.0) * 1000,
+        "per_reminder_us": sum(busy) / max(sink.sent, 1) * 1e6,
+        "scan_ms": scan_seconds * 1000,
+        "scan_due": len(due_now),
+    }
+
+def print_benchmark(result):
+    print(f"📊 알림 {result['count']:,}개 (창 {DEFAULT_LOOKAHEAD})")
+    print(f"   창 적재: {result['loaded']:,}개, {result['load_seconds']:.2f}초, 약 "
+          f"{result['memory_bytes'] / 1024 / 1024:.1f} MB ({result['memory_per_reminder']:.0f} B/알림)")
+    print(f"   변경 {result['changes']:,}개 반영: {result['change_seconds'] * 1000:.1f}ms")
+    print(f"   틱 {result['ticks']:,}회 (1초 간격, {result['sent']:,}개 전송)")
+    print(f"     보낼 알림 없는 틱 {result['idle_ticks']:,}회: p50 {result['idle_p50_us']:.1f}µs, "
+          f"최대 {result['idle_max_us']:.1f}µs")
+    print(f"     알림 보낸 틱 {result['busy_ticks']:,}회: 알림당 {result['per_reminder_us']:.1f}µs, "
+          f"틱 최대 {result['busy_max_ms']:.1f}ms")
+    print(f"   매분 전체 스캔: {result['scan_ms']:.1f}ms/회 (행 조회 제외, 이번 분 {result['scan_due']:,}개)")
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 알림 스케줄러")
+    parser.add_argument('--sink', default='log', help="알림 싱크: log, file:경로, null")
+    parser.add_argument('--state', default=DEFAULT_STATE, help="상태 파일 경로")
+    parser.add_argument('--lookahead', type=float, default=DEFAULT_LOOKAHEAD.total_seconds() / 3600,
+                        help="미리 읽어 둘 시간 (시간 단위)")
+    parser.add_argument('--poll', type=float, default=DEFAULT_POLL, help="변경 조회 간격 (초)")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="조회 페이지 크기")
+    parser.add_argument('--once', action='store_true', help="지금까지 울릴 알림만 보내고 종료")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="합성 알림 N 개로 벤치마크 (DB 사용 안 함)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print_benchmark(benchmark(args.benchmark))
+        return
+
+    print("🏛️ 나주교회 캘린더 알림 스케줄러")
+    print("=" * 60)
+    supabase = get_client()
+    sink = open_sink(args.sink)
+    # --once 는 지금까지 울릴 알림만 필요하므로 창을 현재 시각까지만 채웁니다.
+    lookahead = timedelta(seconds=1) if args.once else timedelta(hours=args.lookahead)
+    started = time.perf_counter()
+    scheduler, state = start_scheduler(supabase, sink.send, args.state, lookahead=lookahead,
+                                       page_size=args.page_size)
+    print(f"📅 대기 중인 알림 {scheduler.live:,}개, 반복 시리즈 {len(scheduler.series):,}개 "
+          f"({time.perf_counter() - started:.2f}초)")
+
+    try:
+        if args.once:
+            sent = scheduler.tick(int(time.time()))
+            state['fired_until'] = scheduler.fired_until
+            save_state(state, args.state)
+            print(f"✅ 알림 {sent}개를 보냈습니다.")
+            return
+        run(supabase, scheduler, state, args.state, lookahead, args.poll, args.page_size)
+    except KeyboardInterrupt:
+        state['fired_until'] = scheduler.fired_until
+        save_state(state, args.state)
+        print(f"\n👋 종료 (보낸 알림 {scheduler.fired:,}개)")
+        sys.exit(0)
+    finally:
+        sink.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 Supabase 요청 계측 모듈
+클라이언트를 감싸 table()/rpc() 로 만든 요청의 .execute() 마다 지연 시간, 응답 크기, 행 수,
+상태, 호출 위치를 기록하고 작업(예: events.select, rpc.exec_sql)별 히스토그램으로 집계합니다.
+
+- 응답 크기는 응답 data 를 JSON 으로 직렬화한 바이트 수입니다(HTTP 헤더/압축 제외).
+  supabase-py 응답에는 Content-Length 가 없어 직접 계산하며, 행이 SIZE_SAMPLE_ROWS 개보다 많으면
+  고르게 뽑은 행들의 평균 크기로 추정해 큰 페이지 순회에서도 응답을 다시 직렬화하지 않습니다.
+- step 은 실행 중인 스크립트(__main__)에서 가장 안쪽 함수 이름이라,
+  fetch_report 처럼 다른 모듈을 거친 요청도 verify_setup 같은 설정 단계로 묶입니다.
+- NAJU_METRICS_DIR 가 설정되어 있을 때만 결과를 JSON 리포트와 Prometheus 텍스트 형식(.prom) 파일로 저장합니다.
+- 집계는 프로세스 전체에서 하나(metrics)라 스크립트 main() 은 시작할 때 metrics.reset() 을 호출합니다.
+
+환경 변수:
+    NAJU_METRICS_DIR    리포트 저장 디렉터리 (없으면 파일로 저장하지 않음)
+"""
+
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+from event_watermarks import utc_timestamp
+
+METRICS_DIR_ENV = 'NAJU_METRICS_DIR'
+
+# 히스토그램 버킷 상한 (마지막 +Inf 버킷은 자동 추가)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# 쿼리 빌더 메서드 중 작업 이름이 되는 것
+VERBS = ('select', 'insert', 'upsert', 'update', 'delete')
+
+METRIC_PREFIX = 'naju_supabase'
+
+# 응답 크기를 추정할 때 직렬화하는 최대 행 수
+SIZE_SAMPLE_ROWS = 16
+
+class Histogram:
+    """고정 버킷 누적 히스토그램"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float):
+        """버킷 안 선형 보간으로 분위수 추정 (Prometheus histogram_quantile 과 같은 방식)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if seen + count >= rank and count:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def cumulative(self):
+        """(상한, 누적 개수) 목록 (+Inf 포함)"""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.bounds) + ['+Inf'], self.buckets):
+            total += count
+            result.append((bound, total))
+        return result
+
+class OperationMetrics:
+    """작업 하나의 집계"""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.rows = 0
+        self.statuses = {}
+        self.call_sites = {}
+
+    def summary(self):
+        latency = self.latency
+        return {
+            "count": latency.count,
+            "errors": sum(count for status, count in self.statuses.items() if status != 'ok'),
+            "seconds": {
+                "sum": round(latency.sum, 6),
+                "min": round(latency.min, 6),
+                "max": round(latency.max, 6),
+                "mean": round(latency.sum / latency.count, 6),
+                "p50": round(latency.quantile(0.5), 6),
+                "p95": round(latency.quantile(0.95), 6),
+            },
+            "bytes": int(self.size.sum),
+            "rows": self.rows,
+            "statuses": dict(self.statuses),
+            "call_sites": dict(sorted(self.call_sites.items(), key=lambda item: -item[1])),
+            "latency_buckets": {str(bound): count for bound, count in latency.cumulative()},
+        }
+
+class RequestMetrics:
+    """요청별 기록을 작업/단계 단위로 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            self.operations = {}
+            self.steps = {}
+
+    def record(self, operation: str, seconds: float, size: int, rows: int, status: str, call_site: str, step: str):
+        with self._lock:
+            metrics = self.operations.get(operation)
+            if metrics is None:
+                metrics = self.operations[operation] = OperationMetrics()
+            metrics.latency.observe(seconds)
+            metrics.size.observe(size)
+            metrics.rows += rows
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.call_sites[call_site] = metrics.call_sites.get(call_site, 0) + 1
+
+            step_total = self.steps.setdefault(step, {"count": 0, "seconds": 0.0})
+            step_total["count"] += 1
+            step_total["seconds"] += seconds
+
+    def report(self, script: str = None):
+        """JSON 리포트용 dict (작업은 누적 지연 시간 내림차순)"""
+        with self._lock:
+            operations = {name: metrics.summary() for name, metrics in self.operations.items()}
+            steps = {name: {"count": total["count"], "seconds": round(total["seconds"], 6)}
+                     for name, total in self.steps.items()}
+            wall = time.perf_counter() - self.started
+        return {
+            "script": script,
+            "generated_at": utc_timestamp(),
+            "wall_seconds": round(wall, 6),
+            "requests": sum(item["count"] for item in operations.values()),
+            "request_seconds": round(sum(item["seconds"]["sum"] for item in operations.values()), 6),
+            "operations": dict(sorted(operations.items(), key=lambda item: -item[1]["seconds"]["sum"])),
+            "steps": dict(sorted(steps.items(), key=lambda item: -item[1]["seconds"])),
+        }
+
+    def prometheus(self, script: str = None):
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        script_label = f'script="{_escape_label(script or "")}",'
+        lines = [
+            f'# HELP {METRIC_PREFIX}_request_duration_seconds Supabase request latency.',
+            f'# TYPE {METRIC_PREFIX}_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            operations = sorted(self.operations.items())
+            for name, metrics in operations:
+                labels = f'{script_label}operation="{_escape_label(name)}"'
+                lines.extend(_histogram_lines(f'{METRIC_PREFIX}_request_duration_seconds', labels, metrics.latency))
+
+            lines.append(f'# HELP {METRIC_PREFIX}_response_bytes Supabase response payload size.')
+            lines.append(f'# TYPE {METRIC_PREFIX}_response_bytes histogram')
+            for name, metrics in operations:
+                labels = f'{script_label}operation="{_escape_label(name)}"'
+                lines.extend(_histogram_lines(f'{METRIC_PREFIX}_response_bytes', labels, metrics.size))
+
+            lines.append(f'# HELP {METRIC_PREFIX}_response_rows_total Rows returned by Supabase requests.')
+            lines.append(f'# TYPE {METRIC_PREFIX}_response_rows_total counter')
+            for name, metrics in operations:
+                lines.append(f'{METRIC_PREFIX}_response_rows_total{{{script_label}operation="{_escape_label(name)}"}} '
+                             f'{metrics.rows}')
+
+            lines.append(f'# HELP {METRIC_PREFIX}_requests_total Supabase requests by status.')
+            lines.append(f'# TYPE {METRIC_PREFIX}_requests_total counter')
+            for name, metrics in operations:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'{METRIC_PREFIX}_requests_total{{{script_label}operation="{_escape_label(name)}",'
+                                 f'status="{_escape_label(status)}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+metrics = RequestMetrics()
+
+def _escape_label(value: str):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_bound(bound):
+    return bound if bound == '+Inf' else repr(float(bound))
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram):
+    lines = [f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {count}'
+             for bound, count in histogram.cumulative()]
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum!r}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return lines
+
+def _json_size(data):
+    return len(json.dumps(data, ensure_ascii=False, default=str, separators=(',', ':')).encode('utf-8'))
+
+def _payload_size(data):
+    """응답 data 의 JSON 직렬화 바이트 수 (행이 많으면 표본 행으로 추정)"""
+    if data is None:
+        return 0
+    if not isinstance(data, list) or len(data) <= SIZE_SAMPLE_ROWS:
+        return _json_size(data)
+    step = len(data) / SIZE_SAMPLE_ROWS
+    sample = [data[int(index * step)] for index in range(SIZE_SAMPLE_ROWS)]
+    # 대괄호와 행 사이 콤마를 뺀 행 평균 크기
+    row_bytes = (_json_size(sample) - 2 - (SIZE_SAMPLE_ROWS - 1)) / SIZE_SAMPLE_ROWS
+    return round(row_bytes * len(data)) + 2 + len(data) - 1
+
+def _row_count(data):
+    if isinstance(data, list):
+        return len(data)
+    return 1 if data else 0
+
+def _status(error):
+    """성공이면 'ok', 실패면 PostgREST 오류 코드(없으면 예외 클래스 이름)"""
+    if error is None:
+        return 'ok'
+    return str(getattr(error, 'code', None) or type(error).__name__)
+
+def _caller():
+    """(호출 위치 'file.py:line function', 설정 단계 이름)
+
+    호출 위치는 이 모듈 밖의 가장 가까운 프레임, 단계는 실행 중인 스크립트 안의 가장 가까운 함수입니다.
+    (코루틴처럼 스크립트 함수를 거치지 않은 요청은 호출 위치의 함수 이름)
+    """
+    main_file = os.path.abspath(getattr(sys.modules.get('__main__'), '__file__', '') or '')
+    this_file = os.path.abspath(__file__)
+    call_site = None
+    step = None
+    frame = inspect.currentframe().f_back
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if call_site is None and os.path.abspath(filename) != this_file:
+            call_site = f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+        if os.path.abspath(filename) == main_file and frame.f_code.co_name != '<module>':
+            step = frame.f_code.co_name
+            break
+        frame = frame.f_back
+    return call_site or '?', step or (call_site.rsplit(' ', 1)[-1] if call_site else '?')
+
+class _InstrumentedQuery:
+    """쿼리 빌더 프록시 - 체이닝은 그대로 넘기고 execute() 만 계측"""
+
+    def __init__(self, builder, target: str, verb, recorder: RequestMetrics):
+        self._builder = builder
+        self._target = target
+        self._verb = verb
+        self._recorder = recorder
+
+    @property
+    def operation(self):
+        """작업 이름 (예: events.select, rpc.exec_sql)"""
+        return f"{self._target}.{self._verb}" if self._verb else self._target
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                verb = self._verb or (name if name in VERBS else None)
+                return _InstrumentedQuery(result, self._target, verb, self._recorder)
+            return result
+        return call
+
+    def execute(self):
+        call_site, step = _caller()
+        started = time.perf_counter()
+        try:
+            result = self._builder.execute()
+        except Exception as e:
+            self._finish(started, None, e, call_site, step)
+            raise
+        if inspect.isawaitable(result):
+            return self._execute_async(result, started, call_site, step)
+        self._finish(started, result, None, call_site, step)
+        return result
+
+    async def _execute_async(self, awaitable, started, call_site, step):
+        try:
+            result = await awaitable
+        except Exception as e:
+            self._finish(started, None, e, call_site, step)
+            raise
+        self._finish(started, result, None, call_site, step)
+        return result
+
+    def _finish(self, started, result, error, call_site, step):
+        elapsed = time.perf_counter() - started
+        data = getattr(result, 'data', None)
+        self._recorder.record(self.operation, elapsed, _payload_size(data), _row_count(data), _status(error),
+                              call_site, step)
+
+class InstrumentedClient:
+    """Supabase(또는 로컬 대체) 클라이언트 프록시 - table()/from_()/rpc() 요청을 계측"""
+
+    def __init__(self, client, recorder: RequestMetrics = metrics):
+        self._client = client
+        self._recorder = recorder
+
+    def table(self, name: str):
+        return _InstrumentedQuery(self._client.table(name), name, None, self._recorder)
+
+    def from_(self, name: str):
+        return _InstrumentedQuery(self._client.from_(name), name, None, self._recorder)
+
+    def rpc(self, name: str, params=None, *args, **kwargs):
+        return _InstrumentedQuery(self._client.rpc(name, params, *args, **kwargs), 'rpc', name, self._recorder)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+def instrument(client, recorder: RequestMetrics = metrics):
+    """클라이언트를 계측 프록시로 감싸기 (이미 감싼 클라이언트는 그대로)"""
+    if isinstance(client, InstrumentedClient):
+        return client
+    return InstrumentedClient(client, recorder)
+
+def write_metrics(script: str, directory: str = None, recorder: RequestMetrics = metrics):
+    """<directory>/<script>.json 과 <script>.prom 저장 (directory 가 없으면 NAJU_METRICS_DIR)
+
+    반환값: (JSON 경로, Prometheus 경로), 저장할 디렉터리나 기록된 요청이 없으면 None
+    """
+    directory = directory or os.environ.get(METRICS_DIR_ENV)
+    report = recorder.report(script)
+    if not directory or not report["requests"]:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    json_path = os.path.join(directory, f"{script}.json")
+    prom_path = os.path.join(directory, f"{script}.prom")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    with open(prom_path, 'w', encoding='utf-8') as f:
+        f.write(recorder.prometheus(script))
+    return json_path, prom_path
+
+def print_request_metrics(script: str, directory: str = None, recorder: RequestMetrics = metrics,
+                          top: int = 5):
+    """단계/작업별 요약 출력 후 (디렉터리가 설정되어 있으면) 리포트 파일 저장"""
+    report = recorder.report(script)
+    if not report["requests"]:
+        return None
+
+    share = report["request_seconds"] / report["wall_seconds"] if report["wall_seconds"] else 0.0
+    print(f"\n⏱️ 요청 계측: {report['requests']}회, 요청 시간 {report['request_seconds']:.3f}초 "
+          f"(전체 {report['wall_seconds']:.3f}초의 {share:.0%})")
+    for step, total in list(report["steps"].items())[:top]:
+        print(f"   🧭 {step}: {total['count']}회, {total['seconds']:.3f}초")
+    for name, item in list(report["operations"].items())[:top]:
+        seconds = item["seconds"]
+        errors = f", 실패 {item['errors']}회" if item["errors"] else ""
+        print(f"   📡 {name}: {item['count']}회, 합계 {seconds['sum']:.3f}초, p50 {seconds['p50'] * 1000:.1f}ms, "
+              f"p95 {seconds['p95'] * 1000:.1f}ms, {item['rows']}행, {item['bytes']:,}B{errors}")
+
+    paths = write_metrics(script, directory, recorder)
+    if paths:
+        print(f"   💾 {paths[0]}, {paths[1]}")
+    return paths
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 Supabase 요청 정책 모듈 (적응형 타임아웃, 헤지 읽기, 재시도 예산)
+느리거나 실패한 요청 하나 때문에 설정/검증 스크립트가 멈추거나 바로 포기하지 않도록
+클라이언트를 감싸 .execute() 마다 요청 종류에 맞는 정책을 적용합니다.
+
+- 읽기(select, 읽기 전용 RPC): 관측한 p95 지연이 지나도 응답이 없으면 같은 요청을 한 번 더 보내(헤지)
+  먼저 도착한 응답을 사용합니다. 실패/시간 초과 시 재시도합니다.
+- 멱등 쓰기(upsert, update, delete): 헤지와 정책 타임아웃 없이 재시도만 합니다. upsert 는 자연 키 on_conflict 이므로
+  다시 보내도 안전합니다. 이전 시도가 끝난 뒤에만 다시 보내며, 응답을 기다리다 끊긴 경우(ReadTimeout 등)는
+  서버에서 아직 실행 중일 수 있어 재시도하지 않습니다.
+- 그 외(insert, exec_sql 등): 한 번만 보냅니다. 중복 삽입/중복 실행을 막기 위해 재시도하지 않습니다.
+
+읽기 타임아웃은 작업 모양별 최근 지연 시간의 p99 x TIMEOUT_MULTIPLIER (MIN_TIMEOUT ~ MAX_TIMEOUT) 이고,
+표본이 MIN_SAMPLES 개보다 적으면 DEFAULT_TIMEOUT 을 씁니다. 작업 모양은 테이블.동사에 count 요청 여부나
+행 수 구간(rows1, rows10, ... 10의 거듭제곱)을 붙인 것입니다. 쓰기는 보내는 행 수, 읽기는 limit/range/single 로
+정한 페이지 크기이고, 크기를 정하지 않은 조회는 구간 없이 둡니다. (예: events.select.count, events.select.rows1,
+events.select.rows1000, events.upsert.rows1000) 그래서 limit(1) 확인 조회의 지연으로 1000행 페이지의 헤지와
+타임아웃을 정하거나, 작은 페이지 조회의 지연으로 전체 개수 조회나 대량 upsert 의 타임아웃을 정하지 않습니다.
+지연 표본은 백엔드별로 .request_latency.json 에 저장해 다음 실행에서 이어 씁니다.
+재시도와 헤지는 요청 수에 비례해 쌓이는 예산(RetryBudget)을 소모하므로, 장애 중에도
+요청량이 재시도로 몇 배씩 불어나지 않습니다. 재시도 간격은 지수 백오프에 full jitter 를 적용합니다.
+
+시간 초과로 포기한 읽기 시도는 취소할 수 없어 백그라운드 스레드에서 httpx 타임아웃(REQUEST_TIMEOUT)까지 남습니다.
+"""
+
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import httpx
+from postgrest.exceptions import APIError
+
+import supabase_client
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LATENCY_FILE = os.path.join(BASE_DIR, '.request_latency.json')
+
+DEFAULT_TIMEOUT = 10.0
+MIN_TIMEOUT = 1.0
+MAX_TIMEOUT = supabase_client.REQUEST_TIMEOUT.read or 30.0
+TIMEOUT_MULTIPLIER = 3.0
+HEDGE_PERCENTILE = 0.95
+MIN_SAMPLES = 5
+LATENCY_WINDOW = 200
+SAVED_SAMPLES = 50
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.2
+BACKOFF_CAP = 5.0
+
+# 요청 1회마다 RETRY_BUDGET_RATIO 만큼 예산이 쌓이고, 재시도/헤지 1회마다 1 을 씁니다.
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_RESERVE = 3.0
+RETRY_BUDGET_MAX = 10.0
+
+HEDGE_WORKERS = 8
+
+READ_VERBS = ('select',)
+IDEMPOTENT_WRITE_VERBS = ('upsert', 'update', 'delete')
+VERBS = READ_VERBS + IDEMPOTENT_WRITE_VERBS + ('insert',)
+READ_ONLY_RPCS = ('ping', 'events_count_report')
+
+# 일시적인 오류로 보고 재시도하는 응답 코드 (HTTP 상태, PostgreSQL SQLSTATE, PostgREST 코드)
+RETRYABLE_CODES = {
+    '408', '429', '500', '502', '503', '504', '520', '522', '524',
+    '40001', '40P01', '53300', '57P01', '57P03',
+    'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003',
+}
+
+class RequestTimeout(Exception):
+    """정책 타임아웃 안에 응답이 없음"""
+
+    def __init__(self, operation: str, timeout: float):
+        super().__init__(f"{operation} 요청이 {timeout:.2f}초 안에 끝나지 않았습니다.")
+        self.operation = operation
+        self.timeout = timeout
+
+def is_retryable(error, kind: str = 'read'):
+    """다시 보내면 성공할 수 있는 오류인지
+
+    쓰기는 요청이 서버에 닿았을 수 있는 읽기/쓰기 시간 초과면 재시도하지 않습니다. (같은 쓰기가 겹쳐 실행되지 않도록)
+    """
+    if kind == 'write' and isinstance(error, (httpx.ReadTimeout, httpx.WriteTimeout, httpx.RemoteProtocolError)):
+        return False
+    if isinstance(error, (RequestTimeout, httpx.TimeoutException, httpx.TransportError, ConnectionError)):
+        return True
+    if isinstance(error, APIError):
+        return str(error.code) in RETRYABLE_CODES
+    return False
+
+def _percentile(samples, q: float):
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+class LatencyTracker:
+    """작업 모양별 최근 지연 시간 창
+
+    모양이 다른 작업의 표본은 섞지 않습니다. 처음 보는 모양은 표본이 쌓일 때까지 기본 타임아웃을 씁니다.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples = {}
+
+    def observe(self, operation: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(operation, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, operation: str, q: float):
+        """p-분위 지연 (표본이 MIN_SAMPLES 개 미만이면 None)"""
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples and len(samples) >= MIN_SAMPLES:
+                return _percentile(samples, q)
+        return None
+
+    def load(self, data):
+        with self._lock:
+            for key, samples in data.items():
+                # 이전 형식의 종류 전체 창(*read 등)은 버립니다.
+                if key.startswith('*'):
+                    continue
+                self._samples.setdefault(key, deque(maxlen=self._window)).extend(float(value) for value in samples)
+
+    def dump(self, limit: int = SAVED_SAMPLES):
+        with self._lock:
+            return {key: [round(value, 6) for value in list(samples)[-limit:]] for key, samples in self._samples.items()}
+
+class RetryBudget:
+    """요청 수에 비례하는 재시도 예산 (토큰 버킷)"""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, reserve: float = RETRY_BUDGET_RESERVE,
+                 maximum: float = RETRY_BUDGET_MAX):
+        self._lock = threading.Lock()
+        self.ratio = ratio
+        self.maximum = maximum
+        self.tokens = reserve
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, self.maximum)
+
+    def withdraw(self):
+        """토큰 1개 사용 (예산이 없으면 False)"""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+class RequestPolicy:
+    """요청 종류별 타임아웃/헤지/재시도 정책"""
+
+    def __init__(self, latencies: LatencyTracker = None, budget: RetryBudget = None, max_attempts: int = MAX_ATTEMPTS):
+        self.latencies = latencies or LatencyTracker()
+        self.budget = budget or RetryBudget()
+        self.max_attempts = max_attempts
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "timeouts": 0,
+                      "budget_exhausted": 0}
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='request-policy')
+            return self._pool
+
+    def timeout_for(self, operation: str):
+        """적응형 타임아웃 (초)"""
+        p99 = self.latencies.percentile(operation, 0.99)
+        if p99 is None:
+            return DEFAULT_TIMEOUT
+        return min(max(p99 * TIMEOUT_MULTIPLIER, MIN_TIMEOUT), MAX_TIMEOUT)
+
+    def hedge_delay(self, operation: str):
+        """헤지 요청을 보낼 지연 (표본이 부족하면 None - 헤지하지 않음)"""
+        return self.latencies.percentile(operation, HEDGE_PERCENTILE)
+
+    def _timed(self, builder, operation: str, index: int):
+        started = time.perf_counter()
+        result = builder.execute()
+        self.latencies.observe(operation, time.perf_counter() - started)
+        return index, result
+
+    def _attempt(self, builder, operation: str, kind: str):
+        """한 번의 시도
+
+        읽기는 정책 타임아웃 안에서 기다리고 p95 지연 후 헤지 요청을 추가로 보내 먼저 성공한 응답을 씁니다.
+        쓰기는 호출한 스레드에서 끝날 때까지 실행하므로 재시도가 이전 시도와 겹치지 않습니다.
+        """
+        if kind != 'read':
+            return self._timed(builder, operation, 0)[1]
+
+        pool = self._executor()
+        timeout = self.timeout_for(operation)
+        started = time.monotonic()
+        deadline = started + timeout
+        delay = self.hedge_delay(operation)
+        hedge_at = started + delay if delay is not None and delay < timeout else None
+
+        pending = {pool.submit(self._timed, builder, operation, 0)}
+        error = None
+        while pending:
+            wake = deadline if hedge_at is None else min(deadline, hedge_at)
+            done, pending = wait(pending, timeout=max(wake - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    index, result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if index:
+                    self._count("hedge_wins")
+                return result
+
+            now = time.monotonic()
+            if hedge_at is not None and now >= hedge_at and pending:
+                hedge_at = None
+                if self.budget.withdraw():
+                    self._count("hedges")
+                    pending.add(pool.submit(self._timed, builder, operation, 1))
+                else:
+                    self._count("budget_exhausted")
+            if pending and now >= deadline:
+                self._count("timeouts")
+                raise RequestTimeout(operation, timeout)
+        raise error
+
+    def execute(self, builder, operation: str, kind: str):
+        """정책을 적용해 쿼리 실행
+
+        kind: 'read' (헤지 + 재시도), 'write' (멱등 쓰기, 재시도), 'unsafe' (한 번만 실행)
+        """
+        self._count("requests")
+        self.budget.deposit()
+        if kind == 'unsafe':
+            return builder.execute()
+
+        # postgrest 내장 재시도(GET/HEAD 503/520)는 끄고 예산 안에서 이 정책으로만 재시도합니다.
+        if hasattr(builder, 'retry'):
+            builder = builder.retry(False)
+
+        attempt = 1
+        while True:
+            try:
+                return self._attempt(builder, operation, kind)
+            except Exception as e:
+                if not is_retryable(e, kind) or attempt >= self.max_attempts:
+                    raise
+                if not self.budget.withdraw():
+                    self._count("budget_exhausted")
+                    raise
+                self._count("retries")
+                # full jitter: [0, min(cap, base * 2^n)) 사이에서 무작위로 기다립니다.
+                time.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1))))
+                attempt += 1
+
+def _backend_key():
+    """지연 표본을 구분하는 백엔드 이름 (로컬 대체 백엔드와 원격을 섞지 않음)"""
+    if supabase_client.LOCAL_DB_PATH:
+        return f"local:{supabase_client.LOCAL_DB_PATH}"
+    return supabase_client.SUPABASE_URL
+
+def load_policy(path: str = LATENCY_FILE):
+    """저장된 지연 표본으로 정책 생성"""
+    policy = RequestPolicy()
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                policy.latencies.load(json.load(f).get(_backend_key(), {}))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 지연 표본 파일을 읽지 못했습니다. 기본 타임아웃을 사용합니다: {str(e)}")
+    return policy
+
+def save_policy(policy: RequestPolicy, path: str = LATENCY_FILE):
+    """지연 표본 저장 (다른 백엔드의 표본은 유지)"""
+    data = {}
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+    data[_backend_key()] = policy.latencies.dump()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _row_bucket(count: int):
+    """보내는 행 수 구간 (count 이상인 가장 작은 10의 거듭제곱)"""
+    bucket = 1
+    while bucket < count:
+        bucket *= 10
+    return f"rows{bucket}"
+
+def request_shape(verb: str, args, kwargs):
+    """타임아웃 표본을 나누는 요청 모양 (count 조회, 쓰기 행 수 구간)"""
+    if verb == 'select' and (kwargs.get('count') or kwargs.get('head')):
+        return 'count'
+    if verb in ('insert', 'upsert') and args:
+        return _row_bucket(len(args[0]) if isinstance(args[0], list) else 1)
+    return None
+
+def page_shape(name: str, args, kwargs):
+    """select 체이닝 호출이 정하는 페이지 크기 구간 (크기를 정하지 않는 호출이면 None)"""
+    if kwargs.get('foreign_table'):
+        return None
+    if name == 'limit':
+        return _row_bucket(args[0] if args else kwargs['size'])
+    if name == 'range':
+        start = args[0] if args else kwargs['start']
+        end = args[1] if len(args) > 1 else kwargs['end']
+        return _row_bucket(end - start + 1)
+    if name in ('single', 'maybe_single'):
+        return _row_bucket(1)
+    return None
+
+class _PolicyQuery:
+    """쿼리 빌더 프록시 - 체이닝은 그대로 넘기고 execute() 에 정책 적용"""
+
+    def __init__(self, builder, target: str, verb, policy: RequestPolicy, shape=None):
+        self._builder = builder
+        self._target = target
+        self._verb = verb
+        self._policy = policy
+        self._shape = shape
+
+    def __getattr__(self, name):
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                if self._verb is None and name in VERBS:
+                    return _PolicyQuery(result, self._target, name, self._policy, request_shape(name, args, kwargs))
+                shape = self._shape
+                if self._verb == 'select' and shape != 'count':
+                    shape = page_shape(name, args, kwargs) or shape
+                return _PolicyQuery(result, self._target, self._verb, self._policy, shape)
+            return result
+        return call
+
+    @property
+    def kind(self):
+        if self._target == 'rpc':
+            return 'read' if self._verb in READ_ONLY_RPCS else 'unsafe'
+        if self._verb in READ_VERBS:
+            return 'read'
+        if self._verb in IDEMPOTENT_WRITE_VERBS:
+            return 'write'
+        return 'unsafe'
+
+    @property
+    def operation(self):
+        """지연 표본 키 (예: events.select, events.select.rows1, events.select.count, events.upsert.rows1000)"""
+        return '.'.join(part for part in (self._target, self._verb, self._shape) if part)
+
+    def execute(self):
+        # 비동기 빌더는 이벤트 루프에서 실행해야 하므로 정책 없이 그대로 넘깁니다.
+        if inspect.iscoroutinefunction(self._builder.execute):
+            return self._builder.execute()
+        return self._policy.execute(self._builder, self.operation, self.kind)
+
+class PolicyClient:
+    """Supabase(또는 로컬 대체) 클라이언트 프록시 - table()/from_()/rpc() 요청에 정책 적용"""
+
+    def __init__(self, client, policy: RequestPolicy):
+        self._client = client
+        self.policy = policy
+
+    def table(self, name: str):
+        return _PolicyQuery(self._client.table(name), name, None, self.policy)
+
+    def from_(self, name: str):
+        return _PolicyQuery(self._client.from_(name), name, None, self.policy)
+
+    def rpc(self, name: str, params=None, *args, **kwargs):
+        return _PolicyQuery(self._client.rpc(name, params, *args, **kwargs), 'rpc', name, self.policy)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+_policy = None
+_policy_lock = threading.Lock()
+
+def get_policy():
+    """프로세스 공용 정책 (처음 호출할 때 저장된 지연 표본을 읽음)"""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = load_policy()
+        return _policy
+
+def apply_policy(client, policy: RequestPolicy = None):
+    """클라이언트를 정책 프록시로 감싸기 (이미 감싼 클라이언트는 그대로)"""
+    if isinstance(client, PolicyClient):
+        return client
+    return PolicyClient(client, policy or get_policy())
+
+def print_policy_stats(policy: RequestPolicy = None):
+    """재시도/헤지 통계 출력 후 지연 표본 저장"""
+    policy = policy or _policy
+    if policy is None or not policy.stats["requests"]:
+        return
+    stats = policy.stats
+    print(f"\n🛡️ 요청 정책: 요청 {stats['requests']}회, 재시도 {stats['retries']}회, "
+          f"헤지 {stats['hedges']}회 (헤지 응답 사용 {stats['hedge_wins']}회), 시간 초과 {stats['timeouts']}회, "
+          f"예산 부족 {stats['budget_exhausted']}회")
+    try:
+        save_policy(policy)
+    except OSError as e:
+        print(f"⚠️ 지연 표본을 저장하지 못했습니다: {str(e)}")
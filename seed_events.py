@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 대용량 합성 데이터 생성 및 청크 적재 스크립트
+시드 기반으로 결정적인 이벤트를 만들어 크기 조정된 청크로 병렬 삽입합니다.
+
+사용 예:
+    python seed_events.py --rows 1000000 --seed 42 --concurrency 8
+    python seed_events.py --rows 1000000 --seed 42 --resume   # 실패한 청크부터 이어서 적재
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date, timedelta
+
+from supabase import Client
+
+from event_constants import CATEGORIES, RECURRING_TYPES
+from event_upsert import upsert_events
+from supabase_client import get_client
+
+# 카테고리별 일정 제목
+TITLES = {
+    'church': ['주일예배', '수요예배', '새벽기도회', '구역예배', '금요철야', '성찬예배', '감사예배'],
+    'adult': ['장년회 모임', '장년회 월례회', '장년회 봉사', '장년회 성경공부'],
+    'youth': ['청년회 예배', '청년회 수련회', '청년회 찬양연습', '청년회 소그룹'],
+    'advisory': ['자문회 회의', '자문회 정기총회', '자문회 기도모임'],
+    'women': ['부녀회 기도회', '부녀회 바자회', '부녀회 봉사', '부녀회 성경공부'],
+    'student': ['학생회 모임', '학생회 수련회', '중고등부 예배', '학생회 찬양팀'],
+    'children': ['유년회 성경학교', '유년부 예배', '유년회 소풍', '어린이 찬양대'],
+}
+
+LOCATIONS = ['본당', '교육관', '기도실', '청년부실', '학생부실', '유아부실', '소예배실', '친교실', '나주지역']
+
+DESCRIPTIONS = ['정기 모임', '월례 행사', '특별 행사', '기도와 말씀', '친교와 나눔', None]
+
+REMINDERS = [None, 10, 30, 60, 1440]
+
+# 자연 키 (date, title, start_time) 격자: 날짜 x 제목 x 시작 시각(06:00~20:30, 30분 간격) + 종일
+KEY_TITLES = [(category, title) for category in CATEGORIES for title in TITLES[category]]
+START_MINUTES = list(range(6 * 60, 21 * 60, 30))
+KEY_SLOTS = len(START_MINUTES) + 1
+
+# 요청 한 번에 담을 목표 본문 크기 (바이트)
+TARGET_CHUNK_BYTES = 512 * 1024
+MAX_CHUNK_ROWS = 5000
+
+DEFAULT_CHECKPOINT = '.seed_checkpoint.json'
+
+def key_grid(seed: int, total_rows: int, days: int):
+    """자연 키 격자 크기와 행 번호 -> 격자 칸 순열 (날짜 수, 칸 수, 간격, 시작 위치)
+
+    칸 수와 서로소인 간격으로 건너뛰면 행 번호마다 다른 칸이 나오므로 모든 행의 자연 키가 다릅니다.
+    total_rows 가 격자보다 크면 날짜 범위를 늘립니다.
+    """
+    days = max(days, math.ceil(total_rows / (len(KEY_TITLES) * KEY_SLOTS)))
+    capacity = days * len(KEY_TITLES) * KEY_SLOTS
+    stride = max(1, int(capacity * 0.6180339887))
+    while math.gcd(stride, capacity) != 1:
+        stride += 1
+    return days, capacity, stride, random.Random(f"{seed}:keys").randrange(capacity)
+
+def generate_chunk(seed: int, chunk_index: int, chunk_size: int, total_rows: int,
+                   start: date = date(2025, 1, 1), days: int = 365 * 3):
+    """chunk_index 번째 청크의 이벤트 생성
+
+    청크마다 (seed, chunk_index) 로 난수 생성기를 따로 만들기 때문에
+    앞선 청크를 만들지 않고도 같은 데이터를 다시 만들 수 있습니다.
+    날짜/제목/시작 시각은 key_grid 의 순열로 정해 자연 키 (date, title, start_time) 가 겹치지 않습니다.
+    """
+    rng = random.Random(f"{seed}:{chunk_index}")
+    _, capacity, stride, offset = key_grid(seed, total_rows, days)
+    first = chunk_index * chunk_size
+    rows = []
+
+    for index in range(first, min(first + chunk_size, total_rows)):
+        day, cell = divmod((offset + index * stride) % capacity, len(KEY_TITLES) * KEY_SLOTS)
+        title_index, slot = divmod(cell, KEY_SLOTS)
+        category, title = KEY_TITLES[title_index]
+        is_all_day = slot == len(START_MINUTES)
+        event = {
+            "title": title,
+            "date": (start + timedelta(days=day)).isoformat(),
+            "start_time": None,
+            "end_time": None,
+            "category": category,
+            "description": rng.choice(DESCRIPTIONS),
+            "location": rng.choice(LOCATIONS),
+            "is_all_day": is_all_day,
+            "reminder": rng.choice(REMINDERS),
+            "recurring": rng.choice(RECURRING_TYPES) if rng.random() < 0.15 else None,
+        }
+        if not is_all_day:
+            start_minute = START_MINUTES[slot]
+            end_minute = min(start_minute + rng.choice([60, 90, 120, 180]), 23 * 60 + 59)
+            event["start_time"] = f"{start_minute // 60:02d}:{start_minute % 60:02d}:00"
+            event["end_time"] = f"{end_minute // 60:02d}:{end_minute % 60:02d}:00"
+        rows.append(event)
+
+    return rows
+
+def chunk_size_for(sample, target_bytes: int = TARGET_CHUNK_BYTES):
+    """샘플 행들의 평균 JSON 크기로 요청당 행 수 결정"""
+    if not sample:
+        return MAX_CHUNK_ROWS
+    avg_bytes = len(json.dumps(sample, ensure_ascii=False).encode('utf-8')) / len(sample)
+    return max(1, min(MAX_CHUNK_ROWS, int(target_bytes // avg_bytes)))
+
+def tune_chunk_size(seed: int, target_bytes: int = TARGET_CHUNK_BYTES):
+    """합성 샘플 행의 JSON 크기로 요청당 행 수 결정"""
+    return chunk_size_for(generate_chunk(seed, 0, 200, 200), target_bytes)
+
+def load_checkpoint(path: str, seed: int, total_rows: int, chunk_size: int):
+    """체크포인트에서 완료된 청크 번호 읽기 (설정이 다르면 무시)"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if (checkpoint.get('seed'), checkpoint.get('rows'), checkpoint.get('chunk_size')) != (seed, total_rows, chunk_size):
+        print("⚠️ 체크포인트 설정이 현재 실행과 달라 처음부터 적재합니다.")
+        return set()
+    return set(checkpoint.get('completed', []))
+
+def save_checkpoint(path: str, seed: int, total_rows: int, chunk_size: int, completed):
+    """체크포인트 원자적 저장"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"seed": seed, "rows": total_rows, "chunk_size": chunk_size,
+                   "completed": sorted(completed)}, f)
+    os.replace(tmp_path, path)
+
+def insert_chunk(supabase: Client, rows, update_existing: bool = False):
+    """청크 하나를 자연 키 upsert 한 번으로 적재 (응답 본문은 받지 않음)
+
+    반환값: 새로 삽입된 행 수 - 같은 청크를 다시 보내도 중복 행이 생기지 않습니다.
+    """
+    return upsert_events(supabase, rows, update_existing)
+
+def seed_events(supabase: Client, total_rows: int, seed: int = 42, chunk_size: int = None,
+                concurrency: int = 4, checkpoint_path: str = DEFAULT_CHECKPOINT, resume: bool = False):
+    """합성 이벤트를 청크 단위로 적재
+
+    동시에 전송 중인 청크는 최대 concurrency 개로 제한되므로 메모리 사용량도
+    concurrency * chunk_size 행을 넘지 않습니다. 성공한 청크는 체크포인트에 기록되어
+    resume=True 로 다시 실행하면 실패했거나 남은 청크만 적재합니다.
+    """
+    chunk_size = chunk_size or tune_chunk_size(seed)
+    chunk_count = (total_rows + chunk_size - 1) // chunk_size
+    completed = load_checkpoint(checkpoint_path, seed, total_rows, chunk_size) if resume else set()
+    pending = (index for index in range(chunk_count) if index not in completed)
+
+    print(f"🌱 {total_rows}개 이벤트 적재 시작 (seed={seed}, 청크 {chunk_size}행 x {chunk_count}개, 동시 {concurrency}개)")
+    if completed:
+        print(f"↩️ 완료된 청크 {len(completed)}개를 건너뜁니다.")
+
+    inserted = 0
+    processed = 0
+    failed = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight = {}
+
+        def submit_next():
+            index = next(pending, None)
+            if index is None:
+                return False
+            rows = generate_chunk(seed, index, chunk_size, total_rows)
+            in_flight[executor.submit(insert_chunk, supabase, rows)] = index
+            return True
+
+        for _ in range(concurrency):
+            if not submit_next():
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                try:
+                    inserted += future.result()
+                    completed.add(index)
+                except Exception as e:
+                    failed.append(index)
+                    print(f"❌ 청크 {index} 삽입 실패: {str(e)}")
+                submit_next()
+
+                processed += 1
+                if processed % 50 == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"   ⏱️ {len(completed)}/{chunk_count} 청크, {inserted / elapsed:,.0f} rows/sec")
+
+            save_checkpoint(checkpoint_path, seed, total_rows, chunk_size, completed)
+
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed > 0 else 0.0
+    print(f"✅ {inserted}개 이벤트 삽입 완료 ({elapsed:.1f}초, {rate:,.0f} rows/sec)")
+    if failed:
+        print(f"⚠️ 실패한 청크 {len(failed)}개: {sorted(failed)[:20]} - --resume 으로 다시 실행하세요.")
+
+    return {"inserted": inserted, "seconds": elapsed, "rows_per_sec": rate, "failed_chunks": sorted(failed)}
+
+def main():
+    """메인 실행 함수
+
+    반환값: 모든 청크를 적재했는지 여부
+    """
+    parser = argparse.ArgumentParser(description="나주교회 캘린더 합성 이벤트 적재")
+    parser.add_argument('--rows', type=int, default=100_000, help="생성할 이벤트 수")
+    parser.add_argument('--seed', type=int, default=42, help="난수 시드")
+    parser.add_argument('--chunk-size', type=int, default=None, help="요청당 행 수 (기본: 본문 크기로 자동 결정)")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시에 전송할 청크 수")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help="체크포인트 파일 경로")
+    parser.add_argument('--resume', action='store_true', help="체크포인트의 완료 청크를 건너뜀")
+    args = parser.parse_args()
+
+    print("🏛️ 나주교회 캘린더 합성 데이터 적재")
+    print("=" * 60)
+    result = seed_events(get_client(), args.rows, args.seed, args.chunk_size,
+                         args.concurrency, args.checkpoint, args.resume)
+    return not result["failed_chunks"]
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 공용 Supabase 클라이언트 모듈
+환경 변수에서 접속 정보를 한 번만 읽고, 모든 스크립트가 keep-alive HTTP 연결 풀
+(가능하면 HTTP/2) 하나를 공유하는 클라이언트를 재사용하도록 합니다.
+
+접속 정보와 환경 변수는 supabase_config.py 에 있습니다.
+"""
+
+import importlib.util
+import threading
+
+import httpx
+from supabase import AClientOptions, ClientOptions, acreate_client, create_client
+
+from supabase_config import LOCAL_DB_PATH, SUPABASE_ANON_KEY, SUPABASE_URL
+
+# h2 패키지가 설치되어 있으면 HTTP/2 로 요청을 하나의 연결에 다중화합니다.
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0)
+REQUEST_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+class ConnectionStats:
+    """요청 수 대비 새 TCP 연결/TLS 핸드셰이크 수 집계 (httpcore trace 확장 사용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tcp_connects = 0
+        self.tls_handshakes = 0
+        self.http2_requests = 0
+
+    def trace(self, event_name: str, info):
+        """httpcore trace 콜백"""
+        with self._lock:
+            if event_name == 'connection.connect_tcp.complete':
+                self.tcp_connects += 1
+            elif event_name == 'connection.start_tls.complete':
+                self.tls_handshakes += 1
+            elif event_name == 'http2.send_request_headers.started':
+                self.http2_requests += 1
+
+    def on_request(self, request: httpx.Request):
+        """httpx request 이벤트 훅: 요청마다 trace 콜백 연결"""
+        with self._lock:
+            self.requests += 1
+        request.extensions['trace'] = self.trace
+
+    async def on_request_async(self, request: httpx.Request):
+        """AsyncClient 용 request 이벤트 훅"""
+        self.on_request(request)
+
+    def summary(self):
+        """집계 결과 dict (reuse_ratio: 새 연결 없이 처리된 요청 비율)"""
+        with self._lock:
+            reused = max(self.requests - self.tcp_connects, 0)
+            return {
+                "requests": self.requests,
+                "tcp_connects": self.tcp_connects,
+                "tls_handshakes": self.tls_handshakes,
+                "http2_requests": self.http2_requests,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            }
+
+stats = ConnectionStats()
+
+_lock = threading.Lock()
+_http_client = None
+_client = None
+_async_client = None
+
+def get_http_client():
+    """프로세스 전체에서 공유하는 keep-alive httpx 연결 풀"""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(http2=HTTP2_AVAILABLE, limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT,
+                                        follow_redirects=True, event_hooks={'request': [stats.on_request]})
+        return _http_client
+
+def get_client():
+    """공유 Supabase 클라이언트 (처음 호출할 때 한 번만 생성)"""
+    global _client
+    if _client is not None:
+        return _client
+
+    if LOCAL_DB_PATH:
+        from local_backend import create_local_client
+        client = create_local_client(LOCAL_DB_PATH)
+    else:
+        client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY,
+                               options=ClientOptions(httpx_client=get_http_client()))
+    with _lock:
+        if _client is None:
+            _client = client
+        return _client
+
+async def get_async_client():
+    """공유 비동기 Supabase 클라이언트 (같은 이벤트 루프 안에서 재사용)"""
+    global _async_client
+    if _async_client is None:
+        if LOCAL_DB_PATH:
+            from local_backend import create_async_local_client
+            _async_client = create_async_local_client(LOCAL_DB_PATH)
+        else:
+            http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT,
+                                            follow_redirects=True,
+                                            event_hooks={'request': [stats.on_request_async]})
+            _async_client = await acreate_client(SUPABASE_URL, SUPABASE_ANON_KEY,
+                                                 options=AClientOptions(httpx_client=http_client))
+    return _async_client
+
+def print_connection_stats():
+    """연결 재사용 통계 출력"""
+    summary = stats.summary()
+    if not summary["requests"]:
+        return
+    protocol = "HTTP/2" if summary["http2_requests"] else "HTTP/1.1"
+    print(f"\n🔌 연결 통계: 요청 {summary['requests']}회, 새 연결 {summary['tcp_connects']}회, "
+          f"TLS 핸드셰이크 {summary['tls_handshakes']}회, 재사용률 {summary['reuse_ratio']:.0%} ({protocol})")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+conflict_detector.py 검사
+정렬/스윕 결과를 모든 쌍을 비교하는 단순 구현과 맞춰 보고, 리포트 생성의 장소별 집계를 확인합니다.
+
+    python test_conflict_detector.py
+    python -m pytest test_conflict_detector.py
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+from conflict_detector import DAY_MINUTES, DEFAULT_DURATION, build_report, find_conflicts
+from event_columns import EventColumns
+
+LOCATIONS = ['본당', '교육관', '기도실', ' 기도실 ', '친교실', '', None]
+
+def _event(title, location, start_time, end_time, day='2026-03-01', is_all_day=False):
+    return {"id": str(uuid.uuid4()), "title": title, "date": day, "start_time": start_time, "end_time": end_time,
+            "category": 'church', "location": location, "is_all_day": is_all_day}
+
+def _minutes(value):
+    if not value:
+        return None
+    hour, minute = value.split(':')[:2]
+    return int(hour) * 60 + int(minute)
+
+def _interval(row):
+    """conflict_detector 모듈 설명의 규칙을 그대로 옮긴 (시작, 종료, 종일 여부)"""
+    start, end = _minutes(row['start_time']), _minutes(row['end_time'])
+    if row['is_all_day'] or start is None:
+        return 0, DAY_MINUTES, True
+    if end is None:
+        end = start + DEFAULT_DURATION
+    if end < start:
+        end = DAY_MINUTES
+    elif end == start:
+        end = start + 1
+    return start, min(end, DAY_MINUTES), False
+
+def brute_force(rows, timed_only=False):
+    """모든 쌍 비교: {(행 a, 행 b): (겹침 시작, 겹침 종료, 종류)}"""
+    found = {}
+    for a in range(len(rows)):
+        for b in range(a + 1, len(rows)):
+            first, second = rows[a], rows[b]
+            place = (first['location'] or '').strip()
+            if not place or place != (second['location'] or '').strip() or first['date'] != second['date']:
+                continue
+            start_a, end_a, all_day_a = _interval(first)
+            start_b, end_b, all_day_b = _interval(second)
+            if timed_only and (all_day_a or all_day_b):
+                continue
+            if start_a < end_b and start_b < end_a:
+                kind = 'all_day' if all_day_a or all_day_b else 'time'
+                found[(a, b)] = (max(start_a, start_b), min(end_a, end_b), kind)
+    return found
+
+def _random_rows(count, seed):
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        day = (date(2026, 3, 1) + timedelta(days=rng.randrange(4))).isoformat()
+        if rng.random() < 0.1:
+            rows.append(_event(f"종일 {index}", rng.choice(LOCATIONS), None, None, day, is_all_day=True))
+            continue
+        start = rng.randrange(6 * 60, 23 * 60, 15)
+        end = rng.choice([None, start, start - 30, start + rng.choice([30, 60, 90, 120, 240])])
+        rows.append(_event(f"일정 {index}", rng.choice(LOCATIONS), f"{start // 60:02d}:{start % 60:02d}",
+                           None if end is None else f"{end // 60 % 24:02d}:{end % 60:02d}", day))
+    return rows
+
+def _sweep(rows, timed_only=False):
+    store = EventColumns.from_rows(rows)
+    conflicts = find_conflicts(store, timed_only)
+    return store, conflicts, {(min(a, b), max(a, b)): (start, end, kind) for a, b, start, end, kind in conflicts}
+
+def test_only_one_location_conflicts():
+    rows = [
+        _event('주일예배', '본당', '10:00', '11:00'),
+        _event('교사 모임', '교육관', '10:00', '11:00'),
+        _event('중보기도', '기도실', '10:00', '11:00'),
+        _event('구역장 기도회', '기도실', '10:30', '11:30'),
+    ]
+    store, conflicts, found = _sweep(rows)
+    assert found == {(2, 3): (10 * 60 + 30, 11 * 60, 'time')}
+
+    report = build_report(store, conflicts)
+    assert report["conflicts"] == 1
+    assert report["by_location"] == {'기도실': {"time": 1, "all_day": 0}}
+    item = report["items"][0]
+    assert (item["location"], item["overlap_start"], item["overlap_end"]) == ('기도실', '10:30:00', '11:00:00')
+    assert {event["title"] for event in item["events"]} == {'중보기도', '구역장 기도회'}
+
+def test_matches_brute_force():
+    for seed in range(20):
+        rows = _random_rows(120, seed)
+        for timed_only in (False, True):
+            _, conflicts, found = _sweep(rows, timed_only)
+            assert len(conflicts) == len(found)
+            assert found == brute_force(rows, timed_only), f"seed={seed}, timed_only={timed_only}"
+
+def test_report_groups_by_trimmed_location():
+    rows = _random_rows(300, 99)
+    store, conflicts, found = _sweep(rows)
+    report = build_report(store, conflicts, limit=10)
+    assert report["truncated"] and len(report["items"]) == 10
+    assert sum(sum(counts.values()) for counts in report["by_location"].values()) == len(found)
+
+    expected = {}
+    for (a, _), (_, _, kind) in found.items():
+        totals = expected.setdefault(rows[a]['location'].strip(), {"time": 0, "all_day": 0})
+        totals[kind] += 1
+    assert report["by_location"] == expected
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+나주교회 캘린더 검증 리포트 모듈
+events 테이블의 전체/카테고리별/월별/연도별 이벤트 수를 행 데이터를 내려받지 않고 집계합니다.
+"""
+
+from datetime import date
+from supabase import Client
+
+from event_constants import CATEGORIES, CATEGORY_ENUM
+
+def empty_report(source: str):
+    """빈 리포트 생성"""
+    return {
+        "source": source,
+        "total": 0,
+        "by_category": {category: 0 for category in CATEGORY_ENUM},
+        "by_month": {},
+        "by_year": {},
+    }
+
+def add_month_count(report, month: str, count: int):
+    """월별/연도별 집계에 값 추가 (0 인 달은 생략)"""
+    if not count:
+        return
+    report["by_month"][month] = report["by_month"].get(month, 0) + count
+    year = month[:4]
+    report["by_year"][year] = report["by_year"].get(year, 0) + count
+
+def report_from_rows(rows):
+    """events_count_report 결과 행을 리포트로 변환"""
+    report = empty_report("rpc")
+
+    # (category, NULL) / (NULL, month) / (NULL, NULL) 행으로 돌아옵니다.
+    for row in rows or []:
+        category, month, count = row.get('category'), row.get('month'), int(row.get('n') or 0)
+        if category is not None:
+            report["by_category"][category] = count
+        elif month is not None:
+            add_month_count(report, month, count)
+        else:
+            report["total"] = count
+
+    report["by_month"] = dict(sorted(report["by_month"].items()))
+    report["by_year"] = dict(sorted(report["by_year"].items()))
+    return report
+
+def fetch_report_rpc(supabase: Client):
+    """events_count_report RPC 한 번으로 서버에서 GROUPING SETS 집계"""
+    return report_from_rows(supabase.rpc('events_count_report').execute().data)
+
+def head_count_query(supabase: Client, *filters):
+    """count='exact' HEAD 요청 쿼리 생성 (행 없이 개수만 조회)"""
+    query = supabase.table('events').select('id', count='exact', head=True)
+    for operator, column, value in filters:
+        query = getattr(query, operator)(column, value)
+    return query
+
+def edge_date_query(supabase: Client, desc: bool):
+    """가장 이른/늦은 날짜 한 개만 조회하는 쿼리 생성"""
+    return supabase.table('events').select('date').order('date', desc=desc).limit(1)
+
+def parse_edge_date(result):
+    """edge_date_query 결과를 date 로 변환"""
+    if not result.data:
+        return None
+    return date.fromisoformat(result.data[0]['date'])
+
+def _head_count(supabase: Client, *filters):
+    """HEAD 카운트 실행"""
+    return head_count_query(supabase, *filters).execute().count or 0
+
+def category_count(count, category: str):
+    """카테고리 HEAD 카운트 결과 확인 (0002 마이그레이션 전 DB 가 모르는 ENUM 값은 일정도 없으므로 0)"""
+    if isinstance(count, Exception):
+        if category in CATEGORIES:
+            raise count
+        return 0
+    return count
+
+def month_ranges(first: date, last: date):
+    """first 가 속한 달부터 last 가 속한 달까지 (YYYY-MM, 시작일, 다음 달 1일) 목록"""
+    current = first.replace(day=1)
+    while current <= last:
+        following = date(current.year + (current.month == 12), current.month % 12 + 1, 1)
+        yield current.strftime('%Y-%m'), current.isoformat(), following.isoformat()
+        current = following
+
+def month_filters(month_range):
+    """월 범위의 HEAD 카운트 필터"""
+    _, start, end = month_range
+    return ('gte', 'date', start), ('lt', 'date', end)
+
+def fetch_report_head(supabase: Client):
+    """RPC가 없을 때 HEAD 카운트 요청들로 집계 (행 데이터 전송 없음)"""
+    report = empty_report("head")
+    report["total"] = _head_count(supabase)
+    if report["total"] == 0:
+        return report
+
+    for category in CATEGORY_ENUM:
+        try:
+            count = _head_count(supabase, ('eq', 'category', category))
+        except Exception as e:
+            count = e
+        report["by_category"][category] = category_count(count, category)
+
+    first = parse_edge_date(edge_date_query(supabase, desc=False).execute())
+    last = parse_edge_date(edge_date_query(supabase, desc=True).execute())
+    for month_range in month_ranges(first, last):
+        add_month_count(report, month_range[0], _head_count(supabase, *month_filters(month_range)))
+    return report
+
+def fetch_report(supabase: Client):
+    """검증 리포트 조회 (RPC 우선, 실패 시 HEAD 카운트로 대체)"""
+    try:
+        return fetch_report_rpc(supabase)
+    except Exception as e:
+        print(f"ℹ️ events_count_report RPC를 사용할 수 없어 HEAD 카운트로 집계합니다: {str(e)}")
+        return fetch_report_head(supabase)
+
+def print_report(report):
+    """검증 리포트 출력"""
+    print(f"📊 현재 {report['total']}개의 이벤트가 저장되어 있습니다.")
+
+    print("\n📈 카테고리별 이벤트 수:")
+    for category, count in report["by_category"].items():
+        print(f"   - {category}: {count}개")
+
+    if report["by_year"]:
+        print("\n📅 연도별 이벤트 수:")
+        for year, count in report["by_year"].items():
+            print(f"   - {year}년: {count}개")
+
+        print("\n🗓️ 월별 이벤트 수:")
+        for month, count in report["by_month"].items():
+            print(f"   - {month}: {count}개")